@@ -2,13 +2,21 @@ from flask import Flask
 from flasgger import Swagger
 
 from app.routes.event_routes import event_bp
+from app.routes.metrics_routes import metrics_bp
+from app.utils.compression import init_compression
+from app.utils.json_provider import EventJSONProvider
 
 def create_app():
     app = Flask(__name__)
+    app.json = EventJSONProvider(app)
 
     # swagger-docs
     Swagger(app)
 
     app.register_blueprint(event_bp, url_prefix="/api/events")
+    app.register_blueprint(metrics_bp, url_prefix="/api/metrics")
+
+    # gzip/deflate negotiated through Accept-Encoding
+    init_compression(app)
 
     return app
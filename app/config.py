@@ -2,3 +2,92 @@ import os
 
 # Define path to the events.json file
 EVENT_FILE_PATH = os.path.join(os.getcwd(), "events.json")
+
+# Event storage backend: "dynamodb", "sqlite", "file" or "journal" (single node), or "memory" (tests, throwaway runs)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "dynamodb")
+
+# Database file used when STORAGE_BACKEND is "sqlite"
+SQLITE_PATH = os.getenv("SQLITE_PATH", os.path.join(os.getcwd(), "events.db"))
+
+# Seconds between flushes of queued writes to EVENT_FILE_PATH when STORAGE_BACKEND is "file"
+FILE_FLUSH_SECONDS = float(os.getenv("FILE_FLUSH_SECONDS", 0.5))
+
+# Append-only journal used when STORAGE_BACKEND is "journal"
+JOURNAL_PATH = os.getenv("JOURNAL_PATH", os.path.join(os.getcwd(), "events.jsonl"))
+
+# fsync the journal before acknowledging a write (concurrent writers share one fsync)
+JOURNAL_FSYNC = os.getenv("JOURNAL_FSYNC", "true").lower() in ("1", "true", "yes")
+
+# Compact the journal once superseded lines exceed both this and the live event count
+JOURNAL_COMPACT_MIN_RECORDS = int(os.getenv("JOURNAL_COMPACT_MIN_RECORDS", 1000))
+
+# Lock file used to elect the single process that runs the reminder loop
+REMINDER_LOCK_FILE = os.getenv("REMINDER_LOCK_FILE", os.path.join(os.getcwd(), ".reminder.lock"))
+
+# How often (seconds) non-leader processes retry the reminder lock
+REMINDER_LOCK_RETRY_SECONDS = int(os.getenv("REMINDER_LOCK_RETRY_SECONDS", 30))
+
+# Seconds before the in-memory event index reloads from storage, so writes
+# made by other worker processes become visible
+INDEX_REFRESH_SECONDS = int(os.getenv("INDEX_REFRESH_SECONDS", 30))
+
+# Seconds between full index reloads; in between, the index catches up from the change log
+INDEX_RELOAD_SECONDS = int(os.getenv("INDEX_RELOAD_SECONDS", 3600))
+
+# Binary snapshot of the event index, loaded at start-up for a warm start
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", os.path.join(os.getcwd(), "events.snapshot"))
+
+# How often (seconds) the reminder leader rewrites the snapshot
+SNAPSHOT_INTERVAL_SECONDS = int(os.getenv("SNAPSHOT_INTERVAL_SECONDS", 300))
+
+# Search queries whose result ids are cached (LRU); 0 disables the cache
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", 256))
+
+# Days ahead that recurring events are expanded when checking for overlapping events
+CONFLICT_HORIZON_DAYS = int(os.getenv("CONFLICT_HORIZON_DAYS", 90))
+
+# Longest range (days) one GET /api/events/freebusy request may cover
+FREEBUSY_MAX_DAYS = int(os.getenv("FREEBUSY_MAX_DAYS", 366))
+
+# Most results returned by one ranked (rank=bm25) search
+SEARCH_RANK_MAX_LIMIT = int(os.getenv("SEARCH_RANK_MAX_LIMIT", 100))
+
+# Most suggestions returned by one GET /api/events/suggest request
+SUGGEST_MAX_LIMIT = int(os.getenv("SUGGEST_MAX_LIMIT", 50))
+
+# Matching titles (and separately title words) ranked per suggest request;
+# bounds the cost of very short prefixes
+SUGGEST_SCAN_LIMIT = int(os.getenv("SUGGEST_SCAN_LIMIT", 1000))
+
+# Response compression: bodies smaller than this many bytes are sent as-is
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 500))
+
+# zlib compression level for gzip/deflate responses (1 = fastest, 9 = smallest)
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", 6))
+
+# Most operations accepted by one POST /api/events/bulk request
+BULK_MAX_OPERATIONS = int(os.getenv("BULK_MAX_OPERATIONS", 1000))
+
+# Most ids accepted by one POST /api/events/batch-get request
+BATCH_GET_MAX_IDS = int(os.getenv("BATCH_GET_MAX_IDS", 500))
+
+# Change log records older than this are purged; older change tokens must resync
+CHANGE_LOG_RETENTION_SECONDS = int(os.getenv("CHANGE_LOG_RETENTION_SECONDS", 7 * 24 * 3600))
+
+# How often (seconds) the reminder leader compacts the change log
+CHANGE_LOG_COMPACT_SECONDS = int(os.getenv("CHANGE_LOG_COMPACT_SECONDS", 3600))
+
+# Most changes returned by one GET /api/events/changes request
+CHANGES_MAX_LIMIT = int(os.getenv("CHANGES_MAX_LIMIT", 1000))
+
+# Server-Sent Events: seconds between keep-alive comments on an idle stream
+SSE_HEARTBEAT_SECONDS = int(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+
+# Server-Sent Events: seconds between polls of the change log for new writes
+SSE_POLL_SECONDS = float(os.getenv("SSE_POLL_SECONDS", 1))
+
+# Messages buffered per SSE client before it is told to resync instead
+SSE_BUFFER_SIZE = int(os.getenv("SSE_BUFFER_SIZE", 100))
+
+# Concurrent SSE clients per worker process
+SSE_MAX_SUBSCRIBERS = int(os.getenv("SSE_MAX_SUBSCRIBERS", 1000))
@@ -1,8 +1,43 @@
 import uuid
 from datetime import datetime
 
+
+def _parse_iso(value, field):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be an ISO-8601 datetime")
+
+
+def to_local(dt):
+    """Naive local wall-clock time of ``dt``, for display and local-time arithmetic"""
+    if dt.tzinfo is not None:
+        # Dropping the offset loses which of a repeated (DST fall-back) hour
+        # this was, so epochs are always taken from the aware value instead
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt
+
+
+def parse_timestamp(value, field):
+    """Parse an ISO-8601 timestamp into a naive local datetime"""
+    return to_local(_parse_iso(value, field))
+
+
+def to_epoch(value, field="start_time"):
+    """Convert an ISO-8601 timestamp into UTC epoch seconds (naive input is local time)"""
+    return int(_parse_iso(value, field).timestamp())
+
+
 class Event:
-    def __init__(self, title, description, start_time, end_time, recurrence=None, email=None, id=None):
+    # Fixed slots keep per-event memory low; the parsed datetimes and epochs
+    # are computed once here so consumers never call fromisoformat again.
+    __slots__ = (
+        "id", "title", "description", "start_time", "end_time", "recurrence", "email",
+        "created_at", "updated_at", "start_dt", "end_dt", "start_epoch", "end_epoch",
+    )
+
+    def __init__(self, title, description, start_time, end_time, recurrence=None, email=None, id=None,
+                 created_at=None, updated_at=None):
         self.id = id or str(uuid.uuid4())
         self.title = title
         self.description = description
@@ -10,28 +45,49 @@ class Event:
         self.end_time = end_time
         self.recurrence = recurrence  # 'daily', 'weekly', 'monthly', or None
         self.email = email
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+        start = _parse_iso(start_time, "start_time")
+        end = _parse_iso(end_time, "end_time")
+        self.start_epoch = int(start.timestamp())
+        self.end_epoch = int(end.timestamp())
+        if self.end_epoch < self.start_epoch:
+            raise ValueError("end_time must not be before start_time")
+        self.start_dt = to_local(start)
+        self.end_dt = to_local(end)
 
     def to_dict(self):
-        return {
+        data = {
             "id": self.id,
             "title": self.title,
             "description": self.description,
             "start_time": self.start_time,
             "end_time": self.end_time,
             "recurrence": self.recurrence,
-            "email": self.email
+            "email": self.email,
+            "start_epoch": self.start_epoch,
+            "end_epoch": self.end_epoch
         }
+        if self.created_at is not None:
+            data["created_at"] = self.created_at
+        if self.updated_at is not None:
+            data["updated_at"] = self.updated_at
+        return data
 
-    @staticmethod
-    def from_dict(data):
-        return Event(
-            title=data["title"],
-            description=data["description"],
-            start_time=data["start_time"],
-            end_time=data["end_time"],
-            recurrence=data.get("recurrence"),
-            email=data.get("email"), 
-            id=data.get("id")
+    @classmethod
+    def from_dict(cls, data):
+        get = data.get
+        return cls(
+            data["title"],
+            data["description"],
+            data["start_time"],
+            data["end_time"],
+            get("recurrence"),
+            get("email"),
+            get("id"),
+            get("created_at"),
+            get("updated_at"),
         )
 
     def __repr__(self):
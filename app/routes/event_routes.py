@@ -1,35 +1,143 @@
 from flask import Blueprint, request, jsonify
 
+from app.config import CHANGES_MAX_LIMIT, SEARCH_RANK_MAX_LIMIT, SUGGEST_MAX_LIMIT
+from app.services.change_log import ChangeGone
+from app.services.event_store import EventNotFound, project
+from app.services.event_query import EventQuery, parse_bool, parse_fields
+from app.services.intervals import ScheduleConflict
+from app.utils.etag import item_etag, json_with_etag, make_etag, not_modified
+from app.utils.broadcaster import SubscriberLimitReached
+from app.utils.streaming import STREAM_FORMATS, sse_response, stream_pages
 from app.services.event_service import (
     get_all_events,
+    list_events as query_events,
     create_event,
+    bulk_write,
     update_event,
     delete_event,
     search_event,
+    search_ranked,
+    suggest_titles,
     get_event_by_id,
+    get_events_by_ids,
+    get_conflicts,
+    get_free_busy,
+    get_changes,
+    open_event_stream,
+    get_event_stats,
+    get_status_counts,
+    get_upcoming_events,
+    get_events_in_range,
+    iter_event_pages,
+    iter_search_pages,
+    list_version,
 )
 
 event_bp = Blueprint("event", __name__)
 
+
+def conflict_check_requested():
+    """Whether ?check_conflicts= asks for writes overlapping another event of the same email to be refused"""
+    return parse_bool(request.args.get("check_conflicts", "false"), "check_conflicts")
+
+
+def conflict_response(conflict):
+    return jsonify({"error": str(conflict), "conflicts": conflict.conflicts}), 409
+
+
+def requested_stream_format():
+    """Streaming format asked for via ?stream= or an NDJSON Accept header, else None"""
+    fmt = request.args.get("stream")
+    if fmt is None:
+        if request.accept_mimetypes.best == STREAM_FORMATS["ndjson"]:
+            return "ndjson"
+        return None
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"`stream` must be one of {', '.join(STREAM_FORMATS)}")
+    return fmt
+
+
 # GET all events
 @event_bp.route("/", methods=["GET"])
 def list_events():
     """
-    Get all events
+    Get all events, optionally filtered and sorted
     ---
     tags:
       - Events
+    parameters:
+      - name: status
+        in: query
+        type: string
+        enum: [upcoming, ongoing, past]
+      - name: recurrence
+        in: query
+        type: string
+        enum: [none, daily, weekly, monthly]
+      - name: has_email
+        in: query
+        type: boolean
+      - name: from
+        in: query
+        type: string
+        description: ISO-8601 lower bound on start_time (inclusive)
+      - name: to
+        in: query
+        type: string
+        description: ISO-8601 upper bound on start_time (inclusive)
+      - name: sort
+        in: query
+        type: string
+        enum: [start_time, end_time, title, created_at, updated_at]
+        default: start_time
+      - name: order
+        in: query
+        type: string
+        enum: [asc, desc]
+        default: asc
+      - name: stream
+        in: query
+        type: string
+        enum: [json, ndjson]
+        description: Stream results page by page in storage order (not sorted)
+      - name: fields
+        in: query
+        type: string
+        description: Comma-separated attributes to return (id is always included)
     responses:
       200:
-        description: List of all events
+        description: List of matching events
         schema:
           type: array
           items:
             type: object
+      304:
+        description: Collection not modified since the ETag sent in If-None-Match
+      400:
+        description: Invalid filter or sort parameter
     """
     try:
-        events = get_all_events()
-        return jsonify(events), 200
+        stream_format = requested_stream_format()
+        if stream_format:
+            if "sort" in request.args or "order" in request.args:
+                raise ValueError("`sort`/`order` are not supported when streaming")
+            return stream_pages(iter_event_pages(EventQuery.from_args(request.args)), stream_format)
+
+        query = EventQuery.from_args(request.args) if request.args else None
+        # The list validator depends only on the collection version and the
+        # query, so an unchanged collection is answered before touching storage
+        version = list_version(query)
+        etag = None if version is None else make_etag("list", version, sorted(request.args.items(multi=True)))
+        cached = None if etag is None else not_modified(etag)
+        if cached is not None:
+            return cached
+
+        events = get_all_events() if query is None else query_events(query)
+        if etag is None:
+            return jsonify(events), 200  # no validator without a change token
+        return json_with_etag(events, etag)
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -46,17 +154,31 @@ def get_event(event_id):
         name: event_id
         required: true
         type: string
+      - name: fields
+        in: query
+        type: string
+        description: Comma-separated attributes to return (id is always included)
     responses:
       200:
-        description: Event found
+        description: Event found (with a strong ETag)
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       404:
         description: Event not found
     """
     try:
-        event = get_event_by_id(event_id)
+        fields = parse_fields(request.args.get("fields"))
+        # updated_at is read even when not requested; the ETag is built from it
+        event = get_event_by_id(event_id, fields and tuple(dict.fromkeys((*fields, "updated_at"))))
         if not event:
             return jsonify({"error": "Event not found"}), 404
-        return jsonify(event), 200
+        etag = item_etag(event)
+        if fields:
+            etag = make_etag(etag, fields)
+            event = project([event], fields)[0]
+        return json_with_etag(event, etag)
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -71,6 +193,11 @@ def add_event():
     consumes:
       - application/json
     parameters:
+      - name: check_conflicts
+        in: query
+        type: boolean
+        default: false
+        description: Refuse the event if it overlaps another event with the same email
       - in: body
         name: body
         required: true
@@ -90,11 +217,107 @@ def add_event():
         description: Event created successfully
       400:
         description: Invalid input
+      409:
+        description: Overlaps existing events (only with check_conflicts)
     """
     try:
         data = request.get_json()
-        new_event = create_event(data)
+        new_event = create_event(data, check_conflicts=conflict_check_requested())
         return jsonify(new_event), 201
+    except ScheduleConflict as sc:
+        return conflict_response(sc)
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# POST bulk create / update / delete
+@event_bp.route("/bulk", methods=["POST"])
+def bulk_events():
+    """
+    Create, replace and delete many events in one request
+    ---
+    tags:
+      - Events
+    consumes:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          properties:
+            create:
+              type: array
+              items:
+                type: object
+            update:
+              type: array
+              description: Full replacements; each entry needs an id
+              items:
+                type: object
+            delete:
+              type: array
+              items:
+                type: string
+    responses:
+      200:
+        description: Every operation succeeded; per-item results
+      207:
+        description: Some operations failed; per-item results
+      400:
+        description: Malformed request
+    """
+    try:
+        results = bulk_write(request.get_json())
+        failed = sum(1 for result in results if result["status"] >= 400)
+        body = {"results": results, "succeeded": len(results) - failed, "failed": failed}
+        return jsonify(body), 207 if failed else 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# POST fetch many events by id
+@event_bp.route("/batch-get", methods=["POST"])
+def batch_get_events():
+    """
+    Get many events by id in one request
+    ---
+    tags:
+      - Events
+    consumes:
+      - application/json
+    parameters:
+      - name: fields
+        in: query
+        type: string
+        description: Comma-separated attributes to return (id is always included)
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          properties:
+            ids:
+              type: array
+              items:
+                type: string
+    responses:
+      200:
+        description: Events in request order (null where not found) and the missing ids
+      400:
+        description: Invalid ids
+    """
+    try:
+        body = request.get_json()
+        if not isinstance(body, dict):
+            raise ValueError("Body must be an object with an `ids` array")
+        event_ids = body.get("ids")
+        events = get_events_by_ids(event_ids, parse_fields(request.args.get("fields")))
+        missing = [event_id for event_id, event in zip(event_ids, events) if event is None]
+        return jsonify({"events": events, "missing": missing}), 200
     except ValueError as ve:
         return jsonify({"error": str(ve)}), 400
     except Exception as e:
@@ -115,6 +338,11 @@ def edit_event(event_id):
         name: event_id
         required: true
         type: string
+      - name: check_conflicts
+        in: query
+        type: boolean
+        default: false
+        description: Refuse the change if the event would overlap another with the same email
       - in: body
         name: body
         required: true
@@ -132,15 +360,28 @@ def edit_event(event_id):
     responses:
       200:
         description: Event updated successfully
+      400:
+        description: Invalid check_conflicts or event fields
       404:
         description: Event not found
+      409:
+        description: Overlaps existing events (only with check_conflicts)
     """
+    try:
+        check_conflicts = conflict_check_requested()
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
     try:
         data = request.get_json()
-        updated_event = update_event(event_id, data)
+        updated_event = update_event(event_id, data, check_conflicts=check_conflicts)
         return jsonify(updated_event), 200
+    except ScheduleConflict as sc:
+        return conflict_response(sc)
+    except EventNotFound as nf:
+        return jsonify({"error": str(nf)}), 404
     except ValueError as ve:
-        return jsonify({"error": str(ve)}), 404
+        return jsonify({"error": str(ve)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -166,8 +407,8 @@ def remove_event(event_id):
     try:
         delete_event(event_id)
         return jsonify({"message": "Event deleted"}), 200
-    except ValueError as ve:
-        return jsonify({"error": str(ve)}), 404
+    except EventNotFound as nf:
+        return jsonify({"error": str(nf)}), 404
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -186,6 +427,11 @@ def partial_update_event(event_id):
         name: event_id
         required: true
         type: string
+      - name: check_conflicts
+        in: query
+        type: boolean
+        default: false
+        description: Refuse the change if the event would overlap another with the same email
       - in: body
         name: body
         required: true
@@ -203,15 +449,28 @@ def partial_update_event(event_id):
     responses:
       200:
         description: Event updated successfully
+      400:
+        description: Invalid check_conflicts or event fields
       404:
         description: Event not found
+      409:
+        description: Overlaps existing events (only with check_conflicts)
     """
+    try:
+        check_conflicts = conflict_check_requested()
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
     try:
         data = request.get_json()
-        updated_event = update_event(event_id, data, partial=True)
+        updated_event = update_event(event_id, data, partial=True, check_conflicts=check_conflicts)
         return jsonify(updated_event), 200
+    except ScheduleConflict as sc:
+        return conflict_response(sc)
+    except EventNotFound as nf:
+        return jsonify({"error": str(nf)}), 404
     except ValueError as ve:
-        return jsonify({"error": str(ve)}), 404
+        return jsonify({"error": str(ve)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -228,16 +487,323 @@ def search():
         in: query
         type: string
         required: true
+      - name: stream
+        in: query
+        type: string
+        enum: [json, ndjson]
+        description: Stream matches page by page in storage order
+      - name: rank
+        in: query
+        type: string
+        enum: [bm25]
+        description: Return only the best `limit` matches by relevance, each with a `score`
+      - name: limit
+        in: query
+        type: integer
+        default: 10
+        description: Results to return when ranking
+      - name: fields
+        in: query
+        type: string
+        description: Comma-separated attributes to return (id is always included)
     responses:
       200:
-        description: Matching events
+        description: Matching events (best first, with scores, when ranked)
+      400:
+        description: Missing query or invalid parameter
     """
     query = request.args.get("q", "").strip()
     if not query:
         return jsonify({"error": "Search query `q` is required"}), 400
 
     try:
-        matches = search_event(query)
+        stream_format = requested_stream_format()
+        fields = parse_fields(request.args.get("fields"))
+        rank = request.args.get("rank")
+        if rank is not None and rank != "bm25":
+            raise ValueError("`rank` must be bm25")
+        if rank and stream_format:
+            raise ValueError("`rank` cannot be combined with `stream`")
+        limit = request.args.get("limit", 10, type=int)
+        if rank and not 1 <= limit <= SEARCH_RANK_MAX_LIMIT:
+            raise ValueError(f"`limit` must be between 1 and {SEARCH_RANK_MAX_LIMIT}")
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    try:
+        if rank:
+            return jsonify(search_ranked(query, limit, fields)), 200
+        if stream_format:
+            return stream_pages(iter_search_pages(query, fields), stream_format)
+        matches = search_event(query, fields)
         return jsonify(matches), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+@event_bp.route("/suggest", methods=["GET"])
+def suggest():
+    """
+    Autocomplete event titles and title words
+    ---
+    tags:
+      - Events
+    parameters:
+      - name: prefix
+        in: query
+        type: string
+        required: true
+        description: Case-insensitive start of a title or of a word in one
+      - name: limit
+        in: query
+        type: integer
+        default: 10
+    responses:
+      200:
+        description: Suggestions (text, kind title or token, number of events) ordered by count
+      400:
+        description: Missing prefix or invalid limit
+    """
+    limit = request.args.get("limit", 10, type=int)
+    if not 1 <= limit <= SUGGEST_MAX_LIMIT:
+        return jsonify({"error": f"`limit` must be between 1 and {SUGGEST_MAX_LIMIT}"}), 400
+
+    try:
+        prefix = request.args.get("prefix", "")
+        return jsonify({"prefix": prefix, "suggestions": suggest_titles(prefix, limit)}), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@event_bp.route("/conflicts", methods=["GET"])
+def conflicts():
+    """
+    List overlapping events that share an email
+    ---
+    tags:
+      - Events
+    parameters:
+      - name: email
+        in: query
+        type: string
+        description: Only this owner's events (default every owner)
+    responses:
+      200:
+        description: >
+          One entry per overlapping pair, current or within CONFLICT_HORIZON_DAYS:
+          email, ids, start and end of the first overlap, and how many occurrences overlap
+    """
+    try:
+        return jsonify(get_conflicts(request.args.get("email"))), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@event_bp.route("/freebusy", methods=["GET"])
+def free_busy():
+    """
+    Get one person's busy intervals in a date/time range
+    ---
+    tags:
+      - Events
+    parameters:
+      - name: email
+        in: query
+        type: string
+        required: true
+      - name: from
+        in: query
+        type: string
+        required: true
+        description: ISO-8601 start of the range (inclusive)
+      - name: to
+        in: query
+        type: string
+        required: true
+        description: ISO-8601 end of the range (exclusive)
+    responses:
+      200:
+        description: Disjoint busy intervals, in order, with recurring events expanded and clipped to the range
+      400:
+        description: Missing or invalid email, bound or range
+    """
+    try:
+        body = get_free_busy(request.args.get("email"), request.args.get("from"), request.args.get("to"))
+        return jsonify(body), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@event_bp.route("/stats", methods=["GET"])
+def event_stats():
+    """
+    Get aggregate event counts for the dashboard
+    ---
+    tags:
+      - Events
+    responses:
+      200:
+        description: total, upcoming, ongoing, past, today, recurring and with_email counts
+    """
+    try:
+        return jsonify(get_event_stats()), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@event_bp.route("/status-counts", methods=["GET"])
+def status_counts():
+    """
+    Count upcoming, ongoing and past events
+    ---
+    tags:
+      - Events
+    responses:
+      200:
+        description: Event counts by status
+    """
+    try:
+        return jsonify(get_status_counts()), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@event_bp.route("/upcoming", methods=["GET"])
+def upcoming():
+    """
+    Get the next N events that have not started yet
+    ---
+    tags:
+      - Events
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        default: 10
+      - name: fields
+        in: query
+        type: string
+        description: Comma-separated attributes to return (id is always included)
+    responses:
+      200:
+        description: Upcoming events ordered by start time
+    """
+    limit = request.args.get("limit", 10, type=int)
+    if limit < 1:
+        return jsonify({"error": "`limit` must be a positive integer"}), 400
+
+    try:
+        fields = parse_fields(request.args.get("fields"))
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    try:
+        return jsonify(get_upcoming_events(limit, fields)), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@event_bp.route("/range", methods=["GET"])
+def events_in_range():
+    """
+    Get events starting within a date/time range
+    ---
+    tags:
+      - Events
+    parameters:
+      - name: from
+        in: query
+        type: string
+        description: ISO-8601 lower bound (inclusive)
+      - name: to
+        in: query
+        type: string
+        description: ISO-8601 upper bound (inclusive)
+      - name: fields
+        in: query
+        type: string
+        description: Comma-separated attributes to return (id is always included)
+    responses:
+      200:
+        description: Matching events ordered by start time
+      400:
+        description: Invalid bound
+    """
+    try:
+        fields = parse_fields(request.args.get("fields"))
+        events = get_events_in_range(request.args.get("from"), request.args.get("to"), fields)
+        return jsonify(events), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@event_bp.route("/changes", methods=["GET"])
+def changes():
+    """
+    Get events created, updated and deleted since a change token
+    ---
+    tags:
+      - Events
+    parameters:
+      - name: since
+        in: query
+        type: string
+        description: Token from a previous response; omit to get the current token only
+      - name: limit
+        in: query
+        type: integer
+        default: 500
+    responses:
+      200:
+        description: Created and updated events, deleted ids, the next token and whether more changes remain
+      400:
+        description: Invalid token or limit
+      410:
+        description: Token predates the retained change history; resync with a full listing
+    """
+    limit = request.args.get("limit", 500, type=int)
+    if not 1 <= limit <= CHANGES_MAX_LIMIT:
+        return jsonify({"error": f"`limit` must be between 1 and {CHANGES_MAX_LIMIT}"}), 400
+
+    try:
+        return jsonify(get_changes(request.args.get("since"), limit)), 200
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+    except ChangeGone as cg:
+        return jsonify({"error": str(cg)}), 410
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@event_bp.route("/stream", methods=["GET"])
+def live_updates():
+    """
+    Server-Sent Events stream of event changes
+    ---
+    tags:
+      - Events
+    produces:
+      - text/event-stream
+    responses:
+      200:
+        description: >
+          `created`, `updated` and `deleted` messages as writes happen, a
+          `resync` message when the client fell behind (or reconnected), and a
+          keep-alive comment every SSE_HEARTBEAT_SECONDS
+      503:
+        description: This worker already serves its maximum number of streams
+    """
+    try:
+        messages, close = open_event_stream(resync="Last-Event-ID" in request.headers)
+    except SubscriberLimitReached as e:
+        return jsonify({"error": str(e)}), 503
+    response = sse_response(messages)
+    # Runs even if the client disconnects before the first message
+    response.call_on_close(close)
+    return response
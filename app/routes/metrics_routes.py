@@ -0,0 +1,19 @@
+from flask import Blueprint, jsonify
+
+from app.utils.metrics import collect_metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+# GET runtime metrics
+@metrics_bp.route("", methods=["GET"])
+def get_metrics():
+    """
+    Get runtime metrics (compression, caches, ...)
+    ---
+    tags:
+      - Metrics
+    responses:
+      200:
+        description: Metric values grouped by component
+    """
+    return jsonify(collect_metrics()), 200
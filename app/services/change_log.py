@@ -0,0 +1,214 @@
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+# Change operations recorded in the log
+OP_CREATE = "create"
+OP_UPDATE = "update"
+OP_DELETE = "delete"  # tombstone: the id only, no body
+
+# Partition holding every change record, and the item holding the counter
+STREAM = "events"
+COUNTER = "counter"
+
+
+class ChangeGone(Exception):
+    """The requested token predates compacted history; the client must resync"""
+
+
+class ChangeLog:
+    """Append-only log of writes to the events table, stored in its own DynamoDB table.
+
+    Records live in one partition keyed by a sequence number taken from an
+    atomic counter, so ``seq`` is the monotonic change token handed to
+    clients. Deletes are recorded as tombstones. ``compact()`` drops records
+    superseded by a later change to the same id, and purges everything older
+    than the retention window; tokens from before that point get ChangeGone.
+    """
+
+    def __init__(self, dynamodb, table_name: str, gap_grace_seconds: float = 5):
+        self.dynamodb = dynamodb
+        self.table_name = table_name
+        self.table = dynamodb.Table(table_name)
+        self.gap_grace_seconds = gap_grace_seconds
+
+    def create_table_if_not_exists(self):
+        """Create the change log table if it doesn't exist"""
+        try:
+            self.dynamodb.meta.client.describe_table(TableName=self.table_name)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ResourceNotFoundException':
+                raise
+            table = self.dynamodb.create_table(
+                TableName=self.table_name,
+                KeySchema=[
+                    {'AttributeName': 'stream', 'KeyType': 'HASH'},
+                    {'AttributeName': 'seq', 'KeyType': 'RANGE'},
+                ],
+                AttributeDefinitions=[
+                    {'AttributeName': 'stream', 'AttributeType': 'S'},
+                    {'AttributeName': 'seq', 'AttributeType': 'N'},
+                ],
+                BillingMode='PAY_PER_REQUEST'
+            )
+            table.meta.client.get_waiter('table_exists').wait(TableName=self.table_name)
+            print(f"✅ Created table {self.table_name}")
+
+    def append(self, changes: Sequence[Tuple[str, str]]) -> Optional[int]:
+        """Record ``(event_id, op)`` changes, returning the last sequence number used"""
+        if not changes:
+            return None
+        # One atomic ADD reserves a contiguous block of sequence numbers
+        response = self.table.update_item(
+            Key={'stream': COUNTER, 'seq': 0},
+            UpdateExpression='ADD last_seq :n',
+            ExpressionAttributeValues={':n': len(changes)},
+            ReturnValues='UPDATED_NEW',
+        )
+        last = int(response['Attributes']['last_seq'])
+        now = int(time.time())
+        with self.table.batch_writer() as batch:
+            for offset, (event_id, op) in enumerate(changes):
+                batch.put_item(Item={
+                    'stream': STREAM,
+                    'seq': last - len(changes) + 1 + offset,
+                    'id': event_id,
+                    'op': op,
+                    'at': now,
+                })
+        return last
+
+    def _counter(self) -> Dict:
+        return self.table.get_item(Key={'stream': COUNTER, 'seq': 0}).get('Item') or {}
+
+    def latest(self) -> int:
+        """Current token: the last sequence number handed out"""
+        return int(self._counter().get('last_seq', 0))
+
+    def _query(self, after: int, limit: Optional[int] = None) -> List[Dict]:
+        kwargs = {'KeyConditionExpression': Key('stream').eq(STREAM) & Key('seq').gt(after)}
+        records = []
+        while True:
+            if limit is not None:
+                kwargs['Limit'] = limit - len(records)
+            response = self.table.query(**kwargs)
+            records.extend(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response or (limit is not None and len(records) >= limit):
+                return records
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def since(self, token: int, limit: int = 500, now: Optional[float] = None) -> Tuple[List[Dict], int, bool]:
+        """Records after ``token`` in order, the token to resume from, and whether more remain.
+
+        A writer reserves its sequence number before its record lands, so a
+        missing number followed by a fresh record may still be in flight:
+        reading stops before such a gap until it is ``gap_grace_seconds`` old.
+        """
+        if token < int(self._counter().get('compacted_through', 0)):
+            raise ChangeGone(f"Token {token} is older than the retained change history")
+        now = time.time() if now is None else now
+        records = self._query(token, limit + 1)
+        has_more = len(records) > limit
+        settled = []
+        expected = token + 1
+        for record in records[:limit]:
+            seq = int(record['seq'])
+            if seq != expected and record['at'] > now - self.gap_grace_seconds:
+                has_more = True
+                break
+            settled.append(record)
+            expected = seq + 1
+        return settled, expected - 1, has_more
+
+    def compact(self, retain_seconds: float, now: Optional[float] = None) -> int:
+        """Drop superseded and expired records; returns how many were deleted"""
+        now = time.time() if now is None else now
+        settled_before = now - self.gap_grace_seconds
+        records = self._query(int(self._counter().get('compacted_through', 0)))
+        latest_by_id = {}
+        for record in records:
+            if record['at'] <= settled_before:
+                latest_by_id[record['id']] = int(record['seq'])
+
+        expired_through = 0
+        doomed = []
+        for record in records:
+            seq = int(record['seq'])
+            if record['at'] < now - retain_seconds:
+                expired_through = seq
+                doomed.append(seq)
+            elif seq < latest_by_id.get(record['id'], seq):
+                # A settled later change to the same id makes this one redundant
+                doomed.append(seq)
+
+        if expired_through:
+            # Raise the watermark first so no reader is served a truncated history
+            self.table.update_item(
+                Key={'stream': COUNTER, 'seq': 0},
+                UpdateExpression='SET compacted_through = :s',
+                ExpressionAttributeValues={':s': expired_through},
+            )
+        with self.table.batch_writer() as batch:
+            for seq in doomed:
+                batch.delete_item(Key={'stream': STREAM, 'seq': seq})
+        print(f"✅ Compacted change log: {len(doomed)} records removed")
+        return len(doomed)
+
+
+class MemoryChangeLog:
+    """Process-local change log with the same interface, for the in-memory store"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = []
+        self._last_seq = 0
+        self._compacted_through = 0
+
+    def append(self, changes: Sequence[Tuple[str, str]], now: Optional[float] = None) -> Optional[int]:
+        if not changes:
+            return None
+        now = int(time.time() if now is None else now)
+        with self._lock:
+            for event_id, op in changes:
+                self._last_seq += 1
+                self._records.append({'seq': self._last_seq, 'id': event_id, 'op': op, 'at': now})
+            return self._last_seq
+
+    def latest(self) -> int:
+        return self._last_seq
+
+    def snapshot(self) -> Tuple[List[Dict], int, int]:
+        """Retained records, last sequence number and compaction watermark (for persisting)"""
+        with self._lock:
+            return list(self._records), self._last_seq, self._compacted_through
+
+    def restore(self, records: List[Dict], last_seq: int, compacted_through: int):
+        """Replace the log's state with one previously taken by ``snapshot()``"""
+        with self._lock:
+            self._records = sorted(records, key=lambda record: record['seq'])
+            self._last_seq = max(last_seq, self._records[-1]['seq'] if self._records else 0)
+            self._compacted_through = compacted_through
+
+    def since(self, token: int, limit: int = 500, now: Optional[float] = None) -> Tuple[List[Dict], int, bool]:
+        with self._lock:
+            if token < self._compacted_through:
+                raise ChangeGone(f"Token {token} is older than the retained change history")
+            records = [record for record in self._records if record['seq'] > token]
+        page = records[:limit]
+        return page, page[-1]['seq'] if page else token, len(records) > limit
+
+    def compact(self, retain_seconds: float, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        with self._lock:
+            latest_by_id = {record['id']: record['seq'] for record in self._records}
+            expired = [record['seq'] for record in self._records if record['at'] < now - retain_seconds]
+            if expired:
+                self._compacted_through = max(self._compacted_through, max(expired))
+            kept = [record for record in self._records
+                    if record['at'] >= now - retain_seconds and record['seq'] == latest_by_id[record['id']]]
+            removed = len(self._records) - len(kept)
+            self._records = kept
+        return removed
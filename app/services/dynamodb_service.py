@@ -1,32 +1,133 @@
 import boto3
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Sequence
+from boto3.dynamodb.conditions import Attr
 from botocore.exceptions import ClientError
 import os
 from dotenv import load_dotenv
 
+from app.models.event_model import to_epoch
+from app.services.change_log import OP_CREATE, OP_DELETE, OP_UPDATE, ChangeLog
+from app.services.event_store import (
+    REMINDER_MARKER_TTL_SECONDS, EventNotFound, EventStore, matches_text, project, put_op, start_epoch_of,
+)
+from app.utils.json_provider import json_default
+from app.utils.metrics import register_metrics
+from app.utils.singleflight import SingleFlight, share_items
+
 load_dotenv()
 
-class DynamoDBService:
+# DynamoDB limit on requests per BatchWriteItem call
+BATCH_WRITE_SIZE = 25
+
+# DynamoDB limit on keys per BatchGetItem call
+BATCH_GET_SIZE = 100
+
+# First backoff delay (seconds) before re-sending unprocessed batch items
+BATCH_RETRY_BASE_SECONDS = 0.05
+
+# Attempts at appending a write's change record before the write is reported failed
+CHANGE_RECORD_ATTEMPTS = 3
+
+
+class ChangeNotRecorded(Exception):
+    """The item was written but its change log record could not be appended"""
+
+
+def projection_args(fields: Optional[Sequence[str]]) -> Dict:
+    """ProjectionExpression kwargs that read only ``fields`` (all attributes when None)"""
+    if not fields:
+        return {}
+    # Placeholders sidestep reserved words; boto3's generated condition names use #n
+    names = {f"#p{i}": field for i, field in enumerate(fields)}
+    return {'ProjectionExpression': ", ".join(names), 'ExpressionAttributeNames': names}
+
+
+def _with_fields(fields: Optional[Sequence[str]], *extra: str) -> Optional[Sequence[str]]:
+    """``fields`` plus attributes needed internally (None stays None)"""
+    if fields is None:
+        return None
+    return tuple(dict.fromkeys((*fields, *extra)))
+
+
+def _fields_key(fields: Optional[Sequence[str]]) -> Optional[tuple]:
+    return None if fields is None else tuple(fields)
+
+
+def _request_key(request: Dict) -> str:
+    """Event id targeted by one BatchWriteItem request"""
+    if 'PutRequest' in request:
+        return request['PutRequest']['Item']['id']
+    return request['DeleteRequest']['Key']['id']
+
+
+class DynamoDBService(EventStore):
     """Service layer for DynamoDB operations"""
     
     def __init__(self):
-        self.dynamodb = boto3.resource('dynamodb')
         self.table_name = os.getenv('DYNAMODB_TABLE_NAME', 'events')
+        self.changes_table_name = os.getenv('DYNAMODB_CHANGES_TABLE_NAME', f"{self.table_name}_changes")
+        self.reminders_table_name = os.getenv('DYNAMODB_REMINDERS_TABLE_NAME', f"{self.table_name}_reminders")
+        self.identity = f"dynamodb:{self.table_name}"
+        # Concurrent identical full-table reads share one scan
+        self.flights = SingleFlight()
+        register_metrics("singleflight", self.flights.metrics)
+        self.reconnect()
+
+    def reconnect(self):
+        """Create the boto3 resource and table handle"""
+        # boto3 connection pools are not fork-safe: prefork workers call this
+        # again after forking from the preloaded master.
+        self.dynamodb = boto3.resource('dynamodb')
         self.table = self.dynamodb.Table(self.table_name)
+        self.reminders_table = self.dynamodb.Table(self.reminders_table_name)
+        self.change_log = ChangeLog(self.dynamodb, self.changes_table_name)
+    
+    def _record_changes(self, changes):
+        """Append successful writes to the change log, retrying with backoff.
+
+        A write missing from the log never reaches the change feed, other
+        workers' indexes or SSE streams, so once the attempts run out this
+        raises and the caller answers with a 5xx rather than a silent success.
+        Retrying can only leave sequence gaps or repeat a record, which
+        readers already tolerate.
+        """
+        for attempt in range(CHANGE_RECORD_ATTEMPTS):
+            if attempt:
+                time.sleep(BATCH_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+            try:
+                self.change_log.append(changes)
+                return
+            except Exception as e:
+                error = e
+        print(f"❌ Could not record changes {changes}: {error}")
+        raise ChangeNotRecorded(f"Write saved but its change record failed: {error}")
         
     def create_table_if_not_exists(self):
-        """Create the events table if it doesn't exist"""
+        """Create the events, sent-reminder and change log tables if they don't exist"""
+        self._create_id_table(self.table_name)
+        if self._create_id_table(self.reminders_table_name):
+            # Markers of past occurrences are never read again
+            self.dynamodb.meta.client.update_time_to_live(
+                TableName=self.reminders_table_name,
+                TimeToLiveSpecification={'Enabled': True, 'AttributeName': 'expires_at'})
+        self.change_log.create_table_if_not_exists()
+
+    def _create_id_table(self, table_name: str) -> bool:
+        """Create a table keyed by ``id`` if it doesn't exist; True if it was created"""
         try:
             # Check if table exists
-            self.dynamodb.meta.client.describe_table(TableName=self.table_name)
-            print(f"✅ Table {self.table_name} already exists")
+            self.dynamodb.meta.client.describe_table(TableName=table_name)
+            print(f"✅ Table {table_name} already exists")
+            return False
         except ClientError as e:
             if e.response['Error']['Code'] == 'ResourceNotFoundException':
                 # Create table
                 table = self.dynamodb.create_table(
-                    TableName=self.table_name,
+                    TableName=table_name,
                     KeySchema=[
                         {
                             'AttributeName': 'id',
@@ -43,34 +144,69 @@ class DynamoDBService:
                 )
                 
                 # Wait for table to be created
-                table.meta.client.get_waiter('table_exists').wait(TableName=self.table_name)
-                print(f"✅ Created table {self.table_name}")
-            else:
-                raise e
+                table.meta.client.get_waiter('table_exists').wait(TableName=table_name)
+                print(f"✅ Created table {table_name}")
+                return True
+            raise e
+    
+    def iter_pages(self, **scan_kwargs) -> Iterator[List[Dict]]:
+        """Scan the table lazily, yielding each page of items as it arrives"""
+        response = self.table.scan(**scan_kwargs)
+        yield response.get('Items', [])
+        
+        # Handle pagination
+        while 'LastEvaluatedKey' in response:
+            response = self.table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_kwargs)
+            yield response.get('Items', [])
+    
+    def _scan_all(self, **scan_kwargs) -> List[Dict]:
+        """Scan the whole table, following pagination"""
+        events = []
+        for page in self.iter_pages(**scan_kwargs):
+            events.extend(page)
+        return events
     
-    def get_all_events(self) -> List[Dict]:
-        """Get all events from DynamoDB"""
+    def get_all_events(self, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Get all events from DynamoDB, optionally reading only ``fields``"""
+        return self.flights.do(("all", _fields_key(fields)), lambda: self._get_all_events(fields), share_items)
+
+    def _get_all_events(self, fields: Optional[Sequence[str]]) -> List[Dict]:
         try:
-            response = self.table.scan()
-            events = response.get('Items', [])
-            
-            # Handle pagination
-            while 'LastEvaluatedKey' in response:
-                response = self.table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-                events.extend(response.get('Items', []))
+            events = self._scan_all(**projection_args(_with_fields(fields, 'start_epoch', 'start_time')))
             
-            # Sort by start_time
-            events.sort(key=lambda x: x.get('start_time', ''))
-            return events
+            # Sort by start_epoch
+            events.sort(key=start_epoch_of)
+            return project(events, fields)
             
         except ClientError as e:
             print(f"❌ Error getting events: {e}")
             return []
     
-    def get_event_by_id(self, event_id: str) -> Optional[Dict]:
+    def scan_events(self, condition, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Get events matching a filter condition, evaluated by DynamoDB"""
+        try:
+            return self._scan_all(FilterExpression=condition, **projection_args(fields))
+        except ClientError as e:
+            print(f"❌ Error scanning events: {e}")
+            return []
+    
+    def query_events(self, query, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Events matching an EventQuery, with its filters pushed down to the scan"""
+        key = ("query", query.status, query.recurrence, query.has_email, query.start_epoch, query.end_epoch,
+               _fields_key(fields))
+        return self.flights.do(key, lambda: self.scan_events(query.filter_expression(), fields), share_items)
+    
+    def iter_query_pages(self, query=None, fields: Optional[Sequence[str]] = None) -> Iterator[List[Dict]]:
+        """Scan pages as DynamoDB returns them, filters and projection pushed down"""
+        kwargs = projection_args(fields)
+        if query is not None and query.has_filters:
+            kwargs['FilterExpression'] = query.filter_expression()
+        return self.iter_pages(**kwargs)
+    
+    def get_event_by_id(self, event_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict]:
         """Get a specific event by ID"""
         try:
-            response = self.table.get_item(Key={'id': event_id})
+            response = self.table.get_item(Key={'id': event_id}, **projection_args(fields))
             return response.get('Item')
         except ClientError as e:
             print(f"❌ Error getting event {event_id}: {e}")
@@ -86,6 +222,7 @@ class DynamoDBService:
             
             # Insert into DynamoDB
             self.table.put_item(Item=event_data)
+            self._record_changes([(event_data['id'], OP_CREATE)])
             print(f"✅ Created event: {event_data['title']}")
             return event_data
             
@@ -99,7 +236,7 @@ class DynamoDBService:
             # Get existing event
             existing_event = self.get_event_by_id(event_id)
             if not existing_event:
-                raise ValueError("Event not found")
+                raise EventNotFound("Event not found")
             
             # Update fields
             existing_event.update(event_data)
@@ -107,6 +244,7 @@ class DynamoDBService:
             
             # Save to DynamoDB
             self.table.put_item(Item=existing_event)
+            self._record_changes([(event_id, OP_UPDATE)])
             print(f"✅ Updated event: {existing_event['title']}")
             return existing_event
             
@@ -120,10 +258,11 @@ class DynamoDBService:
             # Check if event exists
             existing_event = self.get_event_by_id(event_id)
             if not existing_event:
-                raise ValueError("Event not found")
+                raise EventNotFound("Event not found")
             
             # Delete from DynamoDB
             self.table.delete_item(Key={'id': event_id})
+            self._record_changes([(event_id, OP_DELETE)])
             print(f"✅ Deleted event: {existing_event['title']}")
             return True
             
@@ -131,39 +270,140 @@ class DynamoDBService:
             print(f"❌ Error deleting event: {e}")
             raise Exception(f"Failed to delete event: {str(e)}")
     
-    def search_events(self, query: str) -> List[Dict]:
+    def _put(self, item: Dict):
+        """Store ``item`` as-is (batch_write and backfill_epochs have their own paths here)"""
+        self.table.put_item(Item=item)
+
+    def _remove(self, event_id: str):
+        self.table.delete_item(Key={'id': event_id})
+
+    def claim_reminder(self, event_id: str, occurrence_epoch: int) -> bool:
+        """Mark an occurrence's reminder as sent in the reminders table.
+
+        A conditional put, so one worker on any host wins. The marker lives
+        outside the event item, so a claim changes no event and records no
+        change; DynamoDB's TTL removes it once the occurrence is long past.
+        """
+        if self.get_event_by_id(event_id, ('id',)) is None:
+            return False
+        try:
+            self.reminders_table.put_item(
+                Item={'id': event_id, 'occurrence': occurrence_epoch, 'sent_at': datetime.now().isoformat(),
+                      'expires_at': occurrence_epoch + REMINDER_MARKER_TTL_SECONDS},
+                ConditionExpression='attribute_not_exists(id) OR occurrence < :o',
+                ExpressionAttributeValues={':o': occurrence_epoch},
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise
+        return True
+
+    def batch_write(self, put_items: List[Dict], delete_ids: List[str] = (), max_workers: int = 4,
+                    max_attempts: int = 5) -> Dict[str, str]:
+        """Put and delete many items with parallel BatchWriteItem calls.
+
+        Requests are sent in chunks of 25, several chunks at a time.
+        Unprocessed items are re-sent with exponential backoff. Returns
+        ``{id: error}`` for every item that could not be written.
+        """
+        requests = [{'PutRequest': {'Item': item}} for item in put_items]
+        requests += [{'DeleteRequest': {'Key': {'id': event_id}}} for event_id in delete_ids]
+        chunks = [requests[i:i + BATCH_WRITE_SIZE] for i in range(0, len(requests), BATCH_WRITE_SIZE)]
+        failures = {}
+        if not chunks:
+            return failures
+        # The low-level client is thread-safe, unlike the resource/table objects
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+            for chunk_failures in pool.map(lambda chunk: self._write_chunk(chunk, max_attempts), chunks):
+                failures.update(chunk_failures)
+        changes = [(item['id'], put_op(item)) for item in put_items if item['id'] not in failures]
+        changes += [(event_id, OP_DELETE) for event_id in delete_ids if event_id not in failures]
+        self._record_changes(changes)
+        return failures
+    
+    def _write_chunk(self, requests: List[Dict], max_attempts: int) -> Dict[str, str]:
+        client = self.dynamodb.meta.client
+        pending = requests
+        for attempt in range(max_attempts):
+            if attempt:
+                time.sleep(BATCH_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+            try:
+                response = client.batch_write_item(RequestItems={self.table_name: pending})
+            except ClientError as e:
+                print(f"❌ Error in batch write: {e}")
+                return {_request_key(request): str(e) for request in pending}
+            pending = response.get('UnprocessedItems', {}).get(self.table_name, [])
+            if not pending:
+                return {}
+        return {_request_key(request): "Not processed after retries" for request in pending}
+    
+    def batch_get(self, event_ids: List[str], fields: Optional[Sequence[str]] = None, max_workers: int = 4,
+                  max_attempts: int = 5) -> Dict[str, Dict]:
+        """Fetch many items with parallel BatchGetItem calls, returning ``{id: item}`` for those found.
+
+        Keys go out in chunks of 100; UnprocessedKeys are re-requested with
+        exponential backoff. Raises if some keys stay unprocessed.
+        """
+        unique_ids = list(dict.fromkeys(event_ids))  # BatchGetItem rejects duplicate keys
+        chunks = [unique_ids[i:i + BATCH_GET_SIZE] for i in range(0, len(unique_ids), BATCH_GET_SIZE)]
+        found = {}
+        if not chunks:
+            return found
+        projection = projection_args(_with_fields(fields, 'id'))
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+            for items in pool.map(lambda chunk: self._get_chunk(chunk, projection, max_attempts), chunks):
+                found.update((item['id'], item) for item in project(items, fields))
+        return found
+    
+    def _get_chunk(self, event_ids: List[str], projection: Dict, max_attempts: int) -> List[Dict]:
+        client = self.dynamodb.meta.client
+        pending = [{'id': event_id} for event_id in event_ids]
+        items = []
+        for attempt in range(max_attempts):
+            if attempt:
+                time.sleep(BATCH_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+            try:
+                response = client.batch_get_item(RequestItems={self.table_name: {'Keys': pending, **projection}})
+            except ClientError as e:
+                print(f"❌ Error in batch get: {e}")
+                raise Exception(f"Failed to get events: {str(e)}")
+            items.extend(response.get('Responses', {}).get(self.table_name, []))
+            pending = response.get('UnprocessedKeys', {}).get(self.table_name, {}).get('Keys', [])
+            if not pending:
+                return items
+        raise Exception(f"Failed to get events: {len(pending)} keys not processed after retries")
+    
+    def search_events(self, query: str, fields: Optional[Sequence[str]] = None) -> List[Dict]:
         """Search events by title or description"""
+        key = ("search", query.lower(), _fields_key(fields))
+        return self.flights.do(key, lambda: self._search_events(query, fields), share_items)
+
+    def _search_events(self, query: str, fields: Optional[Sequence[str]]) -> List[Dict]:
         try:
             # Get all events and filter locally
             # For production, consider using DynamoDB Global Secondary Index
-            all_events = self.get_all_events()
+            all_events = self.get_all_events(_with_fields(fields, 'title', 'description'))
             query_lower = query.lower()
-            
-            matching_events = []
-            for event in all_events:
-                title = event.get('title', '').lower()
-                description = event.get('description', '').lower()
-                
-                if query_lower in title or query_lower in description:
-                    matching_events.append(event)
-            
-            return matching_events
+            return project([event for event in all_events if matches_text(event, query_lower)], fields)
             
         except Exception as e:
             print(f"❌ Error searching events: {e}")
             return []
     
+    def iter_search_pages(self, query: str, fields: Optional[Sequence[str]] = None) -> Iterator[List[Dict]]:
+        """Search page by page, yielding matches as each scan page arrives"""
+        query_lower = query.lower()
+        for page in self.iter_pages(**projection_args(_with_fields(fields, 'title', 'description'))):
+            yield project([event for event in page if matches_text(event, query_lower)], fields)
+    
     def get_events_by_date_range(self, start_date: str, end_date: str) -> List[Dict]:
         """Get events within a date range"""
         try:
-            all_events = self.get_all_events()
-            matching_events = []
-            
-            for event in all_events:
-                event_start = event.get('start_time', '')
-                if start_date <= event_start <= end_date:
-                    matching_events.append(event)
-            
+            # Compare normalized epochs, not strings, so mixed precisions and offsets order correctly
+            condition = Attr('start_epoch').between(to_epoch(start_date, 'start_date'), to_epoch(end_date, 'end_date'))
+            matching_events = self._scan_all(FilterExpression=condition)
+            matching_events.sort(key=start_epoch_of)
             return matching_events
             
         except Exception as e:
@@ -180,6 +420,28 @@ class DynamoDBService:
             print(f"❌ Error getting events with email: {e}")
             return []
     
+    def backfill_epochs(self) -> int:
+        """Add start_epoch/end_epoch to items written before they were stored"""
+        items = self._scan_all(FilterExpression=Attr('start_epoch').not_exists() | Attr('end_epoch').not_exists())
+        updated = 0
+        for item in items:
+            try:
+                start_epoch = to_epoch(item['start_time'], 'start_time')
+                end_epoch = to_epoch(item['end_time'], 'end_time')
+            except (KeyError, ValueError) as e:
+                print(f"⚠️ Skipping event {item.get('id')}: {e}")
+                continue
+            # Plain attribute update so concurrent edits to other fields are kept
+            self.table.update_item(
+                Key={'id': item['id']},
+                UpdateExpression='SET start_epoch = :s, end_epoch = :e',
+                ExpressionAttributeValues={':s': start_epoch, ':e': end_epoch},
+            )
+            self._record_changes([(item['id'], OP_UPDATE)])
+            updated += 1
+        print(f"✅ Backfilled epochs on {updated} events")
+        return updated
+    
     def migrate_from_json(self, json_file_path: str):
         """Migrate events from JSON file to DynamoDB"""
         try:
@@ -194,6 +456,8 @@ class DynamoDBService:
             
             for event in events:
                 try:
+                    event.setdefault('start_epoch', to_epoch(event['start_time'], 'start_time'))
+                    event.setdefault('end_epoch', to_epoch(event['end_time'], 'end_time'))
                     self.create_event(event)
                 except Exception as e:
                     print(f"❌ Failed to migrate event {event.get('title', 'Unknown')}: {e}")
@@ -209,7 +473,7 @@ class DynamoDBService:
             events = self.get_all_events()
             
             with open(json_file_path, 'w') as f:
-                json.dump(events, f, indent=4, default=str)
+                json.dump(events, f, indent=4, default=json_default)
             
             print(f"✅ Exported {len(events)} events to {json_file_path}")
             
@@ -0,0 +1,611 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.change_log import ChangeGone
+from app.services.event_store import start_epoch_of
+from app.services.intervals import (
+    RECURRING_INTERVALS,
+    IntervalTree,
+    merge_intervals,
+    occurrences,
+    overlapping_pairs,
+    span,
+)
+from app.services.ranking import RANKED_FIELDS, CorpusStats, TermStats
+from app.services.snapshot import Snapshot, write_snapshot
+from app.services.suggest_index import SuggestIndex
+from app.models.event_model import to_epoch
+
+
+def classify(start: int, end: int, now: int):
+    """Status of one event at ``now`` and the epoch at which that status next changes"""
+    if now < start:
+        return "upcoming", start
+    if now <= end:
+        return "ongoing", end + 1
+    return "past", None
+
+
+def _owner_key(email: Optional[str]) -> Optional[str]:
+    return email.strip().lower() if email else None
+
+
+class SnapshotItems(dict):
+    """Item dicts decoded from a snapshot the first time each one is needed"""
+
+    def __init__(self, snapshot: Snapshot, rows: Dict[str, int]):
+        super().__init__()
+        self._snapshot = snapshot
+        self._snapshot_rows = dict(rows)
+
+    def __missing__(self, event_id: str) -> Dict:
+        item = self._snapshot.item(self._snapshot_rows.pop(event_id))
+        self[event_id] = item
+        return item
+
+    def field(self, event_id: str, name: str):
+        """One field of an item, read straight from the snapshot if it is not decoded yet"""
+        row = self._snapshot_rows.get(event_id)
+        if row is None:
+            return self[event_id].get(name)
+        return self._snapshot.string(name, row)
+
+    def pop(self, event_id: str, *default):
+        if event_id in self._snapshot_rows:
+            self[event_id]
+        return super().pop(event_id, *default)
+
+
+class EventIndex:
+    """Columnar in-memory cache of event ids and start/end epochs.
+
+    Rows live in parallel NumPy arrays so status counts, date-range masks and
+    next-N-upcoming lookups are single vectorized operations. Writes made
+    through ``event_service`` are applied in place; the whole index is
+    reloaded from storage once it is older than ``refresh_seconds`` so writes
+    made by other worker processes show up too.
+
+    Aggregate stats are maintained incrementally: writes adjust the counters
+    directly, and the time-dependent counts (status, today) are only
+    reclassified once the clock passes the next start/end/midnight boundary.
+
+    Given ``latest_token`` and ``changes_since``, the index remembers the
+    change-log token its contents reflect and refreshes by applying only
+    the changes since then, falling back to a full reload when that history
+    has been compacted away and at least every ``reload_seconds``. It can
+    also start from a snapshot file (``load_snapshot``) and catch up from
+    its token instead of loading everything.
+
+    Title autocomplete (``suggest``) uses a SuggestIndex built from the
+    titles on first use after each load and updated by every write after;
+    the term statistics behind ranked search (``term_stats``) work the same.
+
+    Conflict detection keeps each owner's (``email``'s) event ids and, for
+    owners that have been asked about, an IntervalTree of their one-off
+    events plus recurring occurrences from today to ``horizon_seconds``
+    ahead. Trees are built per owner on demand, updated by writes, and
+    rebuilt when the day rolls over. A check costs O(log n + k) in that
+    owner's intervals, or O(n) in them when the owner's tree changed since
+    the last check, rather than a scan of every event.
+    """
+
+    def __init__(self, loader: Callable[[], List[Dict]], refresh_seconds: float = 30,
+                 latest_token: Optional[Callable[[], int]] = None,
+                 changes_since: Optional[Callable[[int], Tuple[List[Dict], List[str], int]]] = None,
+                 reload_seconds: float = 3600, suggest_scan_limit: int = 1000,
+                 horizon_seconds: int = 90 * 86400):
+        self._loader = loader
+        self._refresh_seconds = refresh_seconds
+        self._latest_token = latest_token
+        self._changes_since = changes_since
+        self._reload_seconds = reload_seconds
+        self._suggest_scan_limit = suggest_scan_limit
+        self._horizon_seconds = horizon_seconds
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._reloaded_at = None
+        self._token = None
+        self._reset(0)
+
+    def _reset(self, capacity: int):
+        capacity = max(capacity, 16)
+        self._size = 0
+        self._ids = []
+        self._rows = {}
+        self._items = {}
+        self._start = np.empty(capacity, dtype=np.int64)
+        self._end = np.empty(capacity, dtype=np.int64)
+        self._recurrence = np.empty(capacity, dtype=np.int8)  # code from _recurrence_codes
+        self._has_email = np.empty(capacity, dtype=bool)
+        self._recurrence_codes = {"": 0}
+        self._recurring = 0
+        self._with_email = 0
+        self._suggest = None  # built on the first suggest() after a load
+        self._terms = None  # built on the first term_stats() after a load
+        self._owners = None  # lower-cased email -> event ids, built on first use
+        self._owner_trees = {}  # email -> IntervalTree over _window
+        self._window = None
+        # Time-dependent counts as of _stats_at, valid until _stats_valid_until
+        self._time_counts = None
+        self._stats_at = None
+        self._stats_valid_until = None
+
+    # ---- loading and write-through -------------------------------------
+
+    def invalidate(self):
+        """Drop the cached data so the next query reloads it"""
+        with self._lock:
+            self._loaded_at = None
+
+    def is_fresh(self) -> bool:
+        """Whether queries can be answered without reloading from storage"""
+        with self._lock:
+            return self._loaded_at is not None and time.monotonic() - self._loaded_at <= self._refresh_seconds
+
+    @property
+    def token(self) -> Optional[int]:
+        """Change-log token the current contents reflect, None if unknown"""
+        with self._lock:
+            return self._token
+
+    def ensure_loaded(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded_at is not None and now - self._loaded_at <= self._refresh_seconds:
+                return
+            if self._loaded_at is not None and self._can_catch_up(now):
+                try:
+                    self._catch_up()
+                    return
+                except ChangeGone:
+                    pass
+            token = self._latest_token() if self._latest_token is not None else None
+            self.load(self._loader(), token)
+
+    def _can_catch_up(self, now: float) -> bool:
+        return (self._token is not None and self._changes_since is not None
+                and now - self._reloaded_at <= self._reload_seconds)
+
+    def _catch_up(self):
+        """Apply the changes made since the index's token"""
+        upserts, deleted, token = self._changes_since(self._token)
+        for item in upserts:
+            self._put(item)
+        for event_id in deleted:
+            self._drop(event_id)
+        self._token = token
+        self._loaded_at = time.monotonic()
+
+    def load(self, items: List[Dict], token: Optional[int] = None):
+        """Replace the index contents with ``items``, as of change ``token`` if known"""
+        with self._lock:
+            self._reset(len(items) * 2)
+            for item in items:
+                self._put(item)
+            self._token = token
+            self._loaded_at = self._reloaded_at = time.monotonic()
+
+    def load_snapshot(self, snapshot: Snapshot):
+        """Adopt a snapshot's columns without decoding its items; the next query catches up"""
+        with self._lock:
+            self._reset(snapshot.count * 2)
+            count = snapshot.count
+            self._start[:count] = snapshot.start
+            self._end[:count] = snapshot.end
+            self._recurrence[:count] = snapshot.recurrence
+            self._has_email[:count] = snapshot.has_email
+            self._recurrence_codes = {value: code for code, value in enumerate(snapshot.recurrences)}
+            self._ids = snapshot.ids()
+            self._rows = {event_id: row for row, event_id in enumerate(self._ids)}
+            self._items = SnapshotItems(snapshot, self._rows)
+            self._size = count
+            self._recurring = int(np.count_nonzero(snapshot.recurrence))
+            self._with_email = int(np.count_nonzero(snapshot.has_email))
+            self._token = snapshot.token
+            # Stale but loaded: the first query applies the changes since the snapshot
+            self._loaded_at = float("-inf")
+            self._reloaded_at = time.monotonic()
+
+    def write_snapshot(self, path: str, identity: str = "") -> bool:
+        """Save the contents of store ``identity`` to ``path``; False when there is no token to resume from"""
+        self.ensure_loaded()
+        with self._lock:
+            if self._token is None:
+                return False
+            items = [self._items[event_id] for event_id in self._ids]
+            start, end = self._start[:self._size].copy(), self._end[:self._size].copy()
+            token = self._token
+        write_snapshot(path, items, start, end, token, identity)
+        return True
+
+    def upsert(self, item: Dict):
+        """Apply a created or updated event (no-op until the index is loaded)"""
+        with self._lock:
+            if self._loaded_at is not None and item.get('id'):
+                self._put(item)
+
+    def remove(self, event_id: str):
+        """Apply a deleted event (no-op until the index is loaded)"""
+        with self._lock:
+            if self._loaded_at is not None:
+                self._drop(event_id)
+
+    def _put(self, item: Dict):
+        try:
+            start = start_epoch_of(item)
+            end = item.get('end_epoch')
+            if end is None:
+                end = to_epoch(item.get('end_time'), 'end_time')
+        except ValueError:
+            start = None
+        if start is None or start == float('inf'):
+            # Unparseable timestamps cannot be classified; keep them out of the columns
+            self._drop(item.get('id'))
+            return
+
+        event_id = item['id']
+        row = self._rows.get(event_id)
+        previous = None
+        if row is None:
+            if self._size == len(self._start):
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._ids.append(event_id)
+            self._rows[event_id] = row
+        else:
+            previous = self._items[event_id]
+            self._count_out(row, previous)
+        self._start[row] = int(start)
+        self._end[row] = int(end)
+        self._recurrence[row] = self._recurrence_code(item.get('recurrence'))
+        self._has_email[row] = bool(item.get('email'))
+        self._items[event_id] = item
+        self._count_in(row, item)
+        if self._suggest is not None:
+            self._suggest.put(event_id, item.get('title'))
+        if self._terms is not None:
+            if previous is not None:
+                self._terms.add(previous, -1)
+            self._terms.add(item)
+        if self._owners is not None:
+            self._remove_owned(event_id, previous)
+            owner = _owner_key(item.get('email'))
+            if owner:
+                self._owners.setdefault(owner, set()).add(event_id)
+                tree = self._owner_trees.get(owner)
+                if tree is not None:
+                    for start, end in self._spans(event_id):
+                        tree.add(start, end, event_id)
+
+    def _drop(self, event_id: Optional[str]):
+        row = self._rows.get(event_id)
+        if row is None:
+            return
+        item = self._items.pop(event_id)
+        self._count_out(row, item)
+        del self._rows[event_id]
+        if self._suggest is not None:
+            self._suggest.drop(event_id)
+        if self._terms is not None:
+            self._terms.add(item, -1)
+        if self._owners is not None:
+            self._remove_owned(event_id, item)
+        # Swap the last row into the hole so the columns stay dense
+        last = self._size - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+            self._start[row] = self._start[last]
+            self._end[row] = self._end[last]
+            self._recurrence[row] = self._recurrence[last]
+            self._has_email[row] = self._has_email[last]
+        self._ids.pop()
+        self._size = last
+
+    def _count_in(self, row: int, item: Dict, sign: int = 1):
+        """Adjust the running counters for a row entering (or leaving) the index"""
+        self._recurring += sign * bool(item.get('recurrence'))
+        self._with_email += sign * bool(item.get('email'))
+        if self._time_counts is None:
+            return
+        start, end = int(self._start[row]), int(self._end[row])
+        status, transition = classify(start, end, self._stats_at)
+        self._time_counts[status] += sign
+        if self._day_start <= start < self._day_end:
+            self._time_counts["today"] += sign
+        if sign > 0 and transition is not None:
+            self._stats_valid_until = min(self._stats_valid_until, transition)
+
+    def _count_out(self, row: int, item: Dict):
+        self._count_in(row, item, sign=-1)
+
+    def _recurrence_code(self, recurrence: Optional[str]) -> int:
+        return self._recurrence_codes.setdefault(recurrence or "", len(self._recurrence_codes))
+
+    def _grow(self):
+        capacity = len(self._start) * 2
+        self._start = np.resize(self._start, capacity)
+        self._end = np.resize(self._end, capacity)
+        self._recurrence = np.resize(self._recurrence, capacity)
+        self._has_email = np.resize(self._has_email, capacity)
+
+    # ---- vectorized queries --------------------------------------------
+
+    def _columns(self):
+        return self._start[:self._size], self._end[:self._size]
+
+    def stats(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Aggregate counts: total, by status, recurring, with email and starting today"""
+        self.ensure_loaded()
+        now = int(time.time() if now is None else now)
+        with self._lock:
+            self._classify_at(now)
+            return {
+                "total": self._size,
+                **self._time_counts,
+                "recurring": self._recurring,
+                "with_email": self._with_email,
+            }
+
+    def status_counts(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Count upcoming, ongoing and past events at ``now``"""
+        stats = self.stats(now)
+        return {key: stats[key] for key in ("total", "upcoming", "ongoing", "past")}
+
+    def next_status_change(self, now: Optional[float] = None) -> int:
+        """Epoch after ``now`` at which some event starts or ends (or the day rolls over)"""
+        self.ensure_loaded()
+        now = int(time.time() if now is None else now)
+        with self._lock:
+            self._classify_at(now)
+            return self._stats_valid_until
+
+    def _classify_at(self, now: int):
+        if self._time_counts is None or not self._stats_at <= now < self._stats_valid_until:
+            self._reclassify(now)
+
+    def _reclassify(self, now: int):
+        """Recount the time-dependent stats at ``now`` in one vectorized pass"""
+        start, end = self._columns()
+        day = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        self._day_start = int(day.timestamp())
+        self._day_end = int((day + timedelta(days=1)).timestamp())
+
+        upcoming = start > now
+        ongoing = ~upcoming & (end >= now)
+        self._time_counts = {
+            "upcoming": int(np.count_nonzero(upcoming)),
+            "ongoing": int(np.count_nonzero(ongoing)),
+            "past": int(self._size - np.count_nonzero(upcoming) - np.count_nonzero(ongoing)),
+            "today": int(np.count_nonzero((start >= self._day_start) & (start < self._day_end))),
+        }
+        # The counts hold until the next event starts or ends, or the day rolls over
+        boundaries = [self._day_end]
+        if upcoming.any():
+            boundaries.append(int(start[upcoming].min()))
+        if ongoing.any():
+            boundaries.append(int(end[ongoing].min()) + 1)
+        self._stats_at = now
+        self._stats_valid_until = min(boundaries)
+
+    def status_mask(self, status: str, now: Optional[float] = None) -> np.ndarray:
+        """Boolean row mask for 'upcoming', 'ongoing' or 'past' (caller holds the lock)"""
+        now = int(time.time() if now is None else now)
+        start, end = self._columns()
+        if status == "upcoming":
+            return start > now
+        if status == "ongoing":
+            return (start <= now) & (end >= now)
+        if status == "past":
+            return end < now
+        raise ValueError(f"Unknown status: {status}")
+
+    def range_mask(self, start_epoch: Optional[int] = None, end_epoch: Optional[int] = None) -> np.ndarray:
+        """Boolean row mask of events starting within [start_epoch, end_epoch] (caller holds the lock)"""
+        start, _ = self._columns()
+        mask = np.ones(self._size, dtype=bool)
+        if start_epoch is not None:
+            mask &= start >= start_epoch
+        if end_epoch is not None:
+            mask &= start <= end_epoch
+        return mask
+
+    def events_in_range(self, start_epoch: Optional[int], end_epoch: Optional[int]) -> List[Dict]:
+        """Events starting within the range, ordered by start"""
+        self.ensure_loaded()
+        with self._lock:
+            return self._materialize(np.flatnonzero(self.range_mask(start_epoch, end_epoch)))
+
+    def query(self, query, now: Optional[float] = None) -> List[Dict]:
+        """Answer an EventQuery by combining column masks"""
+        self.ensure_loaded()
+        with self._lock:
+            mask = self.range_mask(query.start_epoch, query.end_epoch)
+            if query.status is not None:
+                mask &= self.status_mask(query.status, now)
+            if query.recurrence is not None:
+                code = self._recurrence_codes.get(query.recurrence)
+                if code is None:
+                    return []
+                mask &= self._recurrence[:self._size] == code
+            if query.has_email is not None:
+                mask &= self._has_email[:self._size] == query.has_email
+            rows = np.flatnonzero(mask)
+
+            if query.sort in ("start_time", "end_time"):
+                column = self._start if query.sort == "start_time" else self._end
+                rows = rows[np.argsort(column[rows], kind="stable")]
+                if query.descending:
+                    rows = rows[::-1]
+                return [self._items[self._ids[row]] for row in rows]
+            return query.sort_items([self._items[self._ids[row]] for row in rows])
+
+    def upcoming(self, limit: int = 10, now: Optional[float] = None) -> List[Dict]:
+        """The next ``limit`` events that have not started yet"""
+        self.ensure_loaded()
+        with self._lock:
+            rows = np.flatnonzero(self.status_mask("upcoming", now))
+            if len(rows) > limit:
+                # Partial selection: O(n) instead of sorting every future event
+                rows = rows[np.argpartition(self._start[rows], limit - 1)[:limit]]
+            return self._materialize(rows)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Titles and title words starting with ``prefix``, most used first"""
+        self.ensure_loaded()
+        with self._lock:
+            if self._suggest is None:
+                self._suggest = SuggestIndex(self._suggest_scan_limit)
+                self._suggest.build((event_id, self._field(event_id, 'title')) for event_id in self._ids)
+            return self._suggest.suggest(prefix, limit)
+
+    def term_stats(self, terms: List[str]) -> CorpusStats:
+        """Collection-wide BM25 statistics for ``terms``"""
+        self.ensure_loaded()
+        with self._lock:
+            if self._terms is None:
+                self._terms = TermStats()
+                for event_id in self._ids:
+                    self._terms.add({name: self._field(event_id, name) for name in RANKED_FIELDS})
+            return self._terms.for_terms(terms)
+
+    # ---- per-owner intervals ----------------------------------------------
+
+    def _remove_owned(self, event_id: str, item: Optional[Dict]):
+        owner = _owner_key(item.get('email')) if item is not None else None
+        if not owner or owner not in self._owners:
+            return
+        ids = self._owners[owner]
+        ids.discard(event_id)
+        if not ids:
+            del self._owners[owner]
+        tree = self._owner_trees.get(owner)
+        if tree is not None:
+            tree.remove(event_id)
+
+    def _spans(self, event_id: str):
+        """Half-open spans of an indexed event: whole if one-off, else occurrences in the window"""
+        start, end, recurrence = self._schedule(event_id)
+        if recurrence in RECURRING_INTERVALS:
+            return list(occurrences(start, end, recurrence, *self._window))
+        return [span(start, end)]
+
+    def _schedule(self, event_id: str) -> Tuple[int, int, str]:
+        """Start and end epochs and recurrence of an indexed event, from the columns"""
+        row = self._rows[event_id]
+        return int(self._start[row]), int(self._end[row]), self._recurrence_names()[int(self._recurrence[row])]
+
+    def _recurrence_names(self) -> List[str]:
+        names = [""] * len(self._recurrence_codes)
+        for name, code in self._recurrence_codes.items():
+            names[code] = name
+        return names
+
+    def _owner_map(self) -> Dict[str, set]:
+        """Event ids by owner, built from every row on first use (caller holds the lock)"""
+        if self._owners is None:
+            self._owners = {}
+            for event_id in self._ids:
+                owner = _owner_key(self._field(event_id, 'email'))
+                if owner:
+                    self._owners.setdefault(owner, set()).add(event_id)
+        return self._owners
+
+    def _owner_tree(self, owner: str, now: int) -> IntervalTree:
+        """The owner's interval tree (caller holds the lock)"""
+        owners = self._owner_map()
+        day = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+        window = (int(day.timestamp()), int(day.timestamp()) + self._horizon_seconds)
+        if window != self._window:
+            self._window = window
+            self._owner_trees = {}
+        tree = self._owner_trees.get(owner)
+        if tree is None:
+            tree = self._owner_trees[owner] = IntervalTree([
+                (start, end, event_id)
+                for event_id in owners.get(owner, ())
+                for start, end in self._spans(event_id)])
+        return tree
+
+    def find_conflicts(self, email: Optional[str], start: int, end: int, recurrence: Optional[str] = None,
+                       exclude_id: Optional[str] = None, now: Optional[float] = None) -> List[Dict]:
+        """Events of ``email`` overlapping a proposed event, with the first overlap of each.
+
+        A recurring proposal is checked occurrence by occurrence within the horizon.
+        """
+        owner = _owner_key(email)
+        if not owner:
+            return []
+        self.ensure_loaded()
+        now = int(time.time() if now is None else now)
+        with self._lock:
+            tree = self._owner_tree(owner, now)
+            if recurrence in RECURRING_INTERVALS:
+                proposed = occurrences(start, end, recurrence, *self._window)
+            else:
+                proposed = [span(start, end)]
+            first = {}
+            for proposed_start, proposed_end in proposed:
+                for other_start, other_end, event_id in tree.overlapping(proposed_start, proposed_end):
+                    if event_id != exclude_id and event_id not in first:
+                        first[event_id] = (max(proposed_start, other_start), min(proposed_end, other_end))
+            return [{"id": event_id, "title": self._field(event_id, 'title'), "start": low, "end": high}
+                    for event_id, (low, high) in sorted(first.items(), key=lambda entry: entry[1])]
+
+    def busy(self, email: str, start: int, end: int) -> List[Tuple[int, int]]:
+        """Merged busy spans of ``email`` within [start, end).
+
+        Only that owner's events are expanded (recurring ones over exactly
+        this range), clipped to it and merged in one sort-and-sweep.
+        """
+        owner = _owner_key(email)
+        self.ensure_loaded()
+        with self._lock:
+            spans = []
+            for event_id in self._owner_map().get(owner, ()):
+                event_start, event_end, recurrence = self._schedule(event_id)
+                for low, high in occurrences(event_start, event_end, recurrence, start, end):
+                    spans.append((max(low, start), min(high, end)))
+        return merge_intervals(spans)
+
+    def conflicts(self, email: Optional[str] = None, now: Optional[float] = None) -> List[Dict]:
+        """Pairs of an owner's events that overlap now or within the horizon.
+
+        Each pair is reported once, with its first overlap and how many
+        occurrences overlap in total. Without ``email`` every owner is checked.
+        """
+        self.ensure_loaded()
+        now = int(time.time() if now is None else now)
+        with self._lock:
+            owners = [_owner_key(email)] if email else sorted(self._owner_map())
+            clashes = []
+            for owner in owners:
+                tree = self._owner_tree(owner, now)
+                window_end = self._window[1]
+                upcoming = [interval for interval in tree if interval[1] > now and interval[0] < window_end]
+                pairs = {}
+                for first, second in overlapping_pairs(upcoming):
+                    key = tuple(sorted((first[2], second[2])))
+                    overlap = (max(first[0], second[0]), min(first[1], second[1]))
+                    if key in pairs:
+                        pairs[key]["occurrences"] += 1
+                    else:
+                        pairs[key] = {"email": owner, "ids": list(key), "start": overlap[0], "end": overlap[1],
+                                      "occurrences": 1}
+                clashes += sorted(pairs.values(), key=lambda clash: (clash["start"], clash["ids"]))
+            return clashes
+
+    def _field(self, event_id: str, name: str):
+        if isinstance(self._items, SnapshotItems):
+            return self._items.field(event_id, name)
+        return self._items[event_id].get(name)
+
+    def _materialize(self, rows: np.ndarray) -> List[Dict]:
+        rows = rows[np.argsort(self._start[rows], kind="stable")]
+        return [self._items[self._ids[row]] for row in rows]
@@ -0,0 +1,187 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import Attr
+
+from app.models.event_model import to_epoch
+from app.services.event_store import end_epoch_of, start_epoch_of
+
+STATUSES = ("upcoming", "ongoing", "past")
+RECURRENCES = ("daily", "weekly", "monthly")
+SORT_FIELDS = ("start_time", "end_time", "title", "created_at", "updated_at")
+FIELDS = ("id", "title", "description", "start_time", "end_time", "recurrence", "email",
+          "start_epoch", "end_epoch", "created_at", "updated_at")
+
+# Query plans
+PLAN_INDEX = "index"
+PLAN_SCAN = "scan"
+PLAN_LIST = "list"
+
+
+def parse_bool(value: str, name: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in ("true", "1", "yes"):
+        return True
+    if lowered in ("false", "0", "no"):
+        return False
+    raise ValueError(f"`{name}` must be true or false")
+
+
+def parse_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Fields requested as ``fields=title,start_time`` (id is always included), or None for all"""
+    if value is None:
+        return None
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    if not fields or any(field not in FIELDS for field in fields):
+        raise ValueError(f"`fields` must be a comma-separated list of {', '.join(FIELDS)}")
+    return tuple(dict.fromkeys(["id", *fields]))
+
+
+class EventQuery:
+    """Filters and ordering requested on the list endpoint"""
+
+    __slots__ = ("status", "recurrence", "has_email", "start_epoch", "end_epoch", "sort", "descending", "fields")
+
+    def __init__(self, status=None, recurrence=None, has_email=None, start_epoch=None, end_epoch=None,
+                 sort="start_time", descending=False, fields=None):
+        self.status = status
+        self.recurrence = recurrence  # None = no filter, "" = only non-recurring
+        self.has_email = has_email
+        self.start_epoch = start_epoch
+        self.end_epoch = end_epoch
+        self.sort = sort
+        self.descending = descending
+        self.fields = fields  # None = every attribute
+
+    @classmethod
+    def from_args(cls, args) -> "EventQuery":
+        """Build a query from request args, raising ValueError on bad input"""
+        status = args.get("status")
+        if status is not None:
+            status = status.strip().lower()
+            if status not in STATUSES:
+                raise ValueError(f"`status` must be one of {', '.join(STATUSES)}")
+
+        recurrence = args.get("recurrence")
+        if recurrence is not None:
+            recurrence = recurrence.strip().lower()
+            if recurrence == "none":
+                recurrence = ""
+            elif recurrence not in RECURRENCES:
+                raise ValueError(f"`recurrence` must be one of none, {', '.join(RECURRENCES)}")
+
+        has_email = args.get("has_email")
+        if has_email is not None:
+            has_email = parse_bool(has_email, "has_email")
+
+        start = args.get("from")
+        end = args.get("to")
+
+        sort = args.get("sort", "start_time")
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"`sort` must be one of {', '.join(SORT_FIELDS)}")
+        order = args.get("order", "asc").lower()
+        if order not in ("asc", "desc"):
+            raise ValueError("`order` must be asc or desc")
+
+        return cls(
+            status=status,
+            recurrence=recurrence,
+            has_email=has_email,
+            start_epoch=to_epoch(start, "from") if start else None,
+            end_epoch=to_epoch(end, "to") if end else None,
+            sort=sort,
+            descending=order == "desc",
+            fields=parse_fields(args.get("fields")),
+        )
+
+    @property
+    def has_filters(self) -> bool:
+        return any(value is not None for value in (
+            self.status, self.recurrence, self.has_email, self.start_epoch, self.end_epoch))
+
+    def fetch_fields(self) -> Optional[Tuple[str, ...]]:
+        """Attributes to read from storage: the projection plus what sorting needs"""
+        if self.fields is None:
+            return None
+        sort_keys = ("end_epoch", "end_time") if self.sort == "end_time" else (self.sort,)
+        return tuple(dict.fromkeys((*self.fields, "start_epoch", "start_time", *sort_keys)))
+
+    def plan(self, index) -> str:
+        """Pick the cheapest way to answer this query.
+
+        - list:  no filters, so a plain (already start-sorted) listing
+        - index: the in-memory columnar index is warm and can answer every filter
+        - scan:  fall back to a DynamoDB scan with the filters pushed down
+        """
+        if not self.has_filters:
+            return PLAN_LIST
+        if index.is_fresh():
+            return PLAN_INDEX
+        return PLAN_SCAN
+
+    def filter_expression(self, now: Optional[float] = None):
+        """DynamoDB condition equivalent to this query's filters"""
+        now = int(time.time() if now is None else now)
+        conditions = []
+        if self.status == "upcoming":
+            conditions.append(Attr("start_epoch").gt(now))
+        elif self.status == "ongoing":
+            conditions.append(Attr("start_epoch").lte(now) & Attr("end_epoch").gte(now))
+        elif self.status == "past":
+            conditions.append(Attr("end_epoch").lt(now))
+        if self.start_epoch is not None:
+            conditions.append(Attr("start_epoch").gte(self.start_epoch))
+        if self.end_epoch is not None:
+            conditions.append(Attr("start_epoch").lte(self.end_epoch))
+        if self.recurrence == "":
+            conditions.append(Attr("recurrence").not_exists() | Attr("recurrence").attribute_type("NULL")
+                              | Attr("recurrence").eq(""))
+        elif self.recurrence is not None:
+            conditions.append(Attr("recurrence").eq(self.recurrence))
+        if self.has_email is True:
+            conditions.append(Attr("email").gt(""))
+        elif self.has_email is False:
+            conditions.append(Attr("email").not_exists() | Attr("email").attribute_type("NULL")
+                              | Attr("email").eq(""))
+
+        condition = conditions[0]
+        for extra in conditions[1:]:
+            condition = condition & extra
+        return condition
+
+    def matches(self, item: Dict, now: Optional[float] = None) -> bool:
+        """Python equivalent of filter_expression(), for stores that filter in process"""
+        now = int(time.time() if now is None else now)
+        start, end = item.get("start_epoch"), item.get("end_epoch")
+        if self.status is not None or self.start_epoch is not None or self.end_epoch is not None:
+            if start is None or end is None:
+                return False
+        if self.status == "upcoming" and not start > now:
+            return False
+        if self.status == "ongoing" and not start <= now <= end:
+            return False
+        if self.status == "past" and not end < now:
+            return False
+        if self.start_epoch is not None and start < self.start_epoch:
+            return False
+        if self.end_epoch is not None and start > self.end_epoch:
+            return False
+        if self.recurrence is not None and (item.get("recurrence") or "") != self.recurrence:
+            return False
+        if self.has_email is not None and bool(item.get("email")) != self.has_email:
+            return False
+        return True
+
+    def sort_items(self, items: List[Dict]) -> List[Dict]:
+        """Order items in place by the requested field"""
+        if self.sort == "start_time":
+            key = start_epoch_of
+        elif self.sort == "end_time":
+            key = end_epoch_of
+        elif self.sort == "title":
+            key = lambda item: (item.get("title") or "").lower()
+        else:
+            key = lambda item: item.get(self.sort) or ""
+        items.sort(key=key, reverse=self.descending)
+        return items
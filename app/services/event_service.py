@@ -1,23 +1,204 @@
-from app.models.event_model import Event
-from app.services.dynamodb_service import DynamoDBService
+import threading
+import time
+
+from app.config import (
+    BATCH_GET_MAX_IDS,
+    BULK_MAX_OPERATIONS,
+    CHANGE_LOG_RETENTION_SECONDS,
+    CHANGES_MAX_LIMIT,
+    CONFLICT_HORIZON_DAYS,
+    FREEBUSY_MAX_DAYS,
+    INDEX_REFRESH_SECONDS,
+    INDEX_RELOAD_SECONDS,
+    SEARCH_CACHE_SIZE,
+    SNAPSHOT_PATH,
+    SSE_BUFFER_SIZE,
+    SSE_HEARTBEAT_SECONDS,
+    SSE_MAX_SUBSCRIBERS,
+    SSE_POLL_SECONDS,
+    STORAGE_BACKEND,
+    SUGGEST_SCAN_LIMIT,
+)
+from app.models.event_model import Event, to_epoch
+from app.services.change_log import OP_CREATE, OP_DELETE, ChangeGone
+from app.services.event_index import EventIndex
+from app.services.event_query import PLAN_INDEX, PLAN_SCAN
+from app.services.event_store import EventNotFound, create_event_store, project
+from app.services.intervals import ScheduleConflict
+from app.services.ranking import RANKED_FIELDS, tokenize, top_k
+from app.services.snapshot import open_snapshot
+from app.utils.broadcaster import RESYNC, Broadcaster
+from app.utils.cache import GenerationLRU
+from app.utils.metrics import register_metrics
 from datetime import datetime
 
-# Initialize DynamoDB service
-db_service = DynamoDBService()
+# Initialize the storage backend selected by STORAGE_BACKEND
+db_service = create_event_store(STORAGE_BACKEND)
 
 # Initialize table on startup
 try:
     db_service.create_table_if_not_exists()
 except Exception as e:
-    print(f"⚠️ Warning: Could not initialize DynamoDB table: {e}")
+    print(f"⚠️ Warning: Could not initialize {STORAGE_BACKEND} storage: {e}")
+
+# Change token to tag a full index load with; None disables change-log catch-up
+def _latest_token():
+    try:
+        return db_service.change_log.latest()
+    except Exception as e:
+        print(f"⚠️ Warning: Could not read change token: {e}")
+        return None
+
+# Bodies and deleted ids changed since a token, for the index to catch up on
+def _index_changes_since(token):
+    upserts, deleted = [], []
+    while True:
+        page = get_changes(token, CHANGES_MAX_LIMIT)
+        upserts += page["created"] + page["updated"]
+        deleted += page["deleted"]
+        next_token = int(page["next"])
+        if not page["has_more"] or next_token == token:
+            return upserts, deleted, next_token
+        token = next_token
+
+# Columnar cache for status / range / upcoming queries, kept in sync with writes below
+event_index = EventIndex(lambda: db_service.get_all_events(), refresh_seconds=INDEX_REFRESH_SECONDS,
+                         latest_token=_latest_token, changes_since=_index_changes_since,
+                         reload_seconds=INDEX_RELOAD_SECONDS, suggest_scan_limit=SUGGEST_SCAN_LIMIT,
+                         horizon_seconds=CONFLICT_HORIZON_DAYS * 86400)
+
+# Why a snapshot cannot be adopted by this store, or None if it can: it must
+# come from the same storage and not be ahead of its change log
+def _snapshot_mismatch(snapshot):
+    if db_service.identity is None or snapshot.identity != db_service.identity:
+        return f"it was taken from {snapshot.identity or 'an unknown store'}, not {db_service.identity}"
+    latest = _latest_token()
+    if latest is None or snapshot.token > latest:
+        return f"its change token {snapshot.token} is ahead of the store's ({latest})"
+    return None
+
+# Warm start: adopt the last snapshot and catch up from its token instead of a full scan
+_snapshot = open_snapshot(SNAPSHOT_PATH)
+if _snapshot is not None:
+    _mismatch = _snapshot_mismatch(_snapshot)
+    if _mismatch is None:
+        event_index.load_snapshot(_snapshot)
+        print(f"✅ Loaded {_snapshot.count} events from snapshot {SNAPSHOT_PATH}")
+    else:
+        print(f"⚠️ Ignoring snapshot {SNAPSHOT_PATH}: {_mismatch}")
+
+# Live create / update / delete notifications for GET /api/events/stream, fed
+# from the shared change log by publish_changes so every worker sees every write
+event_broadcaster = Broadcaster(buffer_size=SSE_BUFFER_SIZE, max_subscribers=SSE_MAX_SUBSCRIBERS)
+register_metrics("sse", event_broadcaster.metrics)
+
+# Search query -> matching ids, valid while the shared change token is unchanged
+search_cache = GenerationLRU(SEARCH_CACHE_SIZE)
+register_metrics("search_cache", search_cache.metrics)
+
+# Keep derived state in sync after a successful write
+def _after_upsert(item):
+    event_index.upsert(item)
+
+def _after_delete(event_id):
+    event_index.remove(event_id)
+
+# Parsed Event objects by id, reused while the stored item is unchanged
+_event_cache = {}
+
+# Version of a list result for its validator: the change token the body
+# reflects, so a write made by any worker changes it, and for status filters
+# also the next time an event starts or ends, which moves rows between
+# statuses without a write. Storage-backed lists use the shared token; lists
+# answered by this worker's index use the index's own token, which may trail
+# it until the next refresh. None when the token cannot be read.
+def list_version(query=None):
+    if query is not None and query.plan(event_index) == PLAN_INDEX:
+        token = event_index.token
+    else:
+        token = _latest_token()
+    if token is None or query is None or query.status is None:
+        return token
+    return f"{token}.{event_index.next_status_change()}"
+
+# Mark a reminder as sent in storage: True only for the one caller that should send it
+def claim_reminder(event_id, occurrence_epoch):
+    return db_service.claim_reminder(event_id, occurrence_epoch)
 
 # Get all events sorted by start_time
 def get_all_events():
     events = db_service.get_all_events()
     return events
 
+# List events matching an EventQuery, using the cheapest plan available
+def list_events(query):
+    plan = query.plan(event_index)
+    if plan == PLAN_INDEX:
+        return project(event_index.query(query), query.fields)
+    if plan == PLAN_SCAN:
+        events = db_service.query_events(query, query.fetch_fields())
+    else:
+        events = db_service.get_all_events(query.fetch_fields())
+    return project(query.sort_items(events), query.fields)
+
+# Yield pages of events as they are scanned (storage order, no sorting)
+def iter_event_pages(query=None):
+    if query is None:
+        return db_service.iter_query_pages()
+    return db_service.iter_query_pages(query, query.fields)
+
+# Get all events as Event objects, parsing each stored item only once
+def get_all_event_objects():
+    global _event_cache
+    cache = {}
+    for item in db_service.get_all_events():
+        event_id = item.get("id")
+        cached = _event_cache.get(event_id)
+        if cached is not None and item.get("updated_at") is not None \
+                and cached.updated_at == item.get("updated_at"):
+            cache[event_id] = cached
+            continue
+        try:
+            cache[event_id] = Event.from_dict(item)
+        except (KeyError, ValueError) as e:
+            print(f"⚠️ Skipping invalid event {event_id}: {e}")
+    _event_cache = cache
+    return list(cache.values())
+
+# Overlap spans come back from the index as epochs; report them like event times
+def _with_iso_times(entries):
+    return [dict(entry, start=datetime.fromtimestamp(entry["start"]).isoformat(),
+                 end=datetime.fromtimestamp(entry["end"]).isoformat()) for entry in entries]
+
+# Raise ScheduleConflict if the event overlaps another event with the same email
+def _check_conflicts(event):
+    conflicts = event_index.find_conflicts(event.email, event.start_epoch, event.end_epoch, event.recurrence,
+                                           exclude_id=event.id)
+    if conflicts:
+        raise ScheduleConflict(_with_iso_times(conflicts))
+
+# Existing overlaps between events sharing an email, optionally for one email only
+def get_conflicts(email=None):
+    return _with_iso_times(event_index.conflicts(email))
+
+# Merged busy intervals of one email between two ISO timestamps, for scheduling
+def get_free_busy(email, start, end):
+    if not email or not email.strip():
+        raise ValueError("`email` is required")
+    if not start or not end:
+        raise ValueError("`from` and `to` are required")
+    start_epoch, end_epoch = to_epoch(start, "from"), to_epoch(end, "to")
+    if end_epoch <= start_epoch:
+        raise ValueError("`to` must be after `from`")
+    if end_epoch - start_epoch > FREEBUSY_MAX_DAYS * 86400:
+        raise ValueError(f"The range may cover at most {FREEBUSY_MAX_DAYS} days")
+    busy = event_index.busy(email, start_epoch, end_epoch)
+    return {"email": email.strip(), "from": datetime.fromtimestamp(start_epoch).isoformat(),
+            "to": datetime.fromtimestamp(end_epoch).isoformat(),
+            "busy": _with_iso_times({"start": low, "end": high} for low, high in busy)}
+
 # Create a new event
-def create_event(data):
+def create_event(data, check_conflicts=False):
     required_fields = ["title", "description", "start_time", "end_time"]
     for field in required_fields:
         if field not in data:
@@ -35,24 +216,32 @@ def create_event(data):
         recurrence=recurrence,
         email=email
     )
+    if check_conflicts:
+        _check_conflicts(new_event)
 
-    # Save to DynamoDB
+    # Save to storage
     event_dict = new_event.to_dict()
     saved_event = db_service.create_event(event_dict)
+    _after_upsert(saved_event)
     return saved_event
 
 # Update an existing event
-def update_event(event_id, data, partial=False):
+def update_event(event_id, data, partial=False, check_conflicts=False):
     if partial:
         # For partial updates, get existing event and merge
         existing_event = db_service.get_event_by_id(event_id)
         if not existing_event:
-            raise ValueError("Event not found")
+            raise EventNotFound("Event not found")
         
         # Update only provided fields
         for key, value in data.items():
             if value is not None:
                 existing_event[key] = value
+        event = Event.from_dict(existing_event)  # validate the merged timestamps
+        existing_event["start_epoch"] = event.start_epoch
+        existing_event["end_epoch"] = event.end_epoch
+        if check_conflicts:
+            _check_conflicts(event)
         
         updated_event = db_service.update_event(event_id, existing_event)
     else:
@@ -61,18 +250,294 @@ def update_event(event_id, data, partial=False):
         for field in required_fields:
             if field not in data:
                 raise ValueError(f"{field} is required")
+        event = Event.from_dict(dict(data, id=event_id))  # validate timestamps
+        data = dict(data, start_epoch=event.start_epoch, end_epoch=event.end_epoch)
+        if check_conflicts:
+            _check_conflicts(event)
         
         updated_event = db_service.update_event(event_id, data)
     
+    _after_upsert(updated_event)
     return updated_event
 
 # Delete an event
 def delete_event(event_id):
-    return db_service.delete_event(event_id)
+    deleted = db_service.delete_event(event_id)
+    _after_delete(event_id)
+    return deleted
+
+BULK_OPERATIONS = ("create", "update", "delete")
+REQUIRED_FIELDS = ["title", "description", "start_time", "end_time"]
+
+# Validate one bulk entry, returning (event_id, item to put or None for a delete).
+# For an update the item holds only the new fields; it is merged into the stored event later.
+def _prepare_bulk_entry(op, entry, now):
+    if op == "delete":
+        event_id = entry.get("id") if isinstance(entry, dict) else entry
+        if not isinstance(event_id, str) or not event_id:
+            raise ValueError("delete entries must be an id or an object with `id`")
+        return event_id, None
+
+    if not isinstance(entry, dict):
+        raise ValueError(f"{op} entries must be objects")
+    for field in REQUIRED_FIELDS:
+        if field not in entry:
+            raise ValueError(f"{field} is required")
+    if op == "update":
+        if not entry.get("id"):
+            raise ValueError("id is required")
+        event = Event.from_dict(entry)  # validate timestamps
+        return event.id, dict(entry, start_epoch=event.start_epoch, end_epoch=event.end_epoch, updated_at=now)
+    event = Event.from_dict(dict(entry, id=None, created_at=now))
+    item = event.to_dict()
+    item["updated_at"] = now
+    return event.id, item
+
+# Apply arrays of creates, full updates and deletes with batched writes.
+# Every entry is validated before anything is written; invalid entries are
+# reported and skipped. As with PUT and DELETE, updates and deletes of ids
+# that do not exist are 404s, and updates are merged into the stored event
+# (keeping created_at and any field not given). Returns one result per
+# entry, in request order.
+def bulk_write(operations):
+    if not isinstance(operations, dict):
+        raise ValueError("Body must be an object with create, update and/or delete arrays")
+    batches = []
+    for op in BULK_OPERATIONS:
+        entries = operations.get(op) or []
+        if not isinstance(entries, list):
+            raise ValueError(f"`{op}` must be an array")
+        batches.append((op, entries))
+    total = sum(len(entries) for _, entries in batches)
+    if total == 0:
+        raise ValueError("No operations given")
+    if total > BULK_MAX_OPERATIONS:
+        raise ValueError(f"At most {BULK_MAX_OPERATIONS} operations per request")
+
+    now = datetime.now().isoformat()
+    results = []
+    puts = {}
+    deletes = []
+    seen = set()
+    for op, entries in batches:
+        for position, entry in enumerate(entries):
+            result = {"op": op, "index": position}
+            results.append(result)
+            try:
+                event_id, item = _prepare_bulk_entry(op, entry, now)
+                if event_id in seen:
+                    raise ValueError("Duplicate id in bulk request")
+            except (KeyError, ValueError) as e:
+                result.update(status=400, error=str(e))
+                continue
+            result["id"] = event_id
+            seen.add(event_id)
+            if item is None:
+                deletes.append(event_id)
+            else:
+                puts[event_id] = item
+
+    updated_ids = [result["id"] for result in results if result["op"] == "update" and "id" in result]
+    existing = db_service.batch_get(updated_ids + deletes) if updated_ids or deletes else {}
+    for result in results:
+        event_id = result.get("id")
+        if event_id is None or result["op"] == "create":
+            continue
+        if event_id not in existing:
+            result.update(status=404, error="Event not found")
+            puts.pop(event_id, None)
+        elif result["op"] == "update":
+            puts[event_id] = dict(existing[event_id], **puts[event_id])
+    deletes = [event_id for event_id in deletes if event_id in existing]
+
+    failures = db_service.batch_write(list(puts.values()), deletes)
+    for result in results:
+        event_id = result.get("id")
+        if event_id is None or "status" in result:
+            continue
+        if event_id in failures:
+            result.update(status=500, error=failures[event_id])
+        elif event_id in puts:
+            result["status"] = 201 if result["op"] == "create" else 200
+            _after_upsert(puts[event_id])
+        else:
+            result["status"] = 200
+            _after_delete(event_id)
+    return results
 
 # Get a single event by ID
-def get_event_by_id(event_id):
-    return db_service.get_event_by_id(event_id)
+def get_event_by_id(event_id, fields=None):
+    return db_service.get_event_by_id(event_id, fields)
+
+# Get many events by id in request order, None where an id does not exist
+def get_events_by_ids(event_ids, fields=None):
+    if not isinstance(event_ids, list) or not all(isinstance(i, str) and i for i in event_ids):
+        raise ValueError("`ids` must be an array of event ids")
+    if not event_ids:
+        raise ValueError("`ids` must not be empty")
+    if len(event_ids) > BATCH_GET_MAX_IDS:
+        raise ValueError(f"At most {BATCH_GET_MAX_IDS} ids per request")
+    found = db_service.batch_get(event_ids, fields)
+    return [found.get(event_id) for event_id in event_ids]
+
+# Changes since a change token: created / updated bodies and deleted ids.
+# Without a token only the current token is returned, to start a sync from.
+def get_changes(token=None, limit=500):
+    if token is None:
+        return {"created": [], "updated": [], "deleted": [], "next": str(db_service.change_log.latest()),
+                "has_more": False}
+    try:
+        token = int(token)
+    except ValueError:
+        raise ValueError("`since` must be a change token")
+    if token < 0:
+        raise ValueError("`since` must be a change token")
+
+    records, next_token, has_more = db_service.change_log.since(token, limit)
+    if not records and token > db_service.change_log.latest():
+        # Never issued by this store (e.g. it was replaced): waiting would miss writes up to it
+        raise ChangeGone(f"Token {token} is ahead of the change log")
+    # Collapse to one entry per id: the last op wins, "created" if the window includes its create
+    ops = {}
+    for record in records:
+        created, _ = ops.get(record["id"], (False, None))
+        ops[record["id"]] = (created or record["op"] == OP_CREATE, record["op"])
+    live_ids = [event_id for event_id, (_, op) in ops.items() if op != OP_DELETE]
+    bodies = db_service.batch_get(live_ids) if live_ids else {}
+
+    created, updated, deleted = [], [], []
+    for event_id, (was_created, op) in ops.items():
+        body = bodies.get(event_id)
+        if body is None:
+            deleted.append(event_id)  # tombstone, or deleted after this window
+        elif was_created:
+            created.append(body)
+        else:
+            updated.append(body)
+    return {"created": created, "updated": updated, "deleted": deleted, "next": str(next_token),
+            "has_more": has_more}
+
+# Publish the changes recorded after `token` to this worker's stream subscribers,
+# returning the token to resume from. Bodies are read back, so a write made by
+# any worker process reaches every stream.
+def publish_changes(token):
+    try:
+        while True:
+            page = get_changes(token, CHANGES_MAX_LIMIT)
+            for kind in ("created", "updated"):
+                for item in page[kind]:
+                    event_broadcaster.publish(kind, {"id": item.get("id"), "event": item})
+            for event_id in page["deleted"]:
+                event_broadcaster.publish("deleted", {"id": event_id})
+            next_token = int(page["next"])
+            if not page["has_more"] or next_token == token:
+                return next_token
+            token = next_token
+    except ChangeGone:
+        # The tailer fell behind compaction: subscribers must refetch
+        event_broadcaster.publish(RESYNC, {})
+        return db_service.change_log.latest()
+
+# Poll the change log every `interval` seconds and publish what is new, until
+# the last subscriber has left: the next subscription starts a new tailer
+def _tail_changes(token, interval):
+    global _tailer_started
+    while True:
+        time.sleep(interval)
+        with _tailer_lock:
+            if event_broadcaster.subscriber_count == 0:
+                _tailer_started = False
+                return
+        try:
+            token = _latest_token() if token is None else publish_changes(token)
+        except Exception as e:
+            print("⚠️ Change tailer error:", e)
+
+_tailer_lock = threading.Lock()
+_tailer_started = False
+
+# Start this process's change-log tailer unless it is running. Called after
+# each stream subscription, so it always runs in the worker (after fork) and
+# polls storage only while some client is listening.
+def start_change_tailer(interval=SSE_POLL_SECONDS):
+    global _tailer_started
+    with _tailer_lock:
+        if _tailer_started:
+            return
+        _tailer_started = True
+    tailer_thread = threading.Thread(target=_tail_changes, args=(_latest_token(), interval), daemon=True)
+    tailer_thread.start()
+
+# Subscribe to live notifications: returns the (kind, data) message iterator,
+# with None for heartbeats, and a callable that ends the subscription
+def open_event_stream(resync=False):
+    subscription = event_broadcaster.subscribe()
+    start_change_tailer()
+    if resync:
+        # No history is kept, so a reconnecting client is told to refetch
+        subscription.push((RESYNC, {}))
+    messages = event_broadcaster.listen(subscription, SSE_HEARTBEAT_SECONDS)
+    return messages, lambda: event_broadcaster.unsubscribe(subscription)
+
+# Drop superseded and expired change log records
+def compact_changes(retain_seconds=CHANGE_LOG_RETENTION_SECONDS):
+    return db_service.change_log.compact(retain_seconds)
+
+# Save the event index for the next process start to warm up from
+def save_snapshot(path=SNAPSHOT_PATH):
+    return event_index.write_snapshot(path, db_service.identity or "")
+
+def search_event(query, fields=None):
+    # Matching is case-insensitive, so queries differing only in case share an entry
+    key = query.lower()
+    # Any worker's write moves the token, so a hit is never stale; no token, no caching
+    token = _latest_token()
+    ids = None if token is None else search_cache.get(key, token)
+    if ids is not None:
+        found = db_service.batch_get(ids, fields) if ids else {}
+        if len(found) == len(ids):
+            return [found[event_id] for event_id in ids]
+        # Deleted after the token was read: search again
+    results = db_service.search_events(query, fields)
+    if token is not None:
+        search_cache.put(key, token, [item["id"] for item in results])
+    return results
+
+# Search ranked by BM25 over title and description: the best `limit` matches,
+# each with its score. Matches are scored page by page as the store yields
+# them and only a heap of `limit` is kept, then just the winners are fetched.
+def search_ranked(query, limit=10, fields=None):
+    terms = list(dict.fromkeys(tokenize(query)))
+    stats = event_index.term_stats(terms)
+    best = top_k(db_service.iter_search_pages(query, ("id",) + RANKED_FIELDS), terms, stats, limit)
+    found = db_service.batch_get([event_id for _, event_id in best], fields) if best else {}
+    return [dict(found[event_id], score=round(score, 4)) for score, event_id in best if event_id in found]
+
+# Autocomplete: titles and title words starting with a prefix, most used first
+def suggest_titles(prefix, limit=10):
+    prefix = (prefix or "").strip()
+    if not prefix:
+        raise ValueError("`prefix` is required")
+    return event_index.suggest(prefix, limit)
+
+# Yield pages of search matches as they are scanned
+def iter_search_pages(query, fields=None):
+    return db_service.iter_search_pages(query, fields)
+
+# Aggregate dashboard counts, maintained incrementally by the index
+def get_event_stats():
+    return event_index.stats()
+
+# Count upcoming / ongoing / past events
+def get_status_counts():
+    return event_index.status_counts()
+
+# Next N events that have not started yet
+def get_upcoming_events(limit=10, fields=None):
+    return project(event_index.upcoming(limit), fields)
 
-def search_event(query):
-    return db_service.search_events(query)
\ No newline at end of file
+# Events starting between two ISO timestamps (either bound optional)
+def get_events_in_range(start=None, end=None, fields=None):
+    start_epoch = to_epoch(start, "from") if start else None
+    end_epoch = to_epoch(end, "to") if end else None
+    return project(event_index.events_in_range(start_epoch, end_epoch), fields)
@@ -0,0 +1,299 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from app.models.event_model import to_epoch
+from app.services.change_log import OP_CREATE, OP_DELETE, OP_UPDATE
+from app.utils.file_io import atomic_write_json, locked
+from app.utils.json_provider import json_default
+
+
+class EventNotFound(ValueError):
+    """The event to update or delete does not exist"""
+
+
+def start_epoch_of(event: Dict) -> float:
+    """Numeric sort key for an item, parsing start_time only if not backfilled"""
+    epoch = event.get('start_epoch')
+    if epoch is not None:
+        return epoch
+    try:
+        return to_epoch(event.get('start_time'))
+    except ValueError:
+        return float('inf')
+
+
+def end_epoch_of(event: Dict) -> float:
+    """Numeric end-time sort key for an item, parsing end_time only if not backfilled"""
+    epoch = event.get('end_epoch')
+    if epoch is not None:
+        return epoch
+    try:
+        return to_epoch(event.get('end_time'))
+    except ValueError:
+        return float('inf')
+
+
+def matches_text(event: Dict, query_lower: str) -> bool:
+    """Case-insensitive substring match on title or description"""
+    title = (event.get('title') or '').lower()
+    description = (event.get('description') or '').lower()
+    return query_lower in title or query_lower in description
+
+
+def project(items: List[Dict], fields: Optional[Sequence[str]]) -> List[Dict]:
+    """Copies of ``items`` restricted to ``fields`` (the items themselves when None)"""
+    if fields is None:
+        return items
+    return [{field: item[field] for field in fields if field in item} for item in items]
+
+
+# Serializes the generic claim_reminder's read-check-write within a process
+_claim_lock = threading.Lock()
+
+# Sent-reminder markers are kept this long after their occurrence starts.
+# Reminders only go out before an occurrence, so older markers are never read.
+REMINDER_MARKER_TTL_SECONDS = 86400
+
+
+def put_op(item: Dict) -> str:
+    """Change op for a whole-item put: a fresh create has created_at equal to updated_at"""
+    return OP_CREATE if item.get('created_at') == item.get('updated_at') else OP_UPDATE
+
+
+class EventStore(ABC):
+    """Storage interface behind ``event_service``.
+
+    Backends must implement the abstract primitives (single-item reads and
+    writes, full listing, filtered queries, raw put/remove) and expose a
+    ``change_log`` with ``append``, ``latest``, ``since`` and ``compact``. Batch, search and maintenance
+    operations have generic implementations here that a backend overrides
+    when its engine can do better.
+    """
+
+    # Items per page yielded by the generic iter_* implementations
+    page_size = 500
+
+    change_log = None
+
+    # Names the storage behind this store (backend plus table or path), so a
+    # snapshot is only adopted by a store reading the same data it was taken from
+    identity = None
+
+    # JSON file the generic claim_reminder keeps its markers in; None keeps them in memory
+    reminders_path = None
+    _reminders = None
+
+    def reconnect(self):
+        """Re-open connections after fork (no-op for stores without any)"""
+
+    def create_table_if_not_exists(self):
+        """Create the backing tables / schema if missing"""
+
+    # ---- primitives ------------------------------------------------------
+
+    @abstractmethod
+    def get_all_events(self, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Every event, ordered by start time"""
+
+    @abstractmethod
+    def query_events(self, query, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Events matching an EventQuery's filters (unordered)"""
+
+    @abstractmethod
+    def get_event_by_id(self, event_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict]:
+        """One event, or None if it does not exist"""
+
+    @abstractmethod
+    def create_event(self, event_data: Dict) -> Dict:
+        """Store a new event, stamping created_at and updated_at"""
+
+    @abstractmethod
+    def update_event(self, event_id: str, event_data: Dict) -> Dict:
+        """Merge ``event_data`` into an existing event; ValueError if it does not exist"""
+
+    @abstractmethod
+    def delete_event(self, event_id: str) -> bool:
+        """Delete an event; ValueError if it does not exist"""
+
+    # ---- generic implementations -----------------------------------------
+
+    def _pages(self, items: List[Dict]) -> Iterator[List[Dict]]:
+        for start in range(0, max(len(items), 1), self.page_size):
+            yield items[start:start + self.page_size]
+
+    def iter_query_pages(self, query=None, fields: Optional[Sequence[str]] = None) -> Iterator[List[Dict]]:
+        """Yield pages of events, filtered when ``query`` has filters"""
+        if query is not None and query.has_filters:
+            items = self.query_events(query, fields)
+        else:
+            items = self.get_all_events(fields)
+        return self._pages(items)
+
+    def batch_get(self, event_ids: List[str], fields: Optional[Sequence[str]] = None) -> Dict[str, Dict]:
+        """``{id: item}`` for the ids that exist"""
+        found = {}
+        for event_id in dict.fromkeys(event_ids):
+            item = self.get_event_by_id(event_id, fields)
+            if item is not None:
+                found[event_id] = item
+        return found
+
+    def batch_write(self, put_items: List[Dict], delete_ids: List[str] = ()) -> Dict[str, str]:
+        """Put and delete many items; returns ``{id: error}`` for failures"""
+        failures = {}
+        changes = []
+        for item in put_items:
+            try:
+                self._put(item)
+                changes.append((item['id'], put_op(item)))
+            except Exception as e:
+                failures[item['id']] = str(e)
+        for event_id in delete_ids:
+            try:
+                self._remove(event_id)
+                changes.append((event_id, OP_DELETE))
+            except Exception as e:
+                failures[event_id] = str(e)
+        self.change_log.append(changes)
+        return failures
+
+    @abstractmethod
+    def _put(self, item: Dict):
+        """Store ``item`` as-is, replacing any existing version (used by batch_write)"""
+
+    @abstractmethod
+    def _remove(self, event_id: str):
+        """Delete ``event_id`` if present (used by batch_write)"""
+
+    def claim_reminder(self, event_id: str, occurrence_epoch: int) -> bool:
+        """Mark the reminder for the occurrence starting at ``occurrence_epoch`` as sent.
+
+        Returns False if it already was, or the event is gone, so exactly one
+        caller sends it. Markers are kept apart from the events, in
+        ``reminders_path`` (under its file lock) when set and in memory
+        otherwise, so a claim changes no event and records no change.
+        Shared backends override it with a conditional write.
+        """
+        with _claim_lock:
+            if self.get_event_by_id(event_id, ('id',)) is None:
+                return False
+            if self.reminders_path is None:
+                return self._claim(self._reminders_in_memory(), event_id, occurrence_epoch)
+            with locked(self.reminders_path):
+                reminders = self._read_reminders()
+                if not self._claim(reminders, event_id, occurrence_epoch):
+                    return False
+                atomic_write_json(self.reminders_path, reminders)
+            return True
+
+    def _reminders_in_memory(self) -> Dict[str, Dict]:
+        if self._reminders is None:
+            self._reminders = {}
+        return self._reminders
+
+    def _read_reminders(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.reminders_path):
+            return {}
+        with open(self.reminders_path) as f:
+            return json.load(f)
+
+    def _claim(self, reminders: Dict[str, Dict], event_id: str, occurrence_epoch: int) -> bool:
+        """Record the claim in ``reminders`` unless already there, dropping expired markers"""
+        marker = reminders.get(event_id)
+        if marker is not None and marker['occurrence'] >= occurrence_epoch:
+            return False
+        expired_before = time.time() - REMINDER_MARKER_TTL_SECONDS
+        for stale_id in [key for key, value in reminders.items() if value['occurrence'] < expired_before]:
+            del reminders[stale_id]
+        reminders[event_id] = {'occurrence': occurrence_epoch, 'sent_at': self._timestamp()}
+        return True
+
+    def search_events(self, query: str, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Search events by title or description"""
+        query_lower = query.lower()
+        return project([event for event in self.get_all_events() if matches_text(event, query_lower)], fields)
+
+    def iter_search_pages(self, query: str, fields: Optional[Sequence[str]] = None) -> Iterator[List[Dict]]:
+        return self._pages(self.search_events(query, fields))
+
+    def get_events_by_date_range(self, start_date: str, end_date: str) -> List[Dict]:
+        low, high = to_epoch(start_date, 'start_date'), to_epoch(end_date, 'end_date')
+        return [event for event in self.get_all_events() if low <= start_epoch_of(event) <= high]
+
+    def get_events_with_email(self) -> List[Dict]:
+        return [event for event in self.get_all_events() if event.get('email')]
+
+    def backfill_epochs(self) -> int:
+        """Add start_epoch/end_epoch to items stored without them"""
+        updated = 0
+        for item in self.get_all_events():
+            if item.get('start_epoch') is not None and item.get('end_epoch') is not None:
+                continue
+            try:
+                item['start_epoch'] = to_epoch(item['start_time'], 'start_time')
+                item['end_epoch'] = to_epoch(item['end_time'], 'end_time')
+            except (KeyError, ValueError) as e:
+                print(f"⚠️ Skipping event {item.get('id')}: {e}")
+                continue
+            self._put(item)
+            updated += 1
+        print(f"✅ Backfilled epochs on {updated} events")
+        return updated
+
+    def migrate_from_json(self, json_file_path: str):
+        """Import events from a JSON file"""
+        if not os.path.exists(json_file_path):
+            print(f"❌ JSON file not found: {json_file_path}")
+            return
+        with open(json_file_path, 'r') as f:
+            events = json.load(f)
+        print(f"🔄 Migrating {len(events)} events...")
+        for event in events:
+            try:
+                event.setdefault('start_epoch', to_epoch(event['start_time'], 'start_time'))
+                event.setdefault('end_epoch', to_epoch(event['end_time'], 'end_time'))
+                self.create_event(event)
+            except Exception as e:
+                print(f"❌ Failed to migrate event {event.get('title', 'Unknown')}: {e}")
+        print(f"✅ Migration completed! {len(events)} events migrated.")
+
+    def export_to_json(self, json_file_path: str):
+        """Export all events to a JSON file"""
+        events = self.get_all_events()
+        with open(json_file_path, 'w') as f:
+            json.dump(events, f, indent=4, default=json_default)
+        print(f"✅ Exported {len(events)} events to {json_file_path}")
+
+    @staticmethod
+    def _timestamp() -> str:
+        return datetime.now().isoformat()
+
+
+def create_event_store(backend: str) -> EventStore:
+    """Instantiate the storage backend named by STORAGE_BACKEND"""
+    # Imported lazily so unused backends (and their dependencies) are never loaded
+    if backend == "dynamodb":
+        from app.services.dynamodb_service import DynamoDBService
+        return DynamoDBService()
+    if backend == "sqlite":
+        from app.config import SQLITE_PATH
+        from app.services.sqlite_service import SQLiteService
+        return SQLiteService(SQLITE_PATH)
+    if backend == "file":
+        from app.config import EVENT_FILE_PATH, FILE_FLUSH_SECONDS
+        from app.services.file_service import FileService
+        return FileService(EVENT_FILE_PATH, flush_seconds=FILE_FLUSH_SECONDS)
+    if backend == "journal":
+        from app.config import CHANGE_LOG_RETENTION_SECONDS, JOURNAL_COMPACT_MIN_RECORDS, JOURNAL_FSYNC, JOURNAL_PATH
+        from app.services.journal_service import JournalService
+        return JournalService(JOURNAL_PATH, sync=JOURNAL_FSYNC, compact_min_records=JOURNAL_COMPACT_MIN_RECORDS,
+                              retain_seconds=CHANGE_LOG_RETENTION_SECONDS)
+    if backend == "memory":
+        from app.services.memory_service import MemoryService
+        return MemoryService()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend!r} (expected dynamodb, sqlite, file, journal or memory)")
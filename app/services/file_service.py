@@ -0,0 +1,297 @@
+import copy
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.services.change_log import OP_DELETE, ChangeGone
+from app.services.memory_service import MemoryService
+from app.utils.file_io import atomic_write_json, locked
+from app.utils.metrics import Counters, register_metrics
+
+
+def _file_version(path: str) -> Optional[Tuple[int, int, int]]:
+    """Identity of the file's current contents; every atomic replace changes it"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class FileChangeLog:
+    """Change log shared by every process using the same events file.
+
+    Records are JSON lines appended to ``path`` under the events file lock,
+    so sequence numbers are unique across processes. Each process tails the
+    file from where it last stopped; compaction rewrites it (with a header
+    line carrying the watermark) and renames it into place, which readers
+    notice as a new inode and re-read. ``before_read`` runs ahead of every
+    read, so a process's queued writes are in the log before it answers.
+    """
+
+    def __init__(self, path: str, locked_path: str, before_read: Optional[Callable[[], None]] = None):
+        self.path = path
+        self._locked_path = locked_path  # the events file, whose lock serializes appends
+        self._before_read = before_read
+        self._mutex = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._records = []
+        self._last_seq = 0
+        self._compacted_through = 0
+        self._offset = 0
+        self._inode = None
+
+    def _tail(self):
+        """Read records appended since the last call (caller holds ``_mutex``)"""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            self._reset()
+            return
+        with f:
+            stat = os.fstat(f.fileno())
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                self._reset()
+                self._inode = stat.st_ino
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # a writer is mid-append; pick it up next time
+                self._offset += len(line)
+                record = json.loads(line)
+                if 'compacted_through' in record:
+                    self._last_seq = max(self._last_seq, record['last_seq'])
+                    self._compacted_through = record['compacted_through']
+                    continue
+                self._records.append(record)
+                self._last_seq = max(self._last_seq, record['seq'])
+
+    def append_locked(self, changes: Sequence[Tuple[str, str]], now: Optional[float] = None) -> Optional[int]:
+        """Append changes; the caller holds the events file lock exclusively"""
+        if not changes:
+            return None
+        now = int(time.time() if now is None else now)
+        with self._mutex:
+            self._tail()
+            first = self._last_seq + 1
+            lines = "".join(
+                json.dumps({'seq': first + offset, 'id': event_id, 'op': op, 'at': now}, separators=(",", ":")) + "\n"
+                for offset, (event_id, op) in enumerate(changes)
+            )
+            with open(self.path, "a") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            self._tail()
+            return self._last_seq
+
+    def append(self, changes: Sequence[Tuple[str, str]]) -> Optional[int]:
+        with locked(self._locked_path):
+            return self.append_locked(changes)
+
+    def latest(self) -> int:
+        if self._before_read is not None:
+            self._before_read()
+        with self._mutex:
+            self._tail()
+            return self._last_seq
+
+    def since(self, token: int, limit: int = 500, now: Optional[float] = None) -> Tuple[List[Dict], int, bool]:
+        if self._before_read is not None:
+            self._before_read()
+        with self._mutex:
+            self._tail()
+            if token < self._compacted_through:
+                raise ChangeGone(f"Token {token} is older than the retained change history")
+            records = [record for record in self._records if record['seq'] > token]
+        page = records[:limit]
+        return page, page[-1]['seq'] if page else token, len(records) > limit
+
+    def compact(self, retain_seconds: float, now: Optional[float] = None) -> int:
+        if self._before_read is not None:
+            self._before_read()
+        now = time.time() if now is None else now
+        with locked(self._locked_path), self._mutex:
+            self._tail()
+            latest_by_id = {record['id']: record['seq'] for record in self._records}
+            expired = [record['seq'] for record in self._records if record['at'] < now - retain_seconds]
+            compacted_through = max([self._compacted_through] + expired)
+            kept = [record for record in self._records
+                    if record['at'] >= now - retain_seconds and record['seq'] == latest_by_id[record['id']]]
+            header = {'last_seq': self._last_seq, 'compacted_through': compacted_through}
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w") as f:
+                for record in [header] + kept:
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            removed = len(self._records) - len(kept)
+            self._reset()
+            self._tail()
+        print(f"✅ Compacted change log: {removed} records removed")
+        return removed
+
+
+class FileService(MemoryService):
+    """Event store kept in a JSON file, safe to share between worker processes.
+
+    Events live in an in-memory dict keyed by id; writes apply there at once
+    and are queued. A background thread flushes the queue every
+    ``flush_seconds``: under an exclusive ``fcntl`` lock it merges the
+    queued writes into the file's current contents (re-reading it only if
+    another process replaced it since) and writes the result to a temp file
+    that is renamed over the original. Readers never need the lock; they
+    re-read the file when its inode changes. Writes made within the last
+    ``flush_seconds`` are lost if the process crashes.
+    """
+
+    def __init__(self, path: str, flush_seconds: float = 0.5):
+        super().__init__()
+        self.path = path
+        self.identity = f"file:{os.path.abspath(path)}"
+        self.reminders_path = path + ".reminders"
+        self.flush_seconds = flush_seconds
+        self.change_log = FileChangeLog(path + ".changes", path, before_read=self.flush)
+        self.stats = Counters("writes", "flushes", "reloads")
+        self._pending: Dict[str, Optional[Dict]] = {}
+        self._pending_changes: List[Tuple[str, str]] = []
+        self._flush_lock = threading.Lock()
+        self._flusher_pid = None
+        self._version = None
+        self._refresh()
+        register_metrics("file_store", self.metrics)
+
+    def metrics(self) -> Dict[str, int]:
+        return dict(self.stats.snapshot(), pending=len(self._pending), events=len(self._events))
+
+    def reconnect(self):
+        """Threads do not survive fork; the next write starts this process's flusher"""
+        self._flusher_pid = None
+
+    # ---- file state ------------------------------------------------------
+
+    def _read_file(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            return {item['id']: item for item in json.load(f)}
+
+    def _overlay_pending(self, events: Dict[str, Dict]):
+        for event_id, item in self._pending.items():
+            if item is None:
+                events.pop(event_id, None)
+            else:
+                events[event_id] = copy.deepcopy(item)
+
+    def _refresh(self):
+        """Pick up the file if another process replaced it"""
+        known = self._version
+        version = _file_version(self.path)
+        if version == known:
+            return
+        events = self._read_file()
+        with self._lock:
+            if self._version != known:
+                return  # a flush in this process got there first
+            self._overlay_pending(events)
+            self._events = events
+            self._version = version
+        self.stats.add("reloads")
+
+    def flush(self):
+        """Write queued changes to the file now"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                pending, changes = self._pending, list(self._pending_changes)
+                self._pending, self._pending_changes = {}, []
+            try:
+                with locked(self.path):
+                    if _file_version(self.path) == self._version:
+                        with self._lock:
+                            # Nobody else wrote, so memory is the new file: take
+                            # anything queued meanwhile along with this batch
+                            pending.update(self._pending)
+                            changes += self._pending_changes
+                            self._pending, self._pending_changes = {}, []
+                            events = copy.copy(self._events)
+                    else:
+                        events = self._read_file()
+                        for event_id, item in pending.items():
+                            if item is None:
+                                events.pop(event_id, None)
+                            else:
+                                events[event_id] = item
+                    atomic_write_json(self.path, list(events.values()))
+                    self.change_log.append_locked(changes)
+                    version = _file_version(self.path)
+            except BaseException:
+                with self._lock:
+                    # Put the batch back underneath anything queued since
+                    pending.update(self._pending)
+                    self._pending = pending
+                    self._pending_changes = changes + self._pending_changes
+                raise
+            with self._lock:
+                self._overlay_pending(events)
+                self._events = events
+                self._version = version
+        self.stats.add("flushes")
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Error flushing {self.path}: {e}")
+
+    def _ensure_flusher(self):
+        if self._flusher_pid != os.getpid():
+            self._flusher_pid = os.getpid()
+            threading.Thread(target=self._run_flusher, name="file-store-flush", daemon=True).start()
+
+    # ---- reads see the latest file plus this process's queued writes -----
+
+    def get_all_events(self, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        self._refresh()
+        return super().get_all_events(fields)
+
+    def query_events(self, query, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        self._refresh()
+        return super().query_events(query, fields)
+
+    def get_event_by_id(self, event_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict]:
+        self._refresh()
+        return super().get_event_by_id(event_id, fields)
+
+    # ---- writes ----------------------------------------------------------
+
+    def _commit(self, writes: Sequence[Tuple[str, str, Optional[Dict]]], now: Optional[float] = None) -> Optional[int]:
+        """Apply writes in memory and queue them for the next flush"""
+        with self._lock:
+            for op, event_id, item in writes:
+                if op == OP_DELETE:
+                    self._events.pop(event_id, None)
+                    self._pending[event_id] = None
+                else:
+                    self._events[event_id] = copy.deepcopy(item)
+                    self._pending[event_id] = copy.deepcopy(item)
+            self._pending_changes += [(event_id, op) for op, event_id, _ in writes]
+        self.stats.add("writes", len(writes))
+        self._ensure_flusher()
+        return None
+
+    def update_event(self, event_id: str, event_data: Dict) -> Dict:
+        self._refresh()
+        return super().update_event(event_id, event_data)
+
+    def delete_event(self, event_id: str) -> bool:
+        self._refresh()
+        return super().delete_event(event_id)
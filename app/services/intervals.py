@@ -0,0 +1,149 @@
+import heapq
+from bisect import bisect_right
+from datetime import timedelta
+from typing import Hashable, Iterator, List, Optional, Tuple
+
+# Recurrence intervals (fixed lengths, as the reminder task steps occurrences)
+RECURRING_INTERVALS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+    "monthly": timedelta(days=30),  # approx.
+}
+
+Interval = Tuple[int, int, Hashable]  # (start, end, key): half-open [start, end) in epoch seconds
+
+
+class ScheduleConflict(Exception):
+    """The event overlaps others with the same owner; ``conflicts`` describes them"""
+
+    def __init__(self, conflicts: List[dict]):
+        super().__init__(f"Event overlaps {len(conflicts)} existing event(s) for the same email")
+        self.conflicts = conflicts
+
+
+def span(start: int, end: int) -> Tuple[int, int]:
+    """Half-open interval for an event's inclusive start/end; instants last one second.
+
+    Back-to-back events (one ends at 11:00, the next starts at 11:00) do not overlap.
+    """
+    return start, max(end, start + 1)
+
+
+def occurrences(start: int, end: int, recurrence: Optional[str],
+                window_start: int, window_end: int) -> Iterator[Tuple[int, int]]:
+    """Half-open spans of an event's occurrences overlapping [window_start, window_end).
+
+    A recurring event is stepped by its interval, starting from the first
+    occurrence that has not ended by ``window_start``.
+    """
+    start, end = span(start, end)
+    step = RECURRING_INTERVALS.get(recurrence)
+    if step is None:
+        if start < window_end and end > window_start:
+            yield start, end
+        return
+    step = int(step.total_seconds())
+    # First occurrence that has not ended by window_start
+    n = max(0, -(-(window_start - end + 1) // step))
+    while start + n * step < window_end:
+        yield start + n * step, end + n * step
+        n += 1
+
+
+class IntervalTree:
+    """Intervals kept sorted by start and searched as an implicit balanced tree.
+
+    The node for a slice of the sorted arrays is its middle element, and
+    ``_max_end`` holds each node's largest end over its slice, so a search
+    skips every subtree that ends before the query starts. Once the
+    augmentation is built, finding the k intervals that overlap a query
+    costs O(log n + k). Adding or removing shifts the arrays in O(n) and
+    discards the augmentation, so the first search after a write pays O(n)
+    to rebuild it: write-then-check is O(n), repeated checks O(log n + k).
+    """
+
+    def __init__(self, intervals: Optional[List[Interval]] = None):
+        intervals = sorted(intervals or (), key=lambda interval: interval[0])
+        self._starts = [interval[0] for interval in intervals]
+        self._ends = [interval[1] for interval in intervals]
+        self._keys = [interval[2] for interval in intervals]
+        self._max_end = None
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[Interval]:
+        return zip(self._starts, self._ends, self._keys)
+
+    def add(self, start: int, end: int, key: Hashable):
+        position = bisect_right(self._starts, start)
+        self._starts.insert(position, start)
+        self._ends.insert(position, end)
+        self._keys.insert(position, key)
+        self._max_end = None
+
+    def remove(self, key: Hashable):
+        """Remove every interval stored under ``key``"""
+        kept = [i for i, k in enumerate(self._keys) if k != key]
+        if len(kept) != len(self._keys):
+            self._starts = [self._starts[i] for i in kept]
+            self._ends = [self._ends[i] for i in kept]
+            self._keys = [self._keys[i] for i in kept]
+            self._max_end = None
+
+    def _build(self, lo: int, hi: int) -> int:
+        if lo >= hi:
+            return -1 << 62
+        mid = (lo + hi) // 2
+        self._max_end[mid] = max(self._ends[mid], self._build(lo, mid), self._build(mid + 1, hi))
+        return self._max_end[mid]
+
+    def overlapping(self, start: int, end: int) -> List[Interval]:
+        """Intervals overlapping [start, end), by start"""
+        if self._max_end is None:
+            self._max_end = [0] * len(self._starts)
+            self._build(0, len(self._starts))
+        found = []
+        self._search(0, len(self._starts), start, end, found)
+        return [(self._starts[i], self._ends[i], self._keys[i]) for i in found]
+
+    def _search(self, lo: int, hi: int, start: int, end: int, found: List[int]):
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self._max_end[mid] <= start:
+            return  # everything in this subtree ends before the query
+        self._search(lo, mid, start, end, found)
+        if self._starts[mid] < end:
+            if self._ends[mid] > start:
+                found.append(mid)
+            self._search(mid + 1, hi, start, end, found)
+
+
+def merge_intervals(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Union of half-open spans as disjoint spans, by a sort-and-sweep; touching spans join"""
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def overlapping_pairs(intervals: List[Interval]) -> Iterator[Tuple[Interval, Interval]]:
+    """Pairs of intervals with different keys that overlap, by a sort-and-sweep.
+
+    ``intervals`` must be sorted by start. A heap holds the intervals still
+    open at the current start, so the cost is O(n log n + pairs).
+    """
+    active = []  # (end, position, interval)
+    for position, interval in enumerate(intervals):
+        start = interval[0]
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for _, _, other in active:
+            if other[2] != interval[2]:
+                yield other, interval
+        heapq.heappush(active, (interval[1], position, interval))
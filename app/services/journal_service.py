@@ -0,0 +1,283 @@
+import fcntl
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.services.change_log import OP_CREATE, OP_DELETE, MemoryChangeLog
+from app.services.memory_service import MemoryService
+from app.utils.file_io import fsync_directory
+from app.utils.json_provider import json_default, orjson
+from app.utils.metrics import Counters, register_metrics
+
+
+def _encode(record: Dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record, default=json_default) + b"\n"
+    return json.dumps(record, separators=(",", ":"), default=json_default).encode() + b"\n"
+
+
+def _decode(line: bytes) -> Dict:
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+
+class JournalLocked(Exception):
+    """Another process already has the journal open for writing"""
+
+
+class JournalChangeLog(MemoryChangeLog):
+    """In-memory change log rebuilt from the journal; compacting it rewrites the journal"""
+
+    def __init__(self, store: "JournalService"):
+        super().__init__()
+        self._store = store
+
+    def prune(self, retain_seconds: float, now: Optional[float] = None) -> int:
+        return super().compact(retain_seconds, now)
+
+    def compact(self, retain_seconds: float, now: Optional[float] = None) -> int:
+        return self._store.compact_journal(retain_seconds, now)
+
+
+class JournalService(MemoryService):
+    """Event store backed by an append-only JSON-lines journal.
+
+    Each create, update and delete appends one line
+    ``{"seq", "op", "id", "at", "event"}`` (no body for deletes), so a write
+    costs one small append instead of rewriting the whole file. Writers
+    return once their line is fsynced; concurrent writers share one fsync
+    (group commit). At start-up the journal is replayed into the in-memory
+    store, and a torn final line from a crash is discarded. Its ``seq``
+    numbers are the change log's tokens.
+
+    When superseded lines outnumber live events, a background thread
+    rewrites the journal to one line per event plus the tombstones still
+    within the change log's retention, copying lines appended meanwhile
+    before an atomic rename. Writes are not coordinated across processes,
+    so only one process may have the journal open: each takes an exclusive
+    ``flock`` on ``path + ".lock"`` (again after fork, in ``reconnect``)
+    and raises JournalLocked if another process holds it.
+    """
+
+    def __init__(self, path: str, sync: bool = True, compact_min_records: int = 1000,
+                 retain_seconds: float = 7 * 24 * 3600):
+        super().__init__()
+        self.path = path
+        self.identity = f"journal:{os.path.abspath(path)}"
+        self.reminders_path = path + ".reminders"
+        self.sync = sync
+        self.compact_min_records = compact_min_records
+        self.retain_seconds = retain_seconds
+        self.change_log = JournalChangeLog(self)
+        self.stats = Counters("appends", "fsyncs", "compactions")
+        self._sync_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._compacting = False
+        self._lines = 0
+        self._written = self._synced = 0
+        self._lock_file = self._take_lock()
+        self._replay()
+        self._file = open(self.path, "ab")
+        register_metrics("journal", self.metrics)
+
+    def _take_lock(self):
+        """Hold the journal's lock file exclusively for this process, or raise JournalLocked"""
+        lock_file = open(self.path + ".lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            raise JournalLocked(f"{self.path} is in use by another process; "
+                                f"run a single worker with the journal backend")
+        return lock_file
+
+    def reconnect(self):
+        """Re-open the journal after fork, taking the lock for this process alone"""
+        with self._lock:
+            # The inherited lock is shared with the parent (which does not
+            # write after forking): release it, then compete for our own
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = self._take_lock()
+            self._file.close()
+            self._file = open(self.path, "ab")
+
+    def close(self):
+        """Close the journal and release its lock"""
+        with self._lock:
+            self._file.close()
+            self._lock_file.close()
+
+    def metrics(self) -> Dict[str, int]:
+        return dict(self.stats.snapshot(), lines=self._lines, events=len(self._events))
+
+    # ---- replay ----------------------------------------------------------
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+        events, records = {}, []
+        last_seq = compacted_through = 0
+        good = lines = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = _decode(line)
+                except ValueError:
+                    break
+                good += len(line)
+                if 'compacted_through' in record:
+                    # Header written by compaction
+                    last_seq, compacted_through = record['last_seq'], record['compacted_through']
+                    continue
+                lines += 1
+                if record['op'] == OP_DELETE:
+                    events.pop(record['id'], None)
+                else:
+                    events[record['id']] = record['event']
+                if 'seq' in record:
+                    records.append({key: record[key] for key in ('seq', 'id', 'op', 'at')})
+        size = os.path.getsize(self.path)
+        if good < size:
+            # A crash mid-append leaves a partial last line; it was never acknowledged
+            print(f"⚠️ Discarding {size - good} bytes of torn journal tail in {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(good)
+        self._events = events
+        self._lines = lines
+        self.change_log.restore(records, last_seq, compacted_through)
+        print(f"✅ Replayed {lines} journal records into {len(events)} events")
+
+    # ---- writes ----------------------------------------------------------
+
+    def _commit(self, writes: Sequence[Tuple[str, str, Optional[Dict]]], now: Optional[float] = None) -> Optional[int]:
+        """Append the writes to the journal, then apply them in memory"""
+        if not writes:
+            return None
+        now = int(time.time() if now is None else now)
+        with self._lock:
+            first = self.change_log.latest() + 1
+            payload = b"".join(
+                _encode(dict({'seq': first + offset, 'op': op, 'id': event_id, 'at': now},
+                             **({'event': item} if op != OP_DELETE else {})))
+                for offset, (op, event_id, item) in enumerate(writes)
+            )
+            self._file.write(payload)
+            self._file.flush()
+            self._written += 1
+            self._lines += len(writes)
+            last = super()._commit(writes, now)
+        self.stats.add("appends")
+        self._maybe_compact()
+        return last
+
+    def _sync(self):
+        """Wait until everything appended so far is on disk, sharing fsyncs between writers"""
+        if not self.sync:
+            return
+        target = self._written
+        with self._sync_lock:
+            if self._synced >= target:
+                # Another writer's fsync already covered our append
+                return
+            written = self._written
+            os.fsync(self._file.fileno())
+            self._synced = written
+        self.stats.add("fsyncs")
+
+    # Public writes are acknowledged only once durable; the fsync happens
+    # outside the store lock so concurrent writers can share it.
+
+    def create_event(self, event_data: Dict) -> Dict:
+        event = super().create_event(event_data)
+        self._sync()
+        return event
+
+    def update_event(self, event_id: str, event_data: Dict) -> Dict:
+        event = super().update_event(event_id, event_data)
+        self._sync()
+        return event
+
+    def delete_event(self, event_id: str) -> bool:
+        deleted = super().delete_event(event_id)
+        self._sync()
+        return deleted
+
+    def batch_write(self, put_items: List[Dict], delete_ids: List[str] = ()) -> Dict[str, str]:
+        failures = super().batch_write(put_items, delete_ids)
+        self._sync()
+        return failures
+
+    def _put(self, item: Dict):
+        super()._put(item)
+        self._sync()
+
+    def _remove(self, event_id: str):
+        super()._remove(event_id)
+        self._sync()
+
+    # ---- compaction ------------------------------------------------------
+
+    def _maybe_compact(self):
+        with self._lock:
+            live = len(self._events)
+            if self._compacting or self._lines - live <= max(self.compact_min_records, live):
+                return
+            self._compacting = True
+        threading.Thread(target=self._background_compact, name="journal-compaction", daemon=True).start()
+
+    def _background_compact(self):
+        try:
+            self.compact_journal()
+        except Exception as e:
+            print(f"❌ Journal compaction failed: {e}")
+        finally:
+            self._compacting = False
+
+    def compact_journal(self, retain_seconds: Optional[float] = None, now: Optional[float] = None) -> int:
+        """Rewrite the journal without superseded lines; returns change records dropped"""
+        retain_seconds = self.retain_seconds if retain_seconds is None else retain_seconds
+        with self._compact_lock:
+            with self._lock:
+                removed = self.change_log.prune(retain_seconds, now)
+                records, last_seq, compacted_through = self.change_log.snapshot()
+                events = dict(self._events)
+                offset = self._file.tell()
+
+            # Events whose last change has left the change log are written without a seq
+            recent = {record['id'] for record in records}
+            temp_path = self.path + ".compact"
+            with open(temp_path, "wb") as out:
+                out.write(_encode({'last_seq': last_seq, 'compacted_through': compacted_through}))
+                for event_id, event in events.items():
+                    if event_id not in recent:
+                        out.write(_encode({'op': OP_CREATE, 'id': event_id, 'event': event}))
+                for record in records:
+                    line = dict(record)
+                    if record['op'] != OP_DELETE:
+                        line['event'] = events[record['id']]
+                    out.write(_encode(line))
+            lines = len(events) - len(recent & events.keys()) + len(records)
+
+            with self._sync_lock, self._lock:
+                # Carry over whatever was appended while the snapshot was written
+                self._file.flush()
+                with open(self.path, "rb") as src:
+                    src.seek(offset)
+                    tail = src.read()
+                with open(temp_path, "ab") as out:
+                    out.write(tail)
+                    out.flush()
+                    os.fsync(out.fileno())
+                os.replace(temp_path, self.path)
+                fsync_directory(self.path)
+                self._file.close()
+                self._file = open(self.path, "ab")
+                self._lines = lines + tail.count(b"\n")
+                self._synced = self._written
+        self.stats.add("compactions")
+        print(f"✅ Compacted journal {self.path}: {self._lines} lines")
+        return removed
@@ -0,0 +1,84 @@
+import copy
+import threading
+import uuid
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.services.change_log import OP_CREATE, OP_DELETE, OP_UPDATE, MemoryChangeLog
+from app.services.event_store import EventNotFound, EventStore, project, put_op, start_epoch_of
+
+
+class MemoryService(EventStore):
+    """Process-local event store, for tests and throwaway single-process runs"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._events: Dict[str, Dict] = {}
+        self.change_log = MemoryChangeLog()
+        # Nothing outlives the process, so no other store holds the same data
+        self.identity = f"memory:{uuid.uuid4().hex}"
+
+    def get_all_events(self, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        with self._lock:
+            events = [copy.deepcopy(event) for event in self._events.values()]
+        events.sort(key=start_epoch_of)
+        return project(events, fields)
+
+    def query_events(self, query, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        with self._lock:
+            events = [copy.deepcopy(event) for event in self._events.values() if query.matches(event)]
+        return project(events, fields)
+
+    def get_event_by_id(self, event_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict]:
+        with self._lock:
+            event = self._events.get(event_id)
+            if event is None:
+                return None
+            return project([copy.deepcopy(event)], fields)[0]
+
+    def _commit(self, writes: Sequence[Tuple[str, str, Optional[Dict]]], now: Optional[float] = None) -> Optional[int]:
+        """Apply ``(op, event_id, item)`` writes and record them in the change log.
+
+        Every write goes through here, so subclasses can persist them.
+        """
+        with self._lock:
+            for op, event_id, item in writes:
+                if op == OP_DELETE:
+                    self._events.pop(event_id, None)
+                else:
+                    self._events[event_id] = copy.deepcopy(item)
+            return self.change_log.append([(event_id, op) for op, event_id, _ in writes], now)
+
+    def create_event(self, event_data: Dict) -> Dict:
+        now = self._timestamp()
+        event_data['created_at'] = now
+        event_data['updated_at'] = now
+        self._commit([(OP_CREATE, event_data['id'], event_data)])
+        return event_data
+
+    def update_event(self, event_id: str, event_data: Dict) -> Dict:
+        with self._lock:
+            existing_event = self._events.get(event_id)
+            if existing_event is None:
+                raise EventNotFound("Event not found")
+            updated = dict(copy.deepcopy(existing_event), **event_data)
+            updated['updated_at'] = self._timestamp()
+            self._commit([(OP_UPDATE, event_id, updated)])
+        return updated
+
+    def delete_event(self, event_id: str) -> bool:
+        with self._lock:
+            if event_id not in self._events:
+                raise EventNotFound("Event not found")
+            self._commit([(OP_DELETE, event_id, None)])
+        return True
+
+    def batch_write(self, put_items: List[Dict], delete_ids: List[str] = ()) -> Dict[str, str]:
+        self._commit([(put_op(item), item['id'], item) for item in put_items]
+                     + [(OP_DELETE, event_id, None) for event_id in delete_ids])
+        return {}
+
+    def _put(self, item: Dict):
+        self._commit([(OP_UPDATE, item['id'], item)])
+
+    def _remove(self, event_id: str):
+        self._commit([(OP_DELETE, event_id, None)])
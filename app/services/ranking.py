@@ -0,0 +1,97 @@
+import heapq
+import math
+from operator import itemgetter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.services.suggest_index import TOKEN_PATTERN
+
+# Fields scored by BM25 and how much a match in each counts
+FIELD_WEIGHTS = {"title": 2.0, "description": 1.0}
+RANKED_FIELDS = tuple(FIELD_WEIGHTS)
+
+# Standard BM25 parameters: term-frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-cased words of ``text``"""
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+class CorpusStats(NamedTuple):
+    """What BM25 needs to know about the whole collection for one query"""
+    documents: int
+    average_length: Dict[str, float]
+    document_frequency: Dict[str, Dict[str, int]]  # field -> term -> events containing it
+
+
+class TermStats:
+    """Per-field document frequencies and total lengths over every event.
+
+    Maintained incrementally by the event index: ``add`` an item when it
+    enters and ``add(item, -1)`` the version that leaves, so updates cost
+    one tokenization of the old and new text.
+    """
+
+    def __init__(self):
+        self.documents = 0
+        self._length = {field: 0 for field in RANKED_FIELDS}
+        self._frequency: Dict[str, Dict[str, int]] = {field: {} for field in RANKED_FIELDS}
+
+    def add(self, item: Dict, sign: int = 1):
+        self.documents += sign
+        for field in RANKED_FIELDS:
+            tokens = tokenize(item.get(field))
+            self._length[field] += sign * len(tokens)
+            frequency = self._frequency[field]
+            for token in set(tokens):
+                count = frequency.get(token, 0) + sign
+                if count:
+                    frequency[token] = count
+                else:
+                    del frequency[token]
+
+    def for_terms(self, terms: Sequence[str]) -> CorpusStats:
+        """The statistics ``score`` needs for ``terms``, copied out so the caller can drop its lock"""
+        documents = max(self.documents, 1)
+        return CorpusStats(
+            documents=self.documents,
+            average_length={field: self._length[field] / documents for field in RANKED_FIELDS},
+            document_frequency={field: {term: self._frequency[field].get(term, 0) for term in terms}
+                                for field in RANKED_FIELDS},
+        )
+
+
+def score(item: Dict, terms: Sequence[str], stats: CorpusStats, weights: Dict[str, float] = FIELD_WEIGHTS) -> float:
+    """Field-weighted BM25 of ``item`` for the query ``terms``.
+
+    Search matches substrings, so a term's frequency is how often it occurs
+    inside the field (``"stand"`` counts in ``"standup"``); field lengths
+    and document frequencies are in whole words.
+    """
+    total = 0.0
+    for field, weight in weights.items():
+        text = (item.get(field) or "").lower()
+        if not text:
+            continue
+        length_ratio = len(tokenize(text)) / (stats.average_length[field] or 1)
+        norm = K1 * (1 - B + B * length_ratio)
+        frequencies = stats.document_frequency[field]
+        for term in terms:
+            tf = text.count(term)
+            if tf:
+                df = frequencies.get(term, 0)
+                idf = math.log(1 + (stats.documents - df + 0.5) / (df + 0.5))
+                total += weight * idf * tf * (K1 + 1) / (tf + norm)
+    return total
+
+
+def top_k(pages: Iterable[List[Dict]], terms: Sequence[str], stats: CorpusStats, k: int) -> List[Tuple[float, str]]:
+    """``(score, id)`` of the ``k`` best items across ``pages``, best first.
+
+    Only a heap of ``k`` entries is kept, so memory does not grow with the
+    number of matches. Equal scores keep scan order.
+    """
+    scored = ((score(item, terms, stats), item['id']) for page in pages for item in page)
+    return heapq.nlargest(k, scored, key=itemgetter(0))
@@ -0,0 +1,172 @@
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Snapshot file layout (little-endian), every section 8-byte aligned:
+#   header       magic, version, row count, change token, written-at
+#   identity     uint32 length + UTF-8 identity of the store it was taken from
+#   recurrences  uint32 length + JSON list; a row's code indexes it ("" is 0)
+#   start, end   int64[count]   epoch columns
+#   recurrence   int8[count]    code into the recurrence list
+#   has_email    bool[count]
+#   nulls        uint16[count]  bit i set when STRING_FIELDS[i] is null
+#   offsets      uint32[len(STRING_FIELDS) * count + 1] into the heap, field-major
+#   heap         UTF-8 bytes of every string field, one field at a time
+MAGIC = b"EVSNAP01"
+VERSION = 2
+HEADER = struct.Struct("<8sIIqd")
+STRING_FIELDS = ("id", "title", "description", "start_time", "end_time", "recurrence", "email",
+                 "created_at", "updated_at")
+
+# Fields kept as explicit nulls when decoding, as stored items have them
+NULLABLE_FIELDS = ("recurrence", "email")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _sized(data: bytes) -> bytes:
+    return struct.pack("<I", len(data)) + data
+
+
+def write_snapshot(path: str, items: List[Dict], start: np.ndarray, end: np.ndarray, token: int,
+                   identity: str = ""):
+    """Atomically write ``items`` with their start/end epochs, as of change ``token`` of store ``identity``"""
+    count = len(items)
+    recurrences = {"": 0}
+    recurrence = np.empty(count, dtype=np.int8)
+    has_email = np.empty(count, dtype=bool)
+    nulls = np.zeros(count, dtype=np.uint16)
+    offsets = np.empty(len(STRING_FIELDS) * count + 1, dtype=np.uint32)
+    for row, item in enumerate(items):
+        recurrence[row] = recurrences.setdefault(item.get('recurrence') or "", len(recurrences))
+        has_email[row] = bool(item.get('email'))
+    # Field-major, so all ids sit together and decode in one go at load time
+    heap = bytearray()
+    slot = 0
+    for bit, field in enumerate(STRING_FIELDS):
+        for row, item in enumerate(items):
+            offsets[slot] = len(heap)
+            slot += 1
+            value = item.get(field)
+            if value is None:
+                nulls[row] |= 1 << bit
+            else:
+                heap += str(value).encode()
+    offsets[slot] = len(heap)
+
+    table = json.dumps(sorted(recurrences, key=recurrences.get)).encode()
+    sections = [
+        HEADER.pack(MAGIC, VERSION, count, token, time.time()),
+        _sized(identity.encode()),
+        _sized(table),
+        np.ascontiguousarray(start[:count], dtype="<i8").tobytes(),
+        np.ascontiguousarray(end[:count], dtype="<i8").tobytes(),
+        recurrence.tobytes(),
+        has_email.tobytes(),
+        nulls.astype("<u2").tobytes(),
+        offsets.astype("<u4").tobytes(),
+        bytes(heap),
+    ]
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        for section in sections:
+            f.write(section)
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class Snapshot:
+    """Read-only view of a snapshot file through ``mmap``.
+
+    Columns are NumPy arrays over the mapped pages, so opening costs no
+    parsing; string fields are decoded only when ``item(row)`` asks for them.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self.token, self.written_at = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} event snapshot")
+        offset = _align(HEADER.size)
+
+        def sized():
+            nonlocal offset
+            (size,) = struct.unpack_from("<I", self._map, offset)
+            data = self._map[offset + 4:offset + 4 + size]
+            offset = _align(offset + 4 + size)
+            return data
+
+        self.identity = sized().decode()
+        self.recurrences = json.loads(sized())
+
+        def column(dtype, length):
+            nonlocal offset
+            array = np.frombuffer(self._map, dtype=dtype, count=length, offset=offset)
+            offset = _align(offset + array.nbytes)
+            return array
+
+        self.start = column("<i8", self.count)
+        self.end = column("<i8", self.count)
+        self.recurrence = column("i1", self.count)
+        self.has_email = column("?", self.count)
+        self._nulls = column("<u2", self.count)
+        self._offsets = column("<u4", len(STRING_FIELDS) * self.count + 1)
+        self._heap = offset
+
+    def _string(self, slot: int) -> str:
+        low, high = self._offsets[slot], self._offsets[slot + 1]
+        return self._map[self._heap + low:self._heap + high].decode()
+
+    def string(self, field: str, row: int) -> Optional[str]:
+        """One string field of one row, without decoding the rest of it"""
+        bit = STRING_FIELDS.index(field)
+        if int(self._nulls[row]) & (1 << bit):
+            return None
+        return self._string(bit * self.count + row)
+
+    def ids(self) -> List[str]:
+        low = self._offsets[:self.count].tolist()
+        high = self._offsets[1:self.count + 1].tolist()
+        if not low:
+            return []
+        blob = self._map[self._heap + low[0]:self._heap + high[-1]]
+        if not blob.isascii():
+            return [self._string(row) for row in range(self.count)]
+        # ASCII, so byte offsets are character offsets: one decode, then slicing
+        text, base = blob.decode(), low[0]
+        return [text[start - base:end - base] for start, end in zip(low, high)]
+
+    def item(self, row: int) -> Dict:
+        """Decode one row back into a stored-item dict"""
+        nulls = int(self._nulls[row])
+        item = {}
+        for bit, field in enumerate(STRING_FIELDS):
+            if nulls & (1 << bit):
+                if field in NULLABLE_FIELDS:
+                    item[field] = None
+                continue
+            item[field] = self._string(bit * self.count + row)
+        item['start_epoch'] = int(self.start[row])
+        item['end_epoch'] = int(self.end[row])
+        return item
+
+
+def open_snapshot(path: str) -> Optional[Snapshot]:
+    """The snapshot at ``path``, or None if there is none or it is unreadable"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return Snapshot(path)
+    except (ValueError, struct.error, OSError) as e:
+        print(f"⚠️ Ignoring unreadable snapshot {path}: {e}")
+        return None
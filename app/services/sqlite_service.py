@@ -0,0 +1,311 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.services.change_log import OP_CREATE, OP_DELETE, OP_UPDATE, ChangeGone
+from app.services.event_query import FIELDS
+from app.services.event_store import EventNotFound, EventStore, put_op
+
+# Columns that keep an explicit null, as DynamoDB items do
+NULLABLE_COLUMNS = ("recurrence", "email")
+
+# Trigram FTS needs at least this many characters; shorter queries use LIKE
+MIN_FTS_QUERY = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    description TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    recurrence TEXT,
+    email TEXT,
+    start_epoch INTEGER,
+    end_epoch INTEGER,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_start_epoch ON events (start_epoch);
+CREATE INDEX IF NOT EXISTS idx_events_email ON events (email);
+CREATE INDEX IF NOT EXISTS idx_events_recurrence ON events (recurrence);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+    title, description, content='events', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+    INSERT INTO events_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+    INSERT INTO events_fts (events_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE ON events BEGIN
+    INSERT INTO events_fts (events_fts, rowid, title, description)
+    VALUES ('delete', old.rowid, old.title, old.description);
+    INSERT INTO events_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    op TEXT NOT NULL,
+    at INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reminders (
+    id TEXT NOT NULL,
+    occurrence INTEGER NOT NULL,
+    sent_at TEXT NOT NULL,
+    PRIMARY KEY (id, occurrence)
+);
+CREATE TRIGGER IF NOT EXISTS reminders_delete AFTER DELETE ON events BEGIN
+    DELETE FROM reminders WHERE id = old.id;
+END;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_UPSERT = (
+    f"INSERT INTO events ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))}) "
+    f"ON CONFLICT (id) DO UPDATE SET {', '.join(f'{f} = excluded.{f}' for f in FIELDS if f != 'id')}"
+)
+
+
+def _row_values(item: Dict) -> Tuple:
+    return tuple(item.get(field) for field in FIELDS)
+
+
+def _where(query, now: Optional[float] = None) -> Tuple[str, List]:
+    """SQL WHERE clause equivalent to an EventQuery's filters"""
+    now = int(time.time() if now is None else now)
+    clauses, params = [], []
+    if query.status == "upcoming":
+        clauses.append("start_epoch > ?")
+        params.append(now)
+    elif query.status == "ongoing":
+        clauses.append("start_epoch <= ? AND end_epoch >= ?")
+        params += [now, now]
+    elif query.status == "past":
+        clauses.append("end_epoch < ?")
+        params.append(now)
+    if query.start_epoch is not None:
+        clauses.append("start_epoch >= ?")
+        params.append(query.start_epoch)
+    if query.end_epoch is not None:
+        clauses.append("start_epoch <= ?")
+        params.append(query.end_epoch)
+    if query.recurrence == "":
+        clauses.append("(recurrence IS NULL OR recurrence = '')")
+    elif query.recurrence is not None:
+        clauses.append("recurrence = ?")
+        params.append(query.recurrence)
+    if query.has_email is True:
+        clauses.append("email > ''")
+    elif query.has_email is False:
+        clauses.append("(email IS NULL OR email = '')")
+    return " AND ".join(clauses) or "1", params
+
+
+class SQLiteChangeLog:
+    """Change log kept in the same SQLite database, written in the same transaction as the event"""
+
+    def __init__(self, service: "SQLiteService"):
+        self._service = service
+
+    @staticmethod
+    def _append(connection, changes: Sequence[Tuple[str, str]]):
+        now = int(time.time())
+        connection.executemany("INSERT INTO changes (id, op, at) VALUES (?, ?, ?)",
+                               [(event_id, op, now) for event_id, op in changes])
+
+    def append(self, changes: Sequence[Tuple[str, str]]) -> Optional[int]:
+        if not changes:
+            return None
+        with self._service._transaction() as connection:
+            self._append(connection, changes)
+        return self.latest()
+
+    def latest(self) -> int:
+        # sqlite_sequence keeps the high-water mark even after compaction deletes rows
+        row = self._service._connection().execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'changes'").fetchone()
+        return row[0] if row else 0
+
+    def _compacted_through(self, connection) -> int:
+        row = connection.execute("SELECT value FROM meta WHERE key = 'compacted_through'").fetchone()
+        return row[0] if row else 0
+
+    def since(self, token: int, limit: int = 500, now: Optional[float] = None) -> Tuple[List[Dict], int, bool]:
+        connection = self._service._connection()
+        if token < self._compacted_through(connection):
+            raise ChangeGone(f"Token {token} is older than the retained change history")
+        rows = connection.execute(
+            "SELECT seq, id, op, at FROM changes WHERE seq > ? ORDER BY seq LIMIT ?", (token, limit + 1)).fetchall()
+        records = [{'seq': seq, 'id': event_id, 'op': op, 'at': at} for seq, event_id, op, at in rows[:limit]]
+        return records, records[-1]['seq'] if records else token, len(rows) > limit
+
+    def compact(self, retain_seconds: float, now: Optional[float] = None) -> int:
+        cutoff = int((time.time() if now is None else now) - retain_seconds)
+        with self._service._transaction() as connection:
+            expired_through = connection.execute("SELECT MAX(seq) FROM changes WHERE at < ?", (cutoff,)).fetchone()[0]
+            if expired_through:
+                connection.execute(
+                    "INSERT INTO meta (key, value) VALUES ('compacted_through', ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)", (expired_through,))
+            removed = connection.execute(
+                "DELETE FROM changes WHERE at < ? OR seq NOT IN (SELECT MAX(seq) FROM changes GROUP BY id)",
+                (cutoff,)).rowcount
+        print(f"✅ Compacted change log: {removed} records removed")
+        return removed
+
+
+class SQLiteService(EventStore):
+    """Embedded SQLite event store for single-node deployments and tests.
+
+    The database runs in WAL mode so readers never block the writer. Filters
+    use indexes on start_epoch, email and recurrence; search uses a trigram
+    FTS5 table kept in sync by triggers, which matches substrings the same
+    way the other backends do. Each thread gets its own connection.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.identity = f"sqlite:{os.path.abspath(path)}"
+        self.change_log = SQLiteChangeLog(self)
+        self.reconnect()
+
+    def reconnect(self):
+        """Drop per-thread connections (called after fork)"""
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit mode; writes open explicit transactions below
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def create_table_if_not_exists(self):
+        """Create the schema (tables, indexes, FTS and triggers) if missing"""
+        self._connection().executescript(SCHEMA)
+
+    # ---- reads -----------------------------------------------------------
+
+    def _select(self, where: str, params: Sequence, fields: Optional[Sequence[str]] = None,
+                order: bool = True) -> List[Dict]:
+        columns = fields or FIELDS
+        sql = f"SELECT {', '.join(columns)} FROM events WHERE {where}"
+        if order:
+            sql += " ORDER BY start_epoch"
+        rows = self._connection().execute(sql, params).fetchall()
+        return [
+            {column: value for column, value in zip(columns, row)
+             if value is not None or column in NULLABLE_COLUMNS}
+            for row in rows
+        ]
+
+    def get_all_events(self, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        return self._select("1", (), fields)
+
+    def query_events(self, query, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        where, params = _where(query)
+        return self._select(where, params, fields, order=False)
+
+    def get_event_by_id(self, event_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Dict]:
+        rows = self._select("id = ?", (event_id,), fields, order=False)
+        return rows[0] if rows else None
+
+    def batch_get(self, event_ids: List[str], fields: Optional[Sequence[str]] = None) -> Dict[str, Dict]:
+        unique_ids = list(dict.fromkeys(event_ids))
+        found = {}
+        for start in range(0, len(unique_ids), 500):
+            chunk = unique_ids[start:start + 500]
+            where = f"id IN ({', '.join('?' * len(chunk))})"
+            found.update((item['id'], item) for item in self._select(where, chunk, fields, order=False))
+        return found
+
+    def search_events(self, query: str, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Substring search on title or description via the trigram index"""
+        if len(query) >= MIN_FTS_QUERY:
+            phrase = '"' + query.replace('"', '""') + '"'
+            return self._select("rowid IN (SELECT rowid FROM events_fts WHERE events_fts MATCH ?)", (phrase,), fields)
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return self._select("title LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\'", (pattern, pattern), fields)
+
+    # ---- writes ----------------------------------------------------------
+
+    def create_event(self, event_data: Dict) -> Dict:
+        now = self._timestamp()
+        event_data['created_at'] = now
+        event_data['updated_at'] = now
+        with self._transaction() as connection:
+            connection.execute(_UPSERT, _row_values(event_data))
+            self.change_log._append(connection, [(event_data['id'], OP_CREATE)])
+        return event_data
+
+    def update_event(self, event_id: str, event_data: Dict) -> Dict:
+        with self._transaction() as connection:
+            existing_event = self.get_event_by_id(event_id)
+            if not existing_event:
+                raise EventNotFound("Event not found")
+            existing_event.update(event_data)
+            existing_event['updated_at'] = self._timestamp()
+            connection.execute(_UPSERT, _row_values(existing_event))
+            self.change_log._append(connection, [(event_id, OP_UPDATE)])
+        return existing_event
+
+    def delete_event(self, event_id: str) -> bool:
+        with self._transaction() as connection:
+            if connection.execute("DELETE FROM events WHERE id = ?", (event_id,)).rowcount == 0:
+                raise EventNotFound("Event not found")
+            self.change_log._append(connection, [(event_id, OP_DELETE)])
+        return True
+
+    def batch_write(self, put_items: List[Dict], delete_ids: List[str] = ()) -> Dict[str, str]:
+        """All puts and deletes in one transaction"""
+        try:
+            with self._transaction() as connection:
+                connection.executemany(_UPSERT, [_row_values(item) for item in put_items])
+                connection.executemany("DELETE FROM events WHERE id = ?", [(event_id,) for event_id in delete_ids])
+                self.change_log._append(connection, [(item['id'], put_op(item)) for item in put_items]
+                                        + [(event_id, OP_DELETE) for event_id in delete_ids])
+        except sqlite3.Error as e:
+            print(f"❌ Error in batch write: {e}")
+            return {key: str(e) for key in [item['id'] for item in put_items] + list(delete_ids)}
+        return {}
+
+    def claim_reminder(self, event_id: str, occurrence_epoch: int) -> bool:
+        """Mark an occurrence's reminder as sent; the primary key lets only one process insert it"""
+        with self._transaction() as connection:
+            if connection.execute("SELECT 1 FROM events WHERE id = ?", (event_id,)).fetchone() is None:
+                return False
+            return connection.execute(
+                "INSERT INTO reminders (id, occurrence, sent_at) VALUES (?, ?, ?) ON CONFLICT DO NOTHING",
+                (event_id, occurrence_epoch, self._timestamp())).rowcount == 1
+
+    def _put(self, item: Dict):
+        with self._transaction() as connection:
+            connection.execute(_UPSERT, _row_values(item))
+
+    def _remove(self, event_id: str):
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM events WHERE id = ?", (event_id,))
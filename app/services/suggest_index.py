@@ -0,0 +1,125 @@
+import heapq
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Tokens shorter than this are not suggested on their own
+MIN_TOKEN_LENGTH = 2
+
+
+def title_tokens(title: str) -> List[str]:
+    """Distinct lower-cased words of a title, in order of appearance"""
+    tokens = TOKEN_PATTERN.findall(title.lower())
+    return [token for token in dict.fromkeys(tokens) if len(token) >= MIN_TOKEN_LENGTH]
+
+
+class _Terms:
+    """Sorted array of distinct lower-cased terms with how many events use each.
+
+    A prefix is one bisect away from its first match, and every match
+    follows it contiguously. Inserting or removing a term shifts the tail of
+    a Python list, a memmove that stays well under a millisecond at 10^6
+    terms, so the array is kept sorted on every write instead of rebuilt.
+    """
+
+    def __init__(self):
+        self._sorted: List[str] = []
+        self._counts: Dict[str, int] = {}
+        self._display: Dict[str, str] = {}
+
+    def build(self, terms: Dict[str, int], display: Dict[str, str]):
+        self._counts = terms
+        self._display = display
+        self._sorted = sorted(terms)
+
+    def add(self, term: str, display: str):
+        count = self._counts.get(term, 0)
+        if count == 0:
+            self._sorted.insert(bisect_left(self._sorted, term), term)
+        self._counts[term] = count + 1
+        self._display[term] = display
+
+    def remove(self, term: str):
+        count = self._counts.get(term, 0)
+        if count > 1:
+            self._counts[term] = count - 1
+            return
+        if count == 1:
+            del self._counts[term]
+            del self._display[term]
+            del self._sorted[bisect_left(self._sorted, term)]
+
+    def matches(self, prefix: str, scan_limit: int) -> Iterable[Tuple[str, str, int]]:
+        """(term, display, count) for up to ``scan_limit`` terms starting with ``prefix``"""
+        position = bisect_left(self._sorted, prefix)
+        for term in self._sorted[position:position + scan_limit]:
+            if not term.startswith(prefix):
+                break
+            yield term, self._display[term], self._counts[term]
+
+    def __len__(self):
+        return len(self._sorted)
+
+
+class SuggestIndex:
+    """Prefix lookup over event titles and the words in them.
+
+    Whole titles and title tokens are kept in two sorted term arrays with
+    per-term event counts. ``suggest`` bisects to the prefix, looks at no
+    more than ``scan_limit`` matches in each array and returns the
+    ``limit`` used by the most events (ties alphabetically), so a one-letter
+    prefix costs the same as a long one. Not thread-safe; the owner locks.
+    """
+
+    def __init__(self, scan_limit: int = 1000):
+        self.scan_limit = scan_limit
+        self._title_of: Dict[str, str] = {}
+        self._titles = _Terms()
+        self._tokens = _Terms()
+
+    def build(self, titles: Iterable[Tuple[str, Optional[str]]]):
+        """Index ``(event_id, title)`` pairs in one sort, replacing the contents"""
+        self._title_of = {event_id: title for event_id, title in titles if title}
+        title_counts, title_display = {}, {}
+        token_counts = {}
+        for title in self._title_of.values():
+            key = title.lower()
+            title_counts[key] = title_counts.get(key, 0) + 1
+            title_display[key] = title
+            for token in title_tokens(title):
+                token_counts[token] = token_counts.get(token, 0) + 1
+        self._titles.build(title_counts, title_display)
+        self._tokens.build(token_counts, {token: token for token in token_counts})
+
+    def put(self, event_id: str, title: Optional[str]):
+        """Index an event's title, replacing whatever it had before"""
+        if self._title_of.get(event_id) == title:
+            return
+        self.drop(event_id)
+        if not title:
+            return
+        self._title_of[event_id] = title
+        self._titles.add(title.lower(), title)
+        for token in title_tokens(title):
+            self._tokens.add(token, token)
+
+    def drop(self, event_id: str):
+        title = self._title_of.pop(event_id, None)
+        if title is None:
+            return
+        self._titles.remove(title.lower())
+        for token in title_tokens(title):
+            self._tokens.remove(token)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Up to ``limit`` titles and tokens starting with ``prefix`` (case-insensitive)"""
+        prefix = prefix.lower()
+        candidates = [(count, text, "title") for _, text, count in self._titles.matches(prefix, self.scan_limit)]
+        candidates += [(count, text, "token") for _, text, count in self._tokens.matches(prefix, self.scan_limit)]
+        best = heapq.nsmallest(limit, candidates, key=lambda c: (-c[0], c[1].lower(), c[2]))
+        return [{"text": text, "kind": kind, "count": count} for count, text, kind in best]
+
+    def metrics(self) -> Dict[str, int]:
+        return {"events": len(self._title_of), "titles": len(self._titles), "tokens": len(self._tokens)}
@@ -0,0 +1,13 @@
+"""One-time backfill of start_epoch/end_epoch on existing DynamoDB items.
+
+Run from the project root:  python -m app.tasks.backfill_epochs
+"""
+from app.services.event_service import db_service
+
+
+def backfill_epochs():
+    return db_service.backfill_epochs()
+
+
+if __name__ == "__main__":
+    backfill_epochs()
@@ -0,0 +1,28 @@
+"""Compaction of the change log behind GET /api/events/changes.
+
+The reminder leader runs it every CHANGE_LOG_COMPACT_SECONDS; it can also be
+run by hand from the project root:  python -m app.tasks.compact_changes
+"""
+import threading
+import time
+
+from app.config import CHANGE_LOG_COMPACT_SECONDS
+from app.services.event_service import compact_changes
+
+
+def run_compaction_loop(interval=CHANGE_LOG_COMPACT_SECONDS):
+    while True:
+        try:
+            compact_changes()
+        except Exception as e:
+            print("⚠️ Change log compaction error:", e)
+        time.sleep(interval)
+
+
+def start_compaction_thread(interval=CHANGE_LOG_COMPACT_SECONDS):
+    compaction_thread = threading.Thread(target=run_compaction_loop, args=(interval,), daemon=True)
+    compaction_thread.start()
+
+
+if __name__ == "__main__":
+    compact_changes()
@@ -1,56 +1,65 @@
+import fcntl
+import os
 import threading
 import time
 from datetime import datetime, timedelta
-from app.services.event_service import get_all_events
+from app.config import REMINDER_LOCK_FILE, REMINDER_LOCK_RETRY_SECONDS
+from app.services.event_service import claim_reminder, get_all_event_objects
+from app.services.intervals import RECURRING_INTERVALS
+from app.tasks.compact_changes import start_compaction_thread
+from app.tasks.write_snapshot import start_snapshot_thread
 from app.utils.email_utils import send_email
 
-# Recurrence intervals
-RECURRING_INTERVALS = {
-    "daily": timedelta(days=1),
-    "weekly": timedelta(weeks=1),
-    "monthly": timedelta(days=30),  # approx.
-}
-
+# Reminders this process already handled, so each is claimed in storage only once.
+# The claim itself is what prevents duplicates across restarts and processes.
 seen_reminders = set() 
 
 
+def send_due_reminders(now=None):
+    now = now or datetime.now()
+    upcoming = now + timedelta(hours=1)
+    events = get_all_event_objects()
+
+    for event in events:
+        start_time = event.start_dt
+        recurrence = event.recurrence
+
+        # Skip past non-recurring events
+        if recurrence is None and start_time < now:
+            continue
+
+        # For recurring events, move to next valid future occurrence
+        if recurrence in RECURRING_INTERVALS:
+            while start_time < now:
+                start_time += RECURRING_INTERVALS[recurrence]
+
+        # Reminder check
+        if now <= start_time <= upcoming:
+            reminder_key = f"{event.id}_{start_time.isoformat()}"
+            if reminder_key in seen_reminders:
+                continue
+            # Claimed before sending: a failed send is lost rather than a reminder sent twice
+            claimed = claim_reminder(event.id, int(start_time.timestamp()))
+            seen_reminders.add(reminder_key)
+            if not claimed:
+                continue
+            print(f"🔔 Reminder: '{event.title}' is starting at {start_time.strftime('%Y-%m-%d %H:%M')}")
+
+            # ✅ Email support
+            if event.email:
+                subject = f"Reminder: {event.title} is starting soon"
+                body = (
+                    f"⏰ Event: {event.title}\n"
+                    f"📅 Time: {start_time.strftime('%Y-%m-%d %H:%M')}\n"
+                    f"📝 Description: {event.description}"
+                )
+                send_email(event.email, subject, body)
+
+
 def check_reminders():
     while True:
         try:
-            now = datetime.now()
-            upcoming = now + timedelta(hours=1)
-            events = get_all_events()
-
-            for event in events:
-                start_time = datetime.fromisoformat(event["start_time"])
-                recurrence = event.get("recurrence")
-
-                # Skip past non-recurring events
-                if recurrence is None and start_time < now:
-                    continue
-
-                # For recurring events, move to next valid future occurrence
-                if recurrence in RECURRING_INTERVALS:
-                    while start_time < now:
-                        start_time += RECURRING_INTERVALS[recurrence]
-
-                # Reminder check
-                if now <= start_time <= upcoming:
-                    reminder_key = f"{event['id']}_{start_time.isoformat()}"
-                    if reminder_key not in seen_reminders:
-                        print(f"🔔 Reminder: '{event['title']}' is starting at {start_time.strftime('%Y-%m-%d %H:%M')}")
-                        seen_reminders.add(reminder_key)
-
-                        # ✅ Email support
-                        if event.get("email"):
-                            subject = f"Reminder: {event['title']} is starting soon"
-                            body = (
-                                f"⏰ Event: {event['title']}\n"
-                                f"📅 Time: {start_time.strftime('%Y-%m-%d %H:%M')}\n"
-                                f"📝 Description: {event['description']}"
-                            )
-                            send_email(event["email"], subject, body)
-
+            send_due_reminders()
         except Exception as e:
             print("⚠️ Reminder check error:", e)
 
@@ -60,3 +69,33 @@ def check_reminders():
 def start_reminder_thread():
     reminder_thread = threading.Thread(target=check_reminders, daemon=True)
     reminder_thread.start()
+
+
+def acquire_reminder_lock(lock_path=REMINDER_LOCK_FILE):
+    """Try to take the reminder leader lock; return the open lock file or None"""
+    lock_file = open(lock_path, "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def run_reminder_leader(lock_path=REMINDER_LOCK_FILE):
+    # Non-blocking retries so a waiting process never parks a worker on flock;
+    # if the leader dies the kernel drops its lock and another process takes over.
+    while True:
+        lock_file = acquire_reminder_lock(lock_path)
+        if lock_file is not None:
+            print(f"🔔 Reminder leader elected (pid {os.getpid()})")
+            start_compaction_thread()  # singleton housekeeping rides on the same lock
+            start_snapshot_thread()
+            check_reminders()  # never returns; keeps lock_file (and the lock) alive
+        time.sleep(REMINDER_LOCK_RETRY_SECONDS)
+
+
+def start_reminder_leader_thread(lock_path=REMINDER_LOCK_FILE):
+    """Run the reminder loop in whichever process holds the leader lock"""
+    leader_thread = threading.Thread(target=run_reminder_leader, args=(lock_path,), daemon=True)
+    leader_thread.start()
@@ -0,0 +1,29 @@
+"""Periodic snapshot of the event index, used for a warm start.
+
+The reminder leader rewrites it every SNAPSHOT_INTERVAL_SECONDS; it can also
+be written by hand from the project root:  python -m app.tasks.write_snapshot
+"""
+import threading
+import time
+
+from app.config import SNAPSHOT_INTERVAL_SECONDS
+from app.services.event_service import save_snapshot
+
+
+def run_snapshot_loop(interval=SNAPSHOT_INTERVAL_SECONDS):
+    while True:
+        time.sleep(interval)
+        try:
+            save_snapshot()
+        except Exception as e:
+            print("⚠️ Snapshot error:", e)
+
+
+def start_snapshot_thread(interval=SNAPSHOT_INTERVAL_SECONDS):
+    snapshot_thread = threading.Thread(target=run_snapshot_loop, args=(interval,), daemon=True)
+    snapshot_thread.start()
+
+
+if __name__ == "__main__":
+    if not save_snapshot():
+        print("⚠️ No change token available; snapshot not written")
@@ -0,0 +1,123 @@
+import itertools
+import threading
+from collections import deque
+from typing import Dict, Iterator, Optional
+
+from app.utils.metrics import Counters
+
+# Sent in place of a subscriber's backlog when it overflowed its buffer
+RESYNC = "resync"
+
+
+class SubscriberLimitReached(Exception):
+    """The broadcaster already has its maximum number of subscribers"""
+
+
+class Subscription:
+    """One subscriber's bounded buffer of pending messages"""
+
+    __slots__ = ("_buffer", "_ready", "_closed", "overflowed")
+
+    def __init__(self, buffer_size: int):
+        self._buffer = deque(maxlen=buffer_size)
+        self._ready = threading.Event()
+        self._closed = False
+        self.overflowed = False
+
+    def push(self, message) -> bool:
+        """Queue ``message``; returns False if the buffer was full"""
+        full = len(self._buffer) == self._buffer.maxlen
+        if full:
+            # The client is too slow to keep up: drop the backlog and ask it to resync
+            self._buffer.clear()
+            self.overflowed = True
+        else:
+            self._buffer.append(message)
+        self._ready.set()
+        return not full
+
+    def get(self, timeout: float) -> Optional[list]:
+        """Drain pending messages, waiting up to ``timeout``; None on timeout"""
+        if not self._ready.wait(timeout):
+            return None
+        self._ready.clear()
+        if self.overflowed:
+            self.overflowed = False
+            self._buffer.clear()
+            return [(RESYNC, {})]
+        messages = []
+        while self._buffer:
+            messages.append(self._buffer.popleft())
+        return messages
+
+    def close(self):
+        self._closed = True
+        self._ready.set()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+class Broadcaster:
+    """In-process fan-out of messages to many subscribers.
+
+    Publishing appends to each subscriber's bounded deque and sets its
+    event; nothing blocks on a slow reader. A subscriber that falls a whole
+    buffer behind gets a single ``resync`` message instead of its backlog.
+    Waiting is done on ``threading.Event``, so under gevent workers an idle
+    subscriber costs a parked greenlet rather than an OS thread.
+    """
+
+    def __init__(self, buffer_size: int = 100, max_subscribers: int = 10000):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._ids = itertools.count(1)
+        self.stats = Counters("published", "delivered", "overflows")
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.buffer_size)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                raise SubscriberLimitReached(f"At most {self.max_subscribers} subscribers")
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.close()
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, kind: str, data: Dict):
+        """Send ``(kind, data)`` to every subscriber"""
+        message = (kind, dict(data, seq=next(self._ids)))
+        with self._lock:
+            subscribers = list(self._subscribers)
+        overflows = sum(1 for subscription in subscribers if not subscription.push(message))
+        self.stats.add("published")
+        self.stats.add("delivered", len(subscribers) - overflows)
+        self.stats.add("overflows", overflows)
+
+    def listen(self, subscription: Subscription, heartbeat_seconds: float) -> Iterator[Optional[tuple]]:
+        """Yield messages as they arrive, and None every ``heartbeat_seconds`` of silence"""
+        try:
+            while not subscription.closed:
+                messages = subscription.get(heartbeat_seconds)
+                if messages is None:
+                    yield None
+                    continue
+                yield from messages
+        finally:
+            self.unsubscribe(subscription)
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            subscribers = len(self._subscribers)
+        return dict(self.stats.snapshot(), subscribers=subscribers)
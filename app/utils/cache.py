@@ -0,0 +1,55 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.utils.metrics import Counters
+
+
+class GenerationLRU:
+    """Bounded LRU map whose entries are only valid for the generation they were stored under.
+
+    A lookup with a different generation is a miss (counted as ``stale``)
+    and drops the entry, so bumping the generation invalidates everything
+    at once without touching the cache. A capacity of 0 disables caching.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.stats = Counters("hits", "misses", "stale", "evictions")
+
+    def get(self, key: Hashable, generation: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                self._entries.move_to_end(key)
+                self.stats.add("hits")
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self.stats.add("stale")
+        self.stats.add("misses")
+        return None
+
+    def put(self, key: Hashable, generation: Any, value: Any):
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.stats.add("evictions")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        stats = self.stats.snapshot()
+        lookups = stats["hits"] + stats["misses"]
+        with self._lock:
+            size = len(self._entries)
+        return dict(stats, size=size, capacity=self.capacity,
+                    hit_rate=round(stats["hits"] / lookups, 4) if lookups else 0.0)
@@ -0,0 +1,115 @@
+import zlib
+
+from flask import request
+
+from app.config import COMPRESSION_LEVEL, COMPRESSION_MIN_SIZE
+from app.utils.metrics import Counters, register_metrics
+
+# Content-Encoding -> zlib wbits (gzip container vs zlib-wrapped "deflate")
+ENCODINGS = {
+    "gzip": 16 + zlib.MAX_WBITS,
+    "deflate": zlib.MAX_WBITS,
+}
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/x-ndjson"}
+
+stats = Counters("responses_compressed", "bytes_in", "bytes_out")
+
+
+def compression_metrics():
+    values = stats.snapshot()
+    values["bytes_saved"] = values["bytes_in"] - values["bytes_out"]
+    return values
+
+
+register_metrics("compression", compression_metrics)
+
+
+def negotiate_encoding():
+    """Best supported encoding from Accept-Encoding (honours q=0), or None"""
+    return request.accept_encodings.best_match(list(ENCODINGS))
+
+
+def is_compressible(response) -> bool:
+    if response.status_code < 200 or response.status_code in (204, 304):
+        return False
+    if response.direct_passthrough or "Content-Encoding" in response.headers:
+        return False
+    mimetype = response.mimetype or ""
+    if mimetype == "text/event-stream":
+        # Small, latency-sensitive messages; flushing each one erases any gain
+        return False
+    return mimetype in COMPRESSIBLE_MIMETYPES or mimetype.startswith("text/")
+
+
+def _compressor(encoding, level):
+    return zlib.compressobj(level, zlib.DEFLATED, ENCODINGS[encoding])
+
+
+def _compress_stream(chunks, encoding, level):
+    """Compress a streamed body chunk by chunk.
+
+    Each chunk is sync-flushed so the client can decode it as soon as it
+    arrives; streaming keeps its low time-to-first-byte.
+    """
+    compressor = _compressor(encoding, level)
+    for chunk in chunks:
+        if not chunk:
+            continue
+        out = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        stats.add("bytes_in", len(chunk))
+        stats.add("bytes_out", len(out))
+        yield out
+    tail = compressor.flush()
+    stats.add("bytes_out", len(tail))
+    yield tail
+
+
+def _tag_representation(response, encoding):
+    # A compressed body is a different representation, so its strong ETag
+    # must differ too; etag.not_modified() accepts these suffixed forms.
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+
+
+def compress_response(response, min_size=COMPRESSION_MIN_SIZE, level=COMPRESSION_LEVEL):
+    """after_request hook: gzip/deflate the body when the client accepts it"""
+    response.vary.add("Accept-Encoding")
+    if not is_compressible(response):
+        return response
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.iter_encoded(), encoding, level)
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        compressor = _compressor(encoding, level)
+        compressed = compressor.compress(body) + compressor.flush()
+        response.set_data(compressed)
+        stats.add("bytes_in", len(body))
+        stats.add("bytes_out", len(compressed))
+
+    stats.add("responses_compressed")
+    response.headers["Content-Encoding"] = encoding
+    _tag_representation(response, encoding)
+    return response
+
+
+def init_compression(app):
+    """Install response compression, configurable via COMPRESSION_MIN_SIZE / COMPRESSION_LEVEL"""
+    app.config.setdefault("COMPRESSION_MIN_SIZE", COMPRESSION_MIN_SIZE)
+    app.config.setdefault("COMPRESSION_LEVEL", COMPRESSION_LEVEL)
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(
+            response,
+            min_size=app.config["COMPRESSION_MIN_SIZE"],
+            level=app.config["COMPRESSION_LEVEL"],
+        )
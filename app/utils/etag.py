@@ -0,0 +1,47 @@
+import hashlib
+
+from flask import Response, jsonify, request
+
+
+def make_etag(*parts) -> str:
+    """Short strong validator from the given parts"""
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def item_etag(event) -> str:
+    """Validator for a single event, derived from its updated_at"""
+    version = event.get("updated_at")
+    if version is None:
+        # Legacy items without updated_at fall back to hashing the body
+        version = sorted((key, str(value)) for key, value in event.items())
+    return make_etag(event.get("id"), version)
+
+
+# Suffixes added by response compression to tag the encoded representation
+CODING_SUFFIXES = ("", "-gzip", "-deflate")
+
+
+def not_modified(etag: str):
+    """A bodyless 304 if the request already holds ``etag``, else None"""
+    for suffix in CODING_SUFFIXES:
+        if request.if_none_match.contains(etag + suffix):
+            response = Response(status=304)
+            response.set_etag(etag + suffix)
+            return response
+    return None
+
+
+def json_with_etag(payload, etag: str, status: int = 200):
+    """jsonify ``payload`` with a strong ETag, or 304 if the client is current"""
+    response = not_modified(etag)
+    if response is None:
+        response = jsonify(payload)
+        response.status_code = status
+        response.set_etag(etag)
+    # Clients may store the body but must revalidate before reuse
+    response.headers["Cache-Control"] = "no-cache"
+    return response
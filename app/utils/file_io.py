@@ -1,7 +1,47 @@
+import fcntl
 import json
 import os
+from contextlib import contextmanager
 from app.models.event_model import Event
 from app.config import EVENT_FILE_PATH
+from app.utils.json_provider import json_default
+
+
+@contextmanager
+def locked(path, exclusive=True):
+    """Hold an flock on ``path + '.lock'``; it serializes writers across processes and threads"""
+    with open(path + ".lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def fsync_directory(path):
+    """Make a rename in ``path``'s directory durable"""
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path, data, **dump_kwargs):
+    """Replace ``path`` with ``data`` as JSON; readers see the old or the new file, never a mix"""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w") as f:
+            json.dump(data, f, default=json_default, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    fsync_directory(path)
+
 
 def load_events():
     if not os.path.exists(EVENT_FILE_PATH):
@@ -15,5 +55,5 @@ def load_events():
             return []
 
 def save_events(events):
-    with open(EVENT_FILE_PATH, "w") as f:
-        json.dump([event.to_dict() for event in events], f, indent=4)
+    with locked(EVENT_FILE_PATH):
+        atomic_write_json(EVENT_FILE_PATH, [event.to_dict() for event in events], indent=4)
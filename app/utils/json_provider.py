@@ -0,0 +1,45 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib encoder is used without it
+    orjson = None
+
+
+def json_default(obj):
+    """Encode the non-JSON types DynamoDB and the models hand us"""
+    if isinstance(obj, Decimal):
+        # DynamoDB returns every number as Decimal
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class EventJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that understands Decimal/datetime/set and uses orjson when installed"""
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS
+            if kwargs.get("sort_keys", self.sort_keys):
+                option |= orjson.OPT_SORT_KEYS
+            if kwargs.get("indent"):
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=json_default, option=option).decode()
+
+        kwargs.setdefault("default", json_default)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
@@ -0,0 +1,30 @@
+import threading
+from typing import Callable, Dict
+
+# Named metric providers, each returning a dict of current values
+_providers: Dict[str, Callable[[], Dict]] = {}
+
+
+def register_metrics(name: str, provider: Callable[[], Dict]):
+    """Expose ``provider()`` under ``name`` in GET /api/metrics"""
+    _providers[name] = provider
+
+
+def collect_metrics() -> Dict[str, Dict]:
+    return {name: provider() for name, provider in _providers.items()}
+
+
+class Counters:
+    """Thread-safe named integer counters"""
+
+    def __init__(self, *names: str):
+        self._lock = threading.Lock()
+        self._values = dict.fromkeys(names, 0)
+
+    def add(self, name: str, amount: int = 1):
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._values)
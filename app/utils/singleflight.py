@@ -0,0 +1,66 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, List
+
+from app.utils.metrics import Counters
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def share_items(items: List[Dict]) -> List[Dict]:
+    """Copy of a list of items for one caller, so callers can modify what they get"""
+    return [dict(item) for item in items]
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it. Every caller, the leader included, receives
+    ``share(result)`` or the exception, so the original result is never
+    handed out and stays safe to copy while others modify theirs. Nothing
+    is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.stats = Counters("calls", "executions", "collapsed")
+
+    def do(self, key: Hashable, fn: Callable[[], Any], share: Callable[[Any], Any] = lambda result: result) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        self.stats.add("calls")
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+                self.stats.add("executions")
+            return share(call.result)
+
+        call.done.wait()
+        self.stats.add("collapsed")
+        if call.error is not None:
+            raise call.error
+        return share(call.result)
+
+    def metrics(self) -> Dict[str, int]:
+        with self._lock:
+            in_flight = len(self._calls)
+        return dict(self.stats.snapshot(), in_flight=in_flight)
@@ -0,0 +1,75 @@
+import json
+from itertools import chain
+
+from flask import Response, current_app, stream_with_context
+
+STREAM_FORMATS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def iter_json_array(pages, dumps):
+    """Encode pages of items as one JSON array, a page per chunk"""
+    yield "["
+    first = True
+    for page in pages:
+        if not page:
+            continue
+        chunk = ",".join(dumps(item) for item in page)
+        yield chunk if first else "," + chunk
+        first = False
+    yield "]"
+
+
+def iter_ndjson(pages, dumps):
+    """Encode pages of items as newline-delimited JSON, a page per chunk"""
+    for page in pages:
+        if page:
+            yield "".join(dumps(item) + "\n" for item in page)
+
+
+def stream_pages(pages, fmt):
+    """Stream pages of items without holding the full result in memory.
+
+    The first byte goes out as soon as the first page is encoded; only one
+    page is alive at a time.
+    """
+    # Fetch the first page eagerly so storage errors still become a 500
+    # instead of a truncated 200 body.
+    pages = iter(pages)
+    first_page = next(pages, [])
+    pages = chain([first_page], pages)
+
+    dumps = current_app.json.dumps
+    encoder = iter_ndjson if fmt == "ndjson" else iter_json_array
+    return Response(stream_with_context(encoder(pages, dumps)), mimetype=STREAM_FORMATS[fmt])
+
+
+def format_sse(kind, data, dumps=json.dumps, event_id=None):
+    """One Server-Sent Events message"""
+    lines = [f"event: {kind}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def iter_sse(messages, dumps, retry_ms=5000):
+    """Encode ``(kind, data)`` messages as an event stream; None becomes a keep-alive comment"""
+    yield f"retry: {retry_ms}\n\n"
+    for message in messages:
+        if message is None:
+            yield ": keep-alive\n\n"
+            continue
+        kind, data = message
+        yield format_sse(kind, data, dumps, data.get("seq"))
+
+
+def sse_response(messages):
+    """Stream messages as text/event-stream, unbuffered by proxies"""
+    response = Response(stream_with_context(iter_sse(messages, current_app.json.dumps)),
+                        mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
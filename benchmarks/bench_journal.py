@@ -0,0 +1,115 @@
+"""Micro-benchmark: writes per second, whole-file JSON rewrite vs the file-backed stores.
+
+Starts from an existing set of events and times single-event updates through
+file_io.save_events (rewrites events.json every time), FileService (queues the
+write for a batched rewrite) and JournalService (appends one line), with and
+without fsync, plus concurrent journal writers sharing fsyncs.
+Run from the project root:  python benchmarks/bench_journal.py
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.event_model import Event
+from app.services.file_service import FileService
+from app.services.journal_service import JournalService
+from app.utils import file_io
+
+EVENT_COUNT = 2_000
+WRITES = 200
+THREADS = 8
+
+
+def make_event(i):
+    return Event(
+        title=f"Event {i}",
+        description="Quarterly planning session with the whole team",
+        start_time="2025-07-01T10:00:00",
+        end_time="2025-07-01T11:00:00",
+        recurrence="weekly" if i % 3 == 0 else None,
+        email=f"user{i}@example.com" if i % 2 == 0 else None,
+    )
+
+
+def report(name, writes, seconds, baseline=None):
+    rate = writes / seconds
+    speedup = f"{rate / baseline:8.1f}x" if baseline else ""
+    print(f"{name:<36} {rate:10.0f} writes/s {speedup}")
+    return rate
+
+
+def bench_save_events(directory, events):
+    file_io.EVENT_FILE_PATH = os.path.join(directory, "events.json")
+    file_io.save_events(events)
+    started = time.perf_counter()
+    for i in range(WRITES):
+        events[i].title = f"Updated {i}"
+        file_io.save_events(events)
+    return time.perf_counter() - started
+
+
+def bench_file_service(path, events):
+    store = FileService(path, flush_seconds=0.5)
+    store.batch_write([dict(event.to_dict(), created_at="t", updated_at="t") for event in events])
+    store.flush()
+    started = time.perf_counter()
+    for i in range(WRITES):
+        store.update_event(events[i].id, {"title": f"Updated {i}"})
+    store.flush()  # include getting everything onto disk
+    return time.perf_counter() - started
+
+
+def load_journal(path, events, sync):
+    store = JournalService(path, sync=sync, compact_min_records=10 ** 9)
+    store.batch_write([dict(event.to_dict(), created_at="t", updated_at="t") for event in events])
+    return store
+
+
+def bench_journal(path, events, sync):
+    store = load_journal(path, events, sync)
+    started = time.perf_counter()
+    for i in range(WRITES):
+        store.update_event(events[i].id, {"title": f"Updated {i}"})
+    return time.perf_counter() - started
+
+
+def bench_journal_concurrent(path, events):
+    store = load_journal(path, events, sync=True)
+    per_thread = WRITES // THREADS
+
+    def writer(offset):
+        for i in range(offset, offset + per_thread):
+            store.update_event(events[i].id, {"title": f"Updated {i}"})
+
+    threads = [threading.Thread(target=writer, args=(n * per_thread,)) for n in range(THREADS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+    return seconds, per_thread * THREADS, store.metrics()["fsyncs"]
+
+
+def main():
+    events = [make_event(i) for i in range(EVENT_COUNT)]
+    print(f"{WRITES} updates against {EVENT_COUNT} stored events")
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = report("file_io.save_events", WRITES, bench_save_events(directory, events))
+        report("FileService (batched flush)", WRITES,
+               bench_file_service(os.path.join(directory, "store.json"), events), baseline)
+        report("JournalService (no fsync)", WRITES,
+               bench_journal(os.path.join(directory, "nosync.jsonl"), events, sync=False), baseline)
+        report("JournalService (fsync per write)", WRITES,
+               bench_journal(os.path.join(directory, "sync.jsonl"), events, sync=True), baseline)
+        seconds, writes, fsyncs = bench_journal_concurrent(os.path.join(directory, "group.jsonl"), events)
+        report(f"JournalService ({THREADS} threads, fsync)", writes, seconds, baseline)
+        print(f"{'  fsyncs for those writes':<36} {fsyncs:10d}")
+
+
+if __name__ == "__main__":
+    main()
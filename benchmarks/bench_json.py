@@ -0,0 +1,69 @@
+"""Micro-benchmark: serializing a 10k-event DynamoDB payload.
+
+Compares Flask's default JSON provider with EventJSONProvider.
+Run from the project root:  python benchmarks/bench_json.py
+"""
+import os
+import sys
+import timeit
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.utils import json_provider
+from app.utils.json_provider import EventJSONProvider
+
+EVENT_COUNT = 10_000
+ROUNDS = 10
+
+
+def make_payload(count=EVENT_COUNT):
+    """Items shaped like DynamoDB scan output (numbers come back as Decimal)"""
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "title": f"Event {i}",
+            "description": "Quarterly planning session with the whole team " * 3,
+            "start_time": "2025-07-01T10:00:00",
+            "end_time": "2025-07-01T11:00:00",
+            "start_epoch": Decimal(1751364000 + i * 60),
+            "end_epoch": Decimal(1751367600 + i * 60),
+            "recurrence": "weekly" if i % 3 == 0 else None,
+            "email": f"user{i}@example.com" if i % 2 == 0 else None,
+            "created_at": "2025-06-01T09:00:00.000000",
+            "updated_at": "2025-06-01T09:00:00.000000",
+        }
+        for i in range(count)
+    ]
+
+
+def bench(name, provider, payload):
+    # Same arguments Flask passes when building a response body
+    seconds = min(timeit.repeat(lambda: provider.dumps(payload, separators=(",", ":")), number=1, repeat=ROUNDS))
+    print(f"{name:<32} {seconds * 1000:8.1f} ms")
+    return seconds
+
+
+def main():
+    app = Flask(__name__)
+    payload = make_payload()
+    print(f"Serializing {EVENT_COUNT} events (best of {ROUNDS})")
+
+    baseline = bench("Flask DefaultJSONProvider", DefaultJSONProvider(app), payload)
+
+    orjson = json_provider.orjson
+    json_provider.orjson = None
+    # Slower than the default: it emits real numbers for Decimals instead of strings
+    bench("EventJSONProvider (stdlib)", EventJSONProvider(app), payload)
+    json_provider.orjson = orjson
+
+    if orjson is not None:
+        fast = bench("EventJSONProvider (orjson)", EventJSONProvider(app), payload)
+        print(f"{'orjson speedup vs default':<32} {baseline / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Gunicorn settings for the production API server.
+
+Run with:  gunicorn -c gunicorn.conf.py
+"""
+import multiprocessing
+import os
+
+wsgi_app = "run:app"
+bind = os.getenv("BIND", "0.0.0.0:5000")
+
+# Prefork workers. gevent is the default because every open SSE stream
+# (/api/events/stream) holds its connection for as long as the client stays:
+# under gevent that is a parked greenlet, under gthread a whole thread.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+if worker_class == "gevent":
+    # Patch here, before preload_app imports socket/ssl via boto3
+    from gevent import monkey
+    monkey.patch_all()
+    # Headroom above SSE_MAX_SUBSCRIBERS (default 1000) for ordinary requests
+    worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 2000))
+else:
+    threads = int(os.getenv("GUNICORN_THREADS", 4))
+    if worker_class == "gthread":
+        # Streams may take at most half the threads, so they can never starve
+        # ordinary requests. Read by app.config when preload_app imports it.
+        os.environ.setdefault("SSE_MAX_SUBSCRIBERS", str(threads // 2))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+
+# Import the app once in the master so workers fork with it already loaded
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    from app.services.event_service import db_service
+    from app.tasks.reminder_task import start_reminder_leader_thread
+
+    db_service.reconnect()
+    # Every worker competes for the lock file; exactly one runs reminders
+    start_reminder_leader_thread()
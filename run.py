@@ -1,5 +1,7 @@
 from app import create_app
+from app.tasks.compact_changes import start_compaction_thread
 from app.tasks.reminder_task import start_reminder_thread
+from app.tasks.write_snapshot import start_snapshot_thread
 import os
 
 app = create_app()
@@ -8,5 +10,7 @@ if __name__ == "__main__":
     # NOTE: # Prevent the thread from running twice due to Flask reloader
     if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
         start_reminder_thread()
+        start_compaction_thread()
+        start_snapshot_thread()
 
     app.run(debug=True)
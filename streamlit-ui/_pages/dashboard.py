@@ -10,6 +10,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.api_client import EventAPIClient
 
+# Only the attributes each widget draws are requested from the API
+TIMELINE_FIELDS = ["title", "start_time", "end_time", "recurrence"]
+CARD_FIELDS = ["title", "description", "start_time", "end_time", "recurrence", "email"]
+
 def format_datetime(dt_str):
     """Format datetime string for display"""
     try:
@@ -112,21 +116,20 @@ body { overflow-x: hidden; }
         return
     
     try:
-        # Get all events
-        all_events = api_client.get_all_events()
+        # Statistics are aggregated on the server in one small response
+        stats = api_client.get_event_stats()
         
-        if not all_events:
+        if not stats['total']:
             st.info("No events found. Create your first event to see the dashboard!")
             return
         
-        # Calculate statistics
-        total_events = len(all_events)
-        upcoming_events = len([e for e in all_events if get_event_status(e) == "upcoming"])
-        ongoing_events = len([e for e in all_events if get_event_status(e) == "ongoing"])
-        past_events = len([e for e in all_events if get_event_status(e) == "past"])
+        total_events = stats['total']
+        upcoming_events = stats['upcoming']
+        ongoing_events = stats['ongoing']
+        past_events = stats['past']
         
-        recurring_events = len([e for e in all_events if e.get('recurrence')])
-        events_with_email = len([e for e in all_events if e.get('email')])
+        recurring_events = stats['recurring']
+        events_with_email = stats['with_email']
         
         # Display key metrics
         st.markdown("""
@@ -189,23 +192,19 @@ body { overflow-x: hidden; }
 </div>
         """, unsafe_allow_html=True)
         
-        # Filter events for next 30 days
+        # Events in the next 30 days, range-filtered and sorted on the server
         now = datetime.now()
         future_date = now + timedelta(days=30)
         
-        timeline_events = []
-        for event in all_events:
-            try:
-                start_time = datetime.fromisoformat(event['start_time'])
-                if start_time >= now and start_time <= future_date:
-                    timeline_events.append({
-                        'title': event['title'],
-                        'start_time': start_time,
-                        'status': get_event_status(event),
-                        'recurrence': event.get('recurrence', 'None')
-                    })
-            except:
-                continue
+        timeline_events = [
+            {
+                'title': event['title'],
+                'start_time': datetime.fromisoformat(event['start_time']),
+                'status': get_event_status(event),
+                'recurrence': event.get('recurrence', 'None')
+            }
+            for event in api_client.get_events_in_range(now, future_date, fields=TIMELINE_FIELDS)
+        ]
         
         if timeline_events:
             # Sort by start time
@@ -259,15 +258,8 @@ body { overflow-x: hidden; }
 </div>
         """, unsafe_allow_html=True)
         
-        upcoming_list = []
-        for event in all_events:
-            status = get_event_status(event)
-            if status == "upcoming":
-                upcoming_list.append(event)
-        
-        # Sort by start time and take top 5
-        upcoming_list.sort(key=lambda x: x['start_time'])
-        upcoming_list = upcoming_list[:5]
+        # Next 5 upcoming events, selected and sorted on the server
+        upcoming_list = api_client.get_next_upcoming_events(5, fields=CARD_FIELDS)
         
         if upcoming_list:
             # --- Modern Carded Table UI for Events ---
@@ -392,7 +384,7 @@ body[data-theme="dark"] .event-card-row {
         """, unsafe_allow_html=True)
         
         recent_events = []
-        for event in all_events:
+        for event in api_client.get_events_in_range(end=datetime.now(), fields=CARD_FIELDS):
             status = get_event_status(event)
             if status == "past":
                 recent_events.append(event)
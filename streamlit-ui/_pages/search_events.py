@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 import sys
 import os
 
@@ -108,10 +108,25 @@ body { overflow-x: hidden; }
             placeholder="Enter keywords to search in title or description..."
         )
         
+        # Autocomplete on the last word typed
+        words = search_query.split()
+        if words and not search_query.endswith(" "):
+            try:
+                suggestions = api_client.suggest_titles(words[-1], limit=8)
+                if suggestions:
+                    st.caption("Suggestions: " + " · ".join(s["text"] for s in suggestions))
+            except Exception:
+                pass  # suggestions are a convenience; searching still works
+        
+        ranked = st.checkbox("Best matches first", help="Rank by relevance and show the top 50 only")
+        
         if st.button("Search", type="primary"):
             if search_query.strip():
                 try:
-                    results = api_client.search_events(search_query)
+                    if ranked:
+                        results = api_client.search_events(search_query, rank="bm25", limit=50)
+                    else:
+                        results = api_client.search_events(search_query)
                     display_search_results(results, search_query)
                 except Exception as e:
                     st.error(f"Search failed: {str(e)}")
@@ -166,27 +181,25 @@ body { overflow-x: hidden; }
         
         if st.button("Advanced Search", type="primary"):
             try:
-                # Get all events first
-                all_events = api_client.get_all_events()
+                # Status, recurrence, email and date filters are applied by the server
+                candidates = api_client.list_events(
+                    status=None if status_filter == "All" else status_filter.lower(),
+                    recurrence=None if recurrence_filter == "All" else recurrence_filter,
+                    has_email=None if email_filter == "All" else email_filter == "With Email",
+                    start=datetime.combine(start_date, time.min),
+                    end=datetime.combine(end_date, time.max),
+                )
                 
-                # Apply filters
+                # Text and time-of-day filters stay local
                 filtered_events = []
                 
-                for event in all_events:
+                for event in candidates:
                     # Text search
                     if title_search and title_search.lower() not in event['title'].lower():
                         continue
                     if description_search and description_search.lower() not in event['description'].lower():
                         continue
                     
-                    # Date range filter
-                    try:
-                        event_date = datetime.fromisoformat(event['start_time']).date()
-                        if event_date < start_date or event_date > end_date:
-                            continue
-                    except:
-                        continue
-                    
                     # Time range filter
                     try:
                         event_time = datetime.fromisoformat(event['start_time']).time()
@@ -195,30 +208,6 @@ body { overflow-x: hidden; }
                     except:
                         continue
                     
-                    # Status filter
-                    status = get_event_status(event)
-                    if status_filter != "All":
-                        if status_filter == "Upcoming" and "🟢" not in status:
-                            continue
-                        elif status_filter == "Ongoing" and "🟡" not in status:
-                            continue
-                        elif status_filter == "Past" and "🔴" not in status:
-                            continue
-                    
-                    # Recurrence filter
-                    if recurrence_filter != "All":
-                        event_recurrence = event.get('recurrence') or "None"
-                        if event_recurrence != recurrence_filter:
-                            continue
-                    
-                    # Email filter
-                    if email_filter != "All":
-                        has_email = bool(event.get('email'))
-                        if email_filter == "With Email" and not has_email:
-                            continue
-                        elif email_filter == "Without Email" and has_email:
-                            continue
-                    
                     filtered_events.append(event)
                 
                 display_search_results(filtered_events, "Advanced Search Results")
@@ -259,7 +248,11 @@ def display_search_results(results, search_query):
     # Sort options
     col1, col2 = st.columns([1, 3])
     with col1:
-        sort_by = st.selectbox("Sort by:", ["Start Time", "Title", "Status"])
+        # Ranked results arrive best first; offer to keep that order
+        options = ["Start Time", "Title", "Status"]
+        if "score" in results[0]:
+            options.insert(0, "Relevance")
+        sort_by = st.selectbox("Sort by:", options)
     
     # Sort results
     if sort_by == "Start Time":
@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 import sys
 import os
 import re
@@ -32,6 +32,32 @@ def get_event_status(event):
     except:
         return "❓ Unknown"
 
+# View sort options the list endpoint can apply server-side
+SERVER_SORT_FIELDS = {"Start Time": "start_time", "Title": "title"}
+
+def matches_filters(event, status_filter, start_date, end_date, recurrence_filter):
+    """Apply the sidebar filters to a single event"""
+    # Status filter
+    status = get_event_status(event)
+    if status_filter != "All" and status_filter not in status:
+        return False
+    
+    # Date range filter
+    try:
+        event_date = datetime.fromisoformat(event['start_time']).date()
+        if event_date < start_date or event_date > end_date:
+            return False
+    except:
+        return False
+    
+    # Recurrence filter
+    if recurrence_filter != "All":
+        event_recurrence = event.get('recurrence') or "None"
+        if event_recurrence != recurrence_filter:
+            return False
+    
+    return True
+
 def view_events_page():
     st.markdown("""
 <style>
@@ -127,44 +153,27 @@ body { overflow-x: hidden; }
     search_query = st.sidebar.text_input("🔍 Search Events", placeholder="Search by title or description", key='search_query')
     
     try:
-        # Get events based on search
         if search_query:
+            # Search results are filtered locally
             events = api_client.search_events(search_query)
-        else:
-            events = api_client.get_all_events()
-        
-        if not events:
-            st.info("No events found. Create your first event!")
-            return
-        
-        # Apply filters
-        filtered_events = []
-        for event in events:
-            # Status filter
-            status = get_event_status(event)
-            if status_filter != "All":
-                if status_filter == "Upcoming" and "Upcoming" not in status:
-                    continue
-                elif status_filter == "Ongoing" and "Ongoing" not in status:
-                    continue
-                elif status_filter == "Past" and "Past" not in status:
-                    continue
-            
-            # Date range filter
-            try:
-                event_date = datetime.fromisoformat(event['start_time']).date()
-                if event_date < start_date or event_date > end_date:
-                    continue
-            except:
-                continue
             
-            # Recurrence filter
-            if recurrence_filter != "All":
-                event_recurrence = event.get('recurrence') or "None"
-                if event_recurrence != recurrence_filter:
-                    continue
+            if not events:
+                st.info("No events found. Create your first event!")
+                return
             
-            filtered_events.append(event)
+            filtered_events = [
+                event for event in events
+                if matches_filters(event, status_filter, start_date, end_date, recurrence_filter)
+            ]
+        else:
+            # Filtering and sorting happen on the server; only matching rows are sent
+            filtered_events = api_client.list_events(
+                status=None if status_filter == "All" else status_filter.lower(),
+                recurrence=None if recurrence_filter == "All" else recurrence_filter,
+                start=datetime.combine(start_date, time.min),
+                end=datetime.combine(end_date, time.max),
+                sort=SERVER_SORT_FIELDS.get(st.session_state.get('view_sort_by'), "start_time"),
+            )
         
         if not filtered_events:
             st.warning("No events match your current filters.")
@@ -182,15 +191,15 @@ body { overflow-x: hidden; }
             # Sort options
             col1, col2 = st.columns([1, 3])
             with col1:
-                sort_by = st.selectbox("Sort by", ["Start Time", "Title", "Status"])
+                sort_by = st.selectbox("Sort by", ["Start Time", "Title", "Status"], key='view_sort_by')
             
-            # Sort events
-            if sort_by == "Start Time":
+            # Sort events (the server already sorted unsearched listings by start time / title)
+            if sort_by == "Status":
+                filtered_events.sort(key=lambda x: get_event_status(x))
+            elif search_query and sort_by == "Start Time":
                 filtered_events.sort(key=lambda x: x['start_time'])
-            elif sort_by == "Title":
+            elif search_query and sort_by == "Title":
                 filtered_events.sort(key=lambda x: x['title'].lower())
-            elif sort_by == "Status":
-                filtered_events.sort(key=lambda x: get_event_status(x))
             
             # Display events in a table
             for event in filtered_events:
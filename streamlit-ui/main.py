@@ -23,21 +23,6 @@ load_dotenv()  # take environment variables from .env
 API_DOCUMENTATION_URL = os.getenv("API_DOCUMENTATION_URL", "http://localhost:5000/apidocs")
 
 # --- Utility functions (move above usage) ---
-def is_upcoming(event):
-    try:
-        start = datetime.fromisoformat(event['start_time'])
-        return start > datetime.now()
-    except:
-        return False
-
-def is_today(event):
-    try:
-        start = datetime.fromisoformat(event['start_time'])
-        now = datetime.now()
-        return start.date() == now.date()
-    except:
-        return False
-
 def format_time(dt_str):
     try:
         return datetime.fromisoformat(dt_str).strftime("%I:%M %p")
@@ -293,7 +278,7 @@ if not st.session_state['api_status_checked']:
     # Try API connection (only once per rerun)
     try:
         api_client = EventAPIClient()
-        api_client.get_all_events()
+        api_client.get_event_stats()
         st.session_state['api_status'] = True
         st.session_state['api_status_text'] = '🟢 API Connected'
         st.session_state['api_status_color'] = '#43e97b'
@@ -398,17 +383,18 @@ page = st.session_state["nav_page"]
 if page == "Home":
     def home_page(api_status):
         # --- Fetch event data and stats for Home page ---
-        all_events = []
+        today_list = []
         total_events = 0
         upcoming_events = 0
         today_events = 0
         if api_status:
             try:
                 api_client = EventAPIClient()
-                all_events = api_client.get_all_events()
-                total_events = len(all_events)
-                upcoming_events = len([e for e in all_events if is_upcoming(e)])
-                today_events = len([e for e in all_events if is_today(e)])
+                stats = api_client.get_event_stats()
+                total_events = stats['total']
+                upcoming_events = stats['upcoming']
+                today_events = stats['today']
+                today_list = api_client.get_today_events()
             except Exception as e:
                 st.error(f"Failed to load statistics: {str(e)}")
         # --- Modern Welcome, Quick Overview, and Today's Events Cards ---
@@ -599,8 +585,6 @@ if page == "Home":
       }
     </style>
 """, unsafe_allow_html=True)
-        today_list = [e for e in all_events if is_today(e)]
-        today_list.sort(key=lambda x: x['start_time'])
         for event in today_list[:3]:
             st.markdown(f"""
 <div class='event-card'>
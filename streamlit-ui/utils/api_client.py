@@ -1,7 +1,29 @@
 import requests
 import json
-from datetime import datetime
-from typing import List, Dict, Optional
+from urllib.parse import urlencode
+from datetime import datetime, time, timedelta
+from typing import Iterator, List, Dict, Optional, Tuple
+
+# Validated GET bodies by URL: {url: (etag, body)}. Module level because
+# Streamlit builds a new client on every rerun.
+_etag_cache: Dict[str, tuple] = {}
+ETAG_CACHE_MAX_ENTRIES = 256
+
+# Local replicas kept current through /changes, by API base URL:
+# {api_base: {"token": str, "events": {id: event}}}
+_replicas: Dict[str, Dict] = {}
+
+
+class ChangeTokenExpired(Exception):
+    """The server no longer has changes back to our token; a full resync is needed"""
+
+def _copy_body(body):
+    """Shallow copy so callers sorting/mutating a result don't alter the cache"""
+    if isinstance(body, list):
+        return list(body)
+    if isinstance(body, dict):
+        return dict(body)
+    return body
 
 class EventAPIClient:
     """Client for communicating with the Event Scheduler Flask API"""
@@ -17,7 +39,12 @@ class EventAPIClient:
         
         try:
             if method.upper() == "GET":
+                cached = _etag_cache.get(url)
+                if cached:
+                    headers["If-None-Match"] = cached[0]
                 response = requests.get(url, headers=headers)
+                if response.status_code == 304 and cached:
+                    return _copy_body(cached[1])
             elif method.upper() == "POST":
                 response = requests.post(url, json=data, headers=headers)
             elif method.upper() == "PUT":
@@ -30,13 +57,22 @@ class EventAPIClient:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
             response.raise_for_status()
-            return response.json() if response.content else {}
+            body = response.json() if response.content else {}
+            
+            if method.upper() == "GET" and response.headers.get("ETag"):
+                if len(_etag_cache) >= ETAG_CACHE_MAX_ENTRIES:
+                    _etag_cache.pop(next(iter(_etag_cache)))
+                _etag_cache[url] = (response.headers["ETag"], body)
+                return _copy_body(body)
+            return body
             
         except requests.exceptions.ConnectionError:
             raise ConnectionError("Cannot connect to the API server. Make sure the Flask app is running.")
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 raise ValueError("Event not found")
+            elif e.response.status_code == 410:
+                raise ChangeTokenExpired(e.response.json().get('error', 'Change token expired'))
             elif e.response.status_code == 400:
                 error_data = e.response.json()
                 raise ValueError(error_data.get('error', 'Bad request'))
@@ -49,6 +85,26 @@ class EventAPIClient:
         """Get all events"""
         return self._make_request("GET", "/")
     
+    def list_events(self, status: Optional[str] = None, recurrence: Optional[str] = None,
+                    has_email: Optional[bool] = None, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None, sort: str = "start_time", order: str = "asc",
+                    fields: Optional[List[str]] = None) -> List[Dict]:
+        """Get events filtered and sorted by the server"""
+        params = {"sort": sort, "order": order}
+        if fields:
+            params["fields"] = ",".join(fields)
+        if status:
+            params["status"] = status
+        if recurrence:
+            params["recurrence"] = recurrence
+        if has_email is not None:
+            params["has_email"] = "true" if has_email else "false"
+        if start is not None:
+            params["from"] = start.isoformat()
+        if end is not None:
+            params["to"] = end.isoformat()
+        return self._make_request("GET", f"/?{urlencode(params)}")
+    
     def create_event(self, event_data: Dict) -> Dict:
         """Create a new event"""
         return self._make_request("POST", "/", event_data)
@@ -62,42 +118,125 @@ class EventAPIClient:
         """Delete an event"""
         return self._make_request("DELETE", f"/{event_id}")
     
-    def search_events(self, query: str) -> List[Dict]:
-        """Search events by title or description"""
-        return self._make_request("GET", f"/search?q={query}")
+    def get_free_busy(self, email: str, start: datetime, end: datetime) -> List[Dict]:
+        """Merged busy intervals (``start``/``end``) of ``email`` within [start, end)"""
+        params = {"email": email, "from": start.isoformat(), "to": end.isoformat()}
+        return self._make_request("GET", f"/freebusy?{urlencode(params)}")["busy"]
+    
+    def get_conflicts(self, email: Optional[str] = None) -> List[Dict]:
+        """Overlapping events sharing an email, now or within the server's horizon"""
+        params = {"email": email} if email else {}
+        return self._make_request("GET", f"/conflicts?{urlencode(params)}")
+    
+    def search_events(self, query: str, rank: Optional[str] = None, limit: int = 10) -> List[Dict]:
+        """Search events by title or description; with ``rank="bm25"`` only the best ``limit``, scored"""
+        if rank is None:
+            return self._make_request("GET", f"/search?q={query}")
+        return self._make_request("GET", f"/search?{urlencode({'q': query, 'rank': rank, 'limit': limit})}")
+    
+    def suggest_titles(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Titles and title words starting with ``prefix``, most used first"""
+        params = {"prefix": prefix, "limit": limit}
+        return self._make_request("GET", f"/suggest?{urlencode(params)}")["suggestions"]
+    
+    def get_event_stats(self) -> Dict:
+        """Get dashboard counts (total, upcoming, ongoing, past, today, recurring, with_email)"""
+        return self._make_request("GET", "/stats")
+    
+    def get_status_counts(self) -> Dict:
+        """Get total / upcoming / ongoing / past counts computed by the server"""
+        return self._make_request("GET", "/status-counts")
+    
+    def get_next_upcoming_events(self, limit: int = 10, fields: Optional[List[str]] = None) -> List[Dict]:
+        """Get the next N events that have not started yet"""
+        params = {"limit": limit}
+        if fields:
+            params["fields"] = ",".join(fields)
+        return self._make_request("GET", f"/upcoming?{urlencode(params)}")
+    
+    def get_events_in_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                            fields: Optional[List[str]] = None) -> List[Dict]:
+        """Get events starting within [start, end], sorted by start time (only ``fields`` if given)"""
+        params = {}
+        if fields:
+            params["fields"] = ",".join(fields)
+        if start is not None:
+            params["from"] = start.isoformat()
+        if end is not None:
+            params["to"] = end.isoformat()
+        return self._make_request("GET", f"/range?{urlencode(params)}")
     
     def get_upcoming_events(self, hours: int = 24) -> List[Dict]:
         """Get events happening in the next N hours"""
-        all_events = self.get_all_events()
         now = datetime.now()
-        upcoming = []
-        
-        for event in all_events:
-            try:
-                start_time = datetime.fromisoformat(event['start_time'])
-                if start_time >= now and start_time <= now.replace(hour=now.hour + hours):
-                    upcoming.append(event)
-            except (ValueError, TypeError):
-                continue
-        
-        return sorted(upcoming, key=lambda x: x['start_time'])
+        return self.get_events_in_range(now, now + timedelta(hours=hours))
     
     def get_today_events(self) -> List[Dict]:
         """Get events happening today"""
-        all_events = self.get_all_events()
-        today = datetime.now().date()
-        today_events = []
-        
-        for event in all_events:
-            try:
-                start_time = datetime.fromisoformat(event['start_time'])
-                if start_time.date() == today:
-                    today_events.append(event)
-            except (ValueError, TypeError):
-                continue
-        
-        return sorted(today_events, key=lambda x: x['start_time'])
+        today = datetime.combine(datetime.now().date(), time.min)
+        return self.get_events_in_range(today, today + timedelta(days=1) - timedelta(microseconds=1))
+    
+    def get_changes(self, since: Optional[str] = None, limit: int = 500) -> Dict:
+        """Get created/updated events and deleted ids since a change token"""
+        params = {"limit": limit}
+        if since is not None:
+            params["since"] = since
+        return self._make_request("GET", f"/changes?{urlencode(params)}")
+    
+    def _resync_replica(self) -> Dict:
+        # Take the token before listing: changes racing the listing are replayed next sync
+        token = self.get_changes()["next"]
+        replica = {"token": token, "events": {event["id"]: event for event in self.get_all_events()}}
+        _replicas[self.api_base] = replica
+        return replica
+    
+    def sync_replica(self) -> List[Dict]:
+        """Bring the local replica up to date through the change feed; returns its events by start time"""
+        replica = _replicas.get(self.api_base)
+        if replica is None:
+            replica = self._resync_replica()
+        else:
+            while True:
+                try:
+                    delta = self.get_changes(replica["token"])
+                except ChangeTokenExpired:
+                    replica = self._resync_replica()
+                    break
+                for event in delta["created"] + delta["updated"]:
+                    replica["events"][event["id"]] = event
+                for event_id in delta["deleted"]:
+                    replica["events"].pop(event_id, None)
+                advanced = delta["next"] != replica["token"]
+                replica["token"] = delta["next"]
+                # A token that did not move means the next change is still in flight
+                if not delta["has_more"] or not advanced:
+                    break
+        return sorted(replica["events"].values(), key=lambda event: event.get("start_time", ""))
+    
+    def iter_live_updates(self, timeout: float = 60) -> Iterator[Tuple[str, Dict]]:
+        """Follow /stream, yielding (kind, data) for created / updated / deleted / resync messages"""
+        try:
+            with requests.get(f"{self.api_base}/stream", stream=True, timeout=timeout,
+                              headers={"Accept": "text/event-stream"}) as response:
+                response.raise_for_status()
+                kind, data = "message", []
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.startswith("event:"):
+                        kind = line[6:].strip()
+                    elif line.startswith("data:"):
+                        data.append(line[5:].strip())
+                    elif not line and data:
+                        yield kind, json.loads("\n".join(data))
+                        kind, data = "message", []
+        except requests.exceptions.ConnectionError:
+            raise ConnectionError("Cannot connect to the API server. Make sure the Flask app is running.")
     
     def get_event_by_id(self, event_id: str) -> Dict:
         """Get a single event by its ID"""
-        return self._make_request("GET", f"/{event_id}") 
\ No newline at end of file
+        return self._make_request("GET", f"/{event_id}")
+    
+    def get_events_by_ids(self, event_ids: List[str]) -> List[Optional[Dict]]:
+        """Get many events in one request, in the given order (None for ids that don't exist)"""
+        if not event_ids:
+            return []
+        return self._make_request("POST", "/batch-get", {"ids": list(event_ids)})["events"] 
\ No newline at end of file
@@ -0,0 +1,24 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from datetime import datetime
+
+# Default start of built items: 2025-06-15, mid-afternoon UTC
+ITEM_START = 1_750_000_000
+
+
+def make_item(event_id, start=ITEM_START, end=None, **fields):
+    """A stored event item as the backends keep it, for tests.
+
+    ``start`` and ``end`` are epochs (``end`` defaults to an hour after
+    ``start``). start_time and end_time are derived from them as local ISO
+    times, the title defaults to the id, and any other attribute can be
+    set or overridden through ``fields``.
+    """
+    if end is None:
+        end = start + 3600
+    item = {"id": event_id, "title": event_id, "description": "", "start_time": datetime.fromtimestamp(start).isoformat(),
+            "end_time": datetime.fromtimestamp(end).isoformat(), "recurrence": None, "email": None,
+            "start_epoch": start, "end_epoch": end}
+    item.update(fields)
+    return item
@@ -4,13 +4,15 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 import pytest
 import json
 import tempfile
+import time
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 
 from app import create_app
-from app.models.event_model import Event
+from app.models.event_model import Event, to_epoch
 from app.services.event_service import (
     get_all_events,
+    get_all_event_objects,
     create_event,
     update_event,
     delete_event,
@@ -141,18 +143,37 @@ class TestEventSchedulerApp:
             data = json.loads(response.data)
             assert data['title'] == update_data['title']
 
-    def test_update_event_not_found(self, client):
+    def test_update_event_not_found(self, client, sample_event_data):
         """Test updating a non-existent event."""
-        update_data = {"title": "Updated Meeting"}
-        
-        response = client.put('/api/events/nonexistent-id',
-                            data=json.dumps(update_data),
-                            content_type='application/json')
+        with patch('app.services.dynamodb_service.DynamoDBService.get_event_by_id', return_value=None):
+            response = client.put('/api/events/nonexistent-id',
+                                data=json.dumps(sample_event_data),
+                                content_type='application/json')
         
         assert response.status_code == 404
         data = json.loads(response.data)
         assert 'error' in data
 
+    def test_update_event_validation_errors_are_400(self, client, sample_event, sample_event_data):
+        """Invalid fields on an existing event are a bad request, not a missing event."""
+        backwards = dict(sample_event_data, end_time="2024-01-15T09:00:00")
+        with patch('app.services.dynamodb_service.DynamoDBService.get_event_by_id', return_value=sample_event.to_dict()):
+            put = client.put(f'/api/events/{sample_event.id}', data=json.dumps(backwards),
+                             content_type='application/json')
+            incomplete = client.put(f'/api/events/{sample_event.id}', data=json.dumps({"title": "Only a title"}),
+                                    content_type='application/json')
+            patched = client.patch(f'/api/events/{sample_event.id}', data=json.dumps({"end_time": "not a time"}),
+                                   content_type='application/json')
+        assert put.status_code == 400
+        assert incomplete.status_code == 400
+        assert patched.status_code == 400
+
+    def test_partial_update_event_not_found(self, client):
+        with patch('app.services.dynamodb_service.DynamoDBService.get_event_by_id', return_value=None):
+            response = client.patch('/api/events/nonexistent-id', data=json.dumps({"title": "x"}),
+                                    content_type='application/json')
+        assert response.status_code == 404
+
     def test_partial_update_event_success(self, client, sample_event):
         """Test partially updating an existing event."""
         update_data = {"title": "Partially Updated Meeting"}
@@ -254,6 +275,50 @@ class TestEventSchedulerApp:
         assert event_dict['email'] == sample_event.email
         assert event_dict['id'] == sample_event.id
 
+    def test_event_model_parses_timestamps_once(self, sample_event):
+        """Test Event model keeps parsed datetimes and epochs next to the ISO strings."""
+        assert sample_event.start_dt == datetime(2024, 1, 15, 10, 0)
+        assert sample_event.end_dt == datetime(2024, 1, 15, 11, 0)
+        assert sample_event.end_epoch - sample_event.start_epoch == 3600
+        assert not hasattr(sample_event, '__dict__')
+
+    def test_event_model_rejects_invalid_timestamps(self, sample_event_data):
+        """Test Event model validates timestamps at construction."""
+        with pytest.raises(ValueError):
+            Event.from_dict(dict(sample_event_data, start_time="not-a-date"))
+        with pytest.raises(ValueError):
+            Event.from_dict(dict(sample_event_data, end_time="2024-01-15T09:00:00"))
+
+    def test_event_model_epochs_keep_repeated_hour_apart(self, sample_event_data, monkeypatch):
+        """Test offset-aware times in a DST fall-back hour map to distinct epochs."""
+        monkeypatch.setenv("TZ", "America/New_York")
+        time.tzset()
+        try:
+            first = to_epoch("2025-11-02T01:30:00-04:00")
+            second = to_epoch("2025-11-02T01:30:00-05:00")
+            assert second - first == 3600
+            event = Event.from_dict(dict(sample_event_data, start_time="2025-11-02T01:30:00-04:00",
+                                         end_time="2025-11-02T01:30:00-05:00"))
+            assert (event.start_epoch, event.end_epoch) == (first, second)
+            assert event.start_dt == event.end_dt == datetime(2025, 11, 2, 1, 30)
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+    def test_event_model_from_dict_round_trip(self, sample_event):
+        """Test Event model deserialization from its own dictionary."""
+        restored = Event.from_dict(sample_event.to_dict())
+        assert restored.to_dict() == sample_event.to_dict()
+        assert restored.start_epoch == sample_event.start_epoch
+
+    def test_create_event_invalid_timestamp(self, client, sample_event_data):
+        """Test creating an event with an unparseable start_time."""
+        bad_data = dict(sample_event_data, start_time="tomorrow")
+        response = client.post('/api/events/',
+                             data=json.dumps(bad_data),
+                             content_type='application/json')
+        assert response.status_code == 400
+
     def test_service_get_all_events(self, sample_event):
         """Test the get_all_events service function."""
         with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=[sample_event.to_dict()]):
@@ -261,6 +326,15 @@ class TestEventSchedulerApp:
             assert len(events) == 1
             assert events[0]['title'] == sample_event.title
 
+    def test_service_get_all_event_objects_reuses_parsed_events(self, sample_event):
+        """Test get_all_event_objects only re-parses items whose updated_at changed."""
+        item = dict(sample_event.to_dict(), updated_at="2024-01-01T00:00:00")
+        with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=[item]):
+            first = get_all_event_objects()
+            second = get_all_event_objects()
+        assert first[0] is second[0]
+        assert first[0].title == sample_event.title
+
     def test_service_create_event(self, sample_event_data):
         """Test the create_event service function."""
         with patch('app.services.dynamodb_service.DynamoDBService.create_event', return_value=sample_event_data):
@@ -0,0 +1,41 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+from unittest.mock import patch
+
+from app import create_app
+
+
+class TestBatchGetEndpoint:
+    """Tests for POST /api/events/batch-get"""
+
+    @pytest.fixture
+    def client(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        return app.test_client()
+
+    def post(self, client, body, found=None):
+        with patch('app.services.dynamodb_service.DynamoDBService.batch_get', return_value=found or {}):
+            return client.post('/api/events/batch-get', data=json.dumps(body), content_type='application/json')
+
+    def test_preserves_request_order_and_marks_missing(self, client):
+        found = {"a": {"id": "a", "title": "A"}, "c": {"id": "c", "title": "C"}}
+        response = self.post(client, {"ids": ["c", "b", "a"]}, found)
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [event and event["id"] for event in data["events"]] == ["c", None, "a"]
+        assert data["missing"] == ["b"]
+
+    def test_rejects_invalid_ids(self, client):
+        assert self.post(client, {"ids": "a"}).status_code == 400
+        assert self.post(client, {"ids": []}).status_code == 400
+        assert self.post(client, {"ids": ["a", 1]}).status_code == 400
+        assert self.post(client, ["a"]).status_code == 400
+
+    def test_rejects_too_many_ids(self, client):
+        with patch('app.services.event_service.BATCH_GET_MAX_IDS', 2):
+            assert self.post(client, {"ids": ["a", "b", "c"]}).status_code == 400
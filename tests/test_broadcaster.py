@@ -0,0 +1,164 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+import time
+from unittest.mock import patch
+
+from app import create_app
+from app.services import event_service
+from app.services.event_service import event_broadcaster, publish_changes
+from app.services.memory_service import MemoryService
+from app.utils.broadcaster import RESYNC, Broadcaster, SubscriberLimitReached
+
+
+class TestBroadcaster:
+    """Tests for the in-process fan-out broadcaster"""
+
+    def test_publish_reaches_every_subscriber(self):
+        broadcaster = Broadcaster()
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+
+        broadcaster.publish("created", {"id": "a"})
+
+        for subscription in (first, second):
+            [(kind, data)] = subscription.get(timeout=0)
+            assert kind == "created" and data["id"] == "a" and data["seq"] == 1
+
+    def test_idle_wait_times_out(self):
+        broadcaster = Broadcaster()
+        assert broadcaster.subscribe().get(timeout=0.01) is None
+
+    def test_overflow_replaces_backlog_with_resync(self):
+        broadcaster = Broadcaster(buffer_size=2)
+        subscription = broadcaster.subscribe()
+        for i in range(3):
+            broadcaster.publish("updated", {"id": str(i)})
+
+        assert subscription.get(timeout=0) == [(RESYNC, {})]
+        assert broadcaster.metrics()["overflows"] == 1
+
+    def test_subscriber_limit(self):
+        broadcaster = Broadcaster(max_subscribers=1)
+        subscription = broadcaster.subscribe()
+        with pytest.raises(SubscriberLimitReached):
+            broadcaster.subscribe()
+        broadcaster.unsubscribe(subscription)
+        broadcaster.subscribe()
+
+    def test_listen_yields_heartbeats_and_unsubscribes(self):
+        broadcaster = Broadcaster()
+        subscription = broadcaster.subscribe()
+        messages = broadcaster.listen(subscription, heartbeat_seconds=0.01)
+
+        assert next(messages) is None
+        broadcaster.publish("deleted", {"id": "a"})
+        assert next(messages)[0] == "deleted"
+        messages.close()
+        assert broadcaster.metrics()["subscribers"] == 0
+
+
+class TestLiveUpdatesEndpoint:
+    """Tests for GET /api/events/stream"""
+
+    @pytest.fixture
+    def client(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        with patch('app.services.event_service.start_change_tailer'):
+            yield app.test_client()
+
+    def test_writes_are_pushed_as_server_sent_events(self, client):
+        with patch('app.services.event_service.SSE_HEARTBEAT_SECONDS', 0.01):
+            response = client.get('/api/events/stream', buffered=False)
+        assert response.mimetype == "text/event-stream"
+        assert "Content-Encoding" not in response.headers
+        chunks = iter(response.response)
+        assert next(chunks).startswith(b"retry:")
+        assert next(chunks) == b": keep-alive\n\n"
+
+        event_broadcaster.publish("created", {"id": "a", "event": {"id": "a", "title": "A"}})
+        message = next(chunks).decode()
+        lines = message.strip().split("\n")
+        assert lines[0] == "event: created"
+        assert lines[1].startswith("id: ")
+        assert json.loads(lines[2][len("data: "):])["event"]["title"] == "A"
+
+        response.close()
+        assert event_broadcaster.metrics()["subscribers"] == 0
+        event_service.start_change_tailer.assert_called_once_with()
+
+    def test_reconnect_starts_with_resync(self, client):
+        response = client.get('/api/events/stream', headers={"Last-Event-ID": "7"}, buffered=False)
+        chunks = iter(response.response)
+        next(chunks)
+        assert next(chunks).startswith(b"event: resync")
+        response.close()
+
+    def test_subscriber_limit_returns_503(self, client):
+        with patch.object(event_broadcaster, 'max_subscribers', 0):
+            assert client.get('/api/events/stream').status_code == 503
+
+
+class TestChangeTailer:
+    """Stream messages come from the shared change log, not the writing process"""
+
+    @pytest.fixture
+    def store(self):
+        store = MemoryService()
+        with patch.object(event_service, "db_service", store):
+            yield store
+        event_service.event_index.invalidate()
+
+    @pytest.fixture
+    def subscription(self):
+        subscription = event_broadcaster.subscribe()
+        yield subscription
+        event_broadcaster.unsubscribe(subscription)
+
+    def item(self, event_id, title):
+        return {"id": event_id, "title": title, "description": "", "start_time": "2025-01-01T10:00:00",
+                "end_time": "2025-01-01T11:00:00"}
+
+    def test_changes_by_any_process_are_published(self, store, subscription):
+        token = store.change_log.latest()
+        # Written straight to the store, as another worker would
+        store.create_event(self.item("a", "A"))
+        store.create_event(self.item("b", "B"))
+        store.update_event("a", self.item("a", "A2"))
+        store.delete_event("b")
+
+        assert subscription.get(timeout=0) is None  # nothing until the log is read
+        token = publish_changes(token)
+
+        messages = subscription.get(timeout=0)
+        assert [(kind, data["id"]) for kind, data in messages] == [("created", "a"), ("deleted", "b")]
+        assert messages[0][1]["event"]["title"] == "A2"
+        assert token == store.change_log.latest()
+        assert publish_changes(token) == token
+        assert subscription.get(timeout=0) is None
+
+    def test_compacted_history_sends_resync(self, store, subscription):
+        store.create_event(self.item("a", "A"))
+        store.change_log.compact(retain_seconds=-1)
+
+        assert publish_changes(0) == store.change_log.latest()
+        [(kind, _)] = subscription.get(timeout=0)
+        assert kind == RESYNC
+
+    def test_tailer_stops_when_nobody_listens(self, store):
+        subscription = event_broadcaster.subscribe()
+        event_service.start_change_tailer(interval=0.01)
+        store.create_event(self.item("a", "A"))
+        [(kind, data)] = subscription.get(timeout=5)
+        assert (kind, data["id"]) == ("created", "a")
+
+        event_broadcaster.unsubscribe(subscription)
+        deadline = time.time() + 5
+        while event_service._tailer_started and time.time() < deadline:
+            time.sleep(0.01)
+        assert event_service._tailer_started is False
+        with patch.object(store.change_log, "since") as since:
+            time.sleep(0.05)
+        since.assert_not_called()
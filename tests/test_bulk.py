@@ -0,0 +1,138 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+from unittest.mock import patch
+
+from app import create_app
+from app.services import event_service
+from app.services.event_service import event_index
+from app.services.memory_service import MemoryService
+
+
+def event_data(title="Session", **extra):
+    return dict({
+        "title": title,
+        "description": "Conference talk",
+        "start_time": "2025-09-01T10:00:00",
+        "end_time": "2025-09-01T11:00:00",
+    }, **extra)
+
+
+class TestBulkEndpoint:
+    """Tests for POST /api/events/bulk"""
+
+    @pytest.fixture
+    def client(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        event_index.invalidate()
+        return app.test_client()
+
+    def post(self, client, body, failures=None, stored=()):
+        def batch_get(ids, fields=None):
+            return {event_id: dict(event_data(id=event_id)) for event_id in ids if event_id in stored}
+
+        with patch('app.services.dynamodb_service.DynamoDBService.batch_write',
+                   return_value=failures or {}) as batch_write, \
+                patch('app.services.dynamodb_service.DynamoDBService.batch_get', side_effect=batch_get):
+            response = client.post('/api/events/bulk', data=json.dumps(body), content_type='application/json')
+        return response, batch_write
+
+    def test_mixed_operations_are_written_in_one_batch(self, client):
+        body = {
+            "create": [event_data("A"), event_data("B")],
+            "update": [event_data("C", id="existing")],
+            "delete": ["gone", {"id": "also-gone"}],
+        }
+        response, batch_write = self.post(client, body, stored=("existing", "gone", "also-gone"))
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["succeeded"] == 5 and data["failed"] == 0
+        assert [r["status"] for r in data["results"]] == [201, 201, 200, 200, 200]
+        puts, deletes = batch_write.call_args.args
+        assert [item["title"] for item in puts] == ["A", "B", "C"]
+        assert all("start_epoch" in item and "updated_at" in item for item in puts)
+        assert puts[2]["id"] == "existing"
+        assert deletes == ["gone", "also-gone"]
+
+    def test_invalid_entries_are_reported_and_skipped(self, client):
+        body = {"create": [event_data("ok"), {"title": "missing fields"},
+                           event_data("bad", end_time="2025-08-01T00:00:00")]}
+        response, batch_write = self.post(client, body)
+
+        assert response.status_code == 207
+        results = json.loads(response.data)["results"]
+        assert [r["status"] for r in results] == [201, 400, 400]
+        assert len(batch_write.call_args.args[0]) == 1
+
+    def test_duplicate_ids_are_rejected(self, client):
+        body = {"update": [event_data(id="x")], "delete": ["x"]}
+        response, _ = self.post(client, body, stored=("x",))
+
+        results = json.loads(response.data)["results"]
+        assert [r["status"] for r in results] == [200, 400]
+
+    def test_write_failures_are_reported_per_item(self, client):
+        response, _ = self.post(client, {"delete": ["a", "b"]}, failures={"b": "Not processed after retries"},
+                                stored=("a", "b"))
+
+        assert response.status_code == 207
+        results = json.loads(response.data)["results"]
+        assert [r["status"] for r in results] == [200, 500]
+        assert results[1]["error"] == "Not processed after retries"
+
+    def test_malformed_body(self, client):
+        assert self.post(client, {"create": "nope"})[0].status_code == 400
+        assert self.post(client, {})[0].status_code == 400
+        assert self.post(client, [])[0].status_code == 400
+
+
+class TestBulkAgainstStoredEvents:
+    """Bulk updates and deletes behave like PUT and DELETE (memory backend)"""
+
+    @pytest.fixture
+    def store(self):
+        store = MemoryService()
+        store.create_event(dict(event_data("Original", email="owner@example.com"), id="existing"))
+        event_index.invalidate()
+        with patch.object(event_service, "db_service", store):
+            yield store
+        event_index.invalidate()
+
+    @pytest.fixture
+    def client(self, store):
+        app = create_app()
+        app.config['TESTING'] = True
+        return app.test_client()
+
+    def post(self, client, body):
+        response = client.post('/api/events/bulk', data=json.dumps(body), content_type='application/json')
+        return response, json.loads(response.data)
+
+    def test_update_keeps_created_at_and_unsent_fields(self, client, store):
+        created_at = store.get_event_by_id("existing")["created_at"]
+        response, data = self.post(client, {"update": [event_data("Renamed", id="existing")]})
+
+        assert response.status_code == 200
+        stored = store.get_event_by_id("existing")
+        assert stored["title"] == "Renamed"
+        assert stored["created_at"] == created_at
+        assert stored["email"] == "owner@example.com"
+        assert store.change_log.since(1)[0][-1]["op"] == "update"
+
+    def test_update_of_missing_id_is_404_and_not_created(self, client, store):
+        response, data = self.post(client, {"update": [event_data(id="nope")]})
+
+        assert response.status_code == 207
+        assert data["results"][0]["status"] == 404 and data["results"][0]["id"] == "nope"
+        assert store.get_event_by_id("nope") is None
+
+    def test_delete_of_missing_id_is_404(self, client, store):
+        response, data = self.post(client, {"delete": ["missing", "existing"]})
+
+        assert response.status_code == 207
+        assert [r["status"] for r in data["results"]] == [404, 200]
+        assert store.get_event_by_id("existing") is None
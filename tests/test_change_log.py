@@ -0,0 +1,130 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+from unittest.mock import MagicMock, patch
+
+from app import create_app
+from app.services.change_log import ChangeGone, ChangeLog
+
+NOW = 1_750_000_000
+
+
+def record(seq, event_id, op, at=NOW - 60):
+    return {"stream": "events", "seq": seq, "id": event_id, "op": op, "at": at}
+
+
+class TestChangeLog:
+    """Tests for the DynamoDB-backed change log"""
+
+    @pytest.fixture
+    def log(self):
+        log = ChangeLog(MagicMock(), "events_changes", gap_grace_seconds=5)
+        log.table = MagicMock()
+        log.table.get_item.return_value = {"Item": {"last_seq": 10}}
+        return log
+
+    def written(self, log, method):
+        batch = log.table.batch_writer.return_value.__enter__.return_value
+        return [call.kwargs for call in getattr(batch, method).call_args_list]
+
+    def test_append_reserves_a_block_of_sequence_numbers(self, log):
+        log.table.update_item.return_value = {"Attributes": {"last_seq": 7}}
+
+        assert log.append([("a", "create"), ("b", "update"), ("c", "delete")]) == 7
+
+        assert log.table.update_item.call_args.kwargs["ExpressionAttributeValues"] == {":n": 3}
+        items = [kwargs["Item"] for kwargs in self.written(log, "put_item")]
+        assert [(item["seq"], item["id"], item["op"]) for item in items] == [
+            (5, "a", "create"), (6, "b", "update"), (7, "c", "delete")]
+
+    def test_since_stops_before_a_fresh_gap(self, log):
+        """A missing sequence number may still be in flight; a recent record after it is held back."""
+        log.table.query.return_value = {"Items": [
+            record(1, "a", "create"), record(2, "b", "create"), record(4, "c", "create", at=NOW)]}
+
+        records, token, has_more = log.since(0, now=NOW)
+
+        assert [r["seq"] for r in records] == [1, 2]
+        assert (token, has_more) == (2, True)
+
+    def test_since_skips_settled_gaps(self, log):
+        log.table.query.return_value = {"Items": [record(1, "a", "create"), record(4, "c", "create")]}
+
+        records, token, has_more = log.since(0, now=NOW)
+
+        assert [r["seq"] for r in records] == [1, 4]
+        assert (token, has_more) == (4, False)
+
+    def test_since_pages_with_limit(self, log):
+        log.table.query.return_value = {"Items": [record(i, str(i), "update") for i in range(1, 4)]}
+
+        records, token, has_more = log.since(0, limit=2, now=NOW)
+
+        assert (len(records), token, has_more) == (2, 2, True)
+
+    def test_since_rejects_compacted_tokens(self, log):
+        log.table.get_item.return_value = {"Item": {"last_seq": 10, "compacted_through": 5}}
+        with pytest.raises(ChangeGone):
+            log.since(4, now=NOW)
+
+    def test_compact_drops_superseded_and_expired_records(self, log):
+        log.table.query.return_value = {"Items": [
+            record(1, "old", "delete", at=NOW - 10_000),
+            record(2, "a", "create"),
+            record(3, "a", "update"),
+            record(4, "b", "create"),
+            record(5, "b", "update", at=NOW),  # not settled yet, so 4 stays
+        ]}
+
+        assert log.compact(retain_seconds=3600, now=NOW) == 2
+
+        deleted = [kwargs["Key"]["seq"] for kwargs in self.written(log, "delete_item")]
+        assert deleted == [1, 2]
+        assert log.table.update_item.call_args.kwargs["ExpressionAttributeValues"] == {":s": 1}
+
+
+class TestChangesEndpoint:
+    """Tests for GET /api/events/changes"""
+
+    @pytest.fixture
+    def client(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        return app.test_client()
+
+    def test_without_token_returns_current_token(self, client):
+        with patch('app.services.change_log.ChangeLog.latest', return_value=42):
+            data = json.loads(client.get('/api/events/changes').data)
+        assert data["next"] == "42" and data["created"] == []
+
+    def test_changes_are_collapsed_per_id(self, client):
+        records = [record(11, "a", "create"), record(12, "a", "update"), record(13, "b", "update"),
+                   record(14, "c", "update"), record(15, "c", "delete"), record(16, "d", "update")]
+        bodies = {"a": {"id": "a", "title": "A"}, "b": {"id": "b", "title": "B"}}
+        with patch('app.services.change_log.ChangeLog.since', return_value=(records, 16, False)), \
+                patch('app.services.dynamodb_service.DynamoDBService.batch_get', return_value=bodies) as batch_get:
+            response = client.get('/api/events/changes?since=10')
+
+        data = json.loads(response.data)
+        assert response.status_code == 200
+        assert data["created"] == [bodies["a"]]
+        assert data["updated"] == [bodies["b"]]
+        assert data["deleted"] == ["c", "d"]  # d was deleted after this window
+        assert (data["next"], data["has_more"]) == ("16", False)
+        assert batch_get.call_args.args[0] == ["a", "b", "d"]
+
+    def test_expired_token_is_gone(self, client):
+        with patch('app.services.change_log.ChangeLog.since', side_effect=ChangeGone("too old")):
+            assert client.get('/api/events/changes?since=1').status_code == 410
+
+    def test_token_ahead_of_the_log_is_gone(self, client):
+        with patch('app.services.change_log.ChangeLog.since', return_value=([], 999999, False)), \
+                patch('app.services.change_log.ChangeLog.latest', return_value=42):
+            assert client.get('/api/events/changes?since=999999').status_code == 410
+            assert client.get('/api/events/changes?since=42').status_code == 200
+
+    def test_invalid_parameters(self, client):
+        assert client.get('/api/events/changes?since=abc').status_code == 400
+        assert client.get('/api/events/changes?since=1&limit=0').status_code == 400
@@ -0,0 +1,80 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import gzip
+import json
+import zlib
+from unittest.mock import patch
+
+from app import create_app
+
+EVENTS = [
+    {"id": str(i), "title": f"Event {i}", "description": "A long description " * 20,
+     "start_time": "2025-07-01T10:00:00", "end_time": "2025-07-01T11:00:00", "updated_at": "2025-06-01"}
+    for i in range(20)
+]
+
+
+class TestResponseCompression:
+    """Tests for Accept-Encoding negotiated compression"""
+
+    @pytest.fixture
+    def app(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        return app
+
+    @pytest.fixture
+    def client(self, app):
+        return app.test_client()
+
+    def get_events(self, client, **headers):
+        with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=EVENTS):
+            return client.get('/api/events/', headers=headers)
+
+    def test_gzip_when_accepted(self, client):
+        response = self.get_events(client, **{"Accept-Encoding": "gzip, deflate"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert json.loads(gzip.decompress(response.data)) == EVENTS
+
+    def test_deflate_when_preferred(self, client):
+        response = self.get_events(client, **{"Accept-Encoding": "gzip;q=0.5, deflate"})
+        assert response.headers["Content-Encoding"] == "deflate"
+        assert json.loads(zlib.decompress(response.data)) == EVENTS
+
+    def test_identity_without_accept_encoding(self, client):
+        response = self.get_events(client)
+        assert "Content-Encoding" not in response.headers
+        assert json.loads(response.data) == EVENTS
+
+    def test_refused_encoding_is_not_used(self, client):
+        response = self.get_events(client, **{"Accept-Encoding": "gzip;q=0"})
+        assert "Content-Encoding" not in response.headers
+
+    def test_small_bodies_are_not_compressed(self, app, client):
+        app.config["COMPRESSION_MIN_SIZE"] = 10_000_000
+        response = self.get_events(client, **{"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+
+    def test_streamed_response_is_compressed(self, client):
+        pages = [EVENTS[:10], EVENTS[10:]]
+        with patch('app.services.dynamodb_service.DynamoDBService.iter_pages', return_value=iter(pages)):
+            response = client.get('/api/events/?stream=ndjson', headers={"Accept-Encoding": "gzip"})
+            body = gzip.decompress(response.get_data())
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert len(body.splitlines()) == 20
+
+    def test_compressed_etag_revalidates(self, client):
+        with patch('app.services.change_log.ChangeLog.latest', return_value=1):
+            etag = self.get_events(client, **{"Accept-Encoding": "gzip"}).headers["ETag"]
+            assert etag.endswith('-gzip"')
+            response = self.get_events(client, **{"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_metrics_report_bytes_saved(self, client):
+        self.get_events(client, **{"Accept-Encoding": "gzip"})
+        metrics = json.loads(client.get('/api/metrics').data)["compression"]
+        assert metrics["responses_compressed"] >= 1
+        assert metrics["bytes_saved"] > 0
@@ -0,0 +1,181 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+
+from app.models.event_model import to_epoch
+from app.services.dynamodb_service import ChangeNotRecorded, DynamoDBService
+
+
+class TestDynamoDBService:
+    """Tests for DynamoDBService against a mocked table"""
+
+    @pytest.fixture
+    def service(self):
+        service = DynamoDBService()
+        service.table = MagicMock()
+        service.reminders_table = MagicMock()
+        service.change_log = MagicMock()
+        return service
+
+    def test_get_all_events_sorts_by_epoch(self, service):
+        """Mixed precisions and offsets sort by instant, not by string."""
+        later = {"id": "a", "start_time": "2025-06-29T02:55", "start_epoch": to_epoch("2025-06-29T02:55")}
+        earlier = {"id": "b", "start_time": "2025-06-29T02:55:00+14:00"}  # not yet backfilled
+        service.table.scan.return_value = {"Items": [later, earlier]}
+
+        events = service.get_all_events()
+
+        assert [e["id"] for e in events] == ["b", "a"]
+
+    def test_get_all_events_follows_pagination(self, service):
+        """All scan pages are collected."""
+        service.table.scan.side_effect = [
+            {"Items": [{"id": "a", "start_epoch": 2}], "LastEvaluatedKey": {"id": "a"}},
+            {"Items": [{"id": "b", "start_epoch": 1}]},
+        ]
+
+        events = service.get_all_events()
+
+        assert [e["id"] for e in events] == ["b", "a"]
+        assert service.table.scan.call_count == 2
+
+    def test_get_events_by_date_range_filters_on_epochs(self, service):
+        """The range filter is pushed to DynamoDB as a numeric condition."""
+        service.table.scan.return_value = {"Items": []}
+
+        service.get_events_by_date_range("2025-06-01", "2025-07-01")
+
+        condition = service.table.scan.call_args.kwargs["FilterExpression"]
+        _, low, high = condition.get_expression()["values"]
+        assert (low, high) == (to_epoch("2025-06-01"), to_epoch("2025-07-01"))
+
+    def test_backfill_epochs_updates_missing_items(self, service):
+        """Items without epochs get them written; invalid ones are skipped."""
+        service.table.scan.return_value = {"Items": [
+            {"id": "a", "start_time": "2025-06-29T02:55:00", "end_time": "2025-06-29T03:55:00"},
+            {"id": "b", "start_time": "garbage", "end_time": "garbage"},
+        ]}
+
+        assert service.backfill_epochs() == 1
+        values = service.table.update_item.call_args.kwargs["ExpressionAttributeValues"]
+        assert values[":e"] - values[":s"] == 3600
+
+    def test_batch_write_chunks_and_retries_unprocessed(self, service, monkeypatch):
+        """Requests go out in chunks of 25 and unprocessed items are re-sent."""
+        monkeypatch.setattr('app.services.dynamodb_service.BATCH_RETRY_BASE_SECONDS', 0)
+        client = MagicMock()
+        service.dynamodb = MagicMock()
+        service.dynamodb.meta.client = client
+        sent = []
+
+        def batch_write_item(RequestItems):
+            requests = RequestItems[service.table_name]
+            sent.append(len(requests))
+            first = requests[0]
+            if len(requests) > 1 and first.get('PutRequest', {}).get('Item', {}).get('id') == 'p0':
+                return {'UnprocessedItems': {service.table_name: [first]}}
+            return {}
+        client.batch_write_item.side_effect = batch_write_item
+
+        failures = service.batch_write([{"id": f"p{i}"} for i in range(30)], ["d1", "d2"])
+
+        assert failures == {}
+        assert sorted(sent) == [1, 7, 25]
+
+    def test_batch_write_reports_items_left_unprocessed(self, service, monkeypatch):
+        """Items still unprocessed after the last attempt are reported as failed."""
+        monkeypatch.setattr('app.services.dynamodb_service.BATCH_RETRY_BASE_SECONDS', 0)
+        service.dynamodb = MagicMock()
+        service.dynamodb.meta.client.batch_write_item.side_effect = lambda RequestItems: {
+            'UnprocessedItems': RequestItems}
+
+        failures = service.batch_write([{"id": "a"}], ["b"], max_attempts=3)
+
+        assert set(failures) == {"a", "b"}
+        assert service.dynamodb.meta.client.batch_write_item.call_count == 3
+
+    def test_batch_get_resolves_unprocessed_keys(self, service, monkeypatch):
+        """Keys are deduplicated, chunked by 100 and unprocessed keys re-requested."""
+        monkeypatch.setattr('app.services.dynamodb_service.BATCH_RETRY_BASE_SECONDS', 0)
+        service.dynamodb = MagicMock()
+        deferred = {"k0"}
+
+        def batch_get_item(RequestItems):
+            keys = RequestItems[service.table_name]['Keys']
+            assert len(keys) <= 100
+            served = [key for key in keys if key['id'] not in deferred]
+            unprocessed = [key for key in keys if key['id'] in deferred]
+            deferred.clear()
+            return {
+                'Responses': {service.table_name: [key for key in served if key['id'] != "k5"]},
+                'UnprocessedKeys': {service.table_name: {'Keys': unprocessed}} if unprocessed else {},
+            }
+        service.dynamodb.meta.client.batch_get_item.side_effect = batch_get_item
+
+        found = service.batch_get([f"k{i}" for i in range(150)] + ["k0"])
+
+        assert len(found) == 149 and "k0" in found and "k5" not in found
+        assert service.dynamodb.meta.client.batch_get_item.call_count == 3
+
+    def test_writes_are_appended_to_change_log(self, service):
+        """Creates, updates and deletes each record a change; failed batch items do not."""
+        service.table.get_item.return_value = {"Item": {"id": "a", "title": "A"}}
+        service.create_event({"id": "a", "title": "A"})
+        service.update_event("a", {"title": "B"})
+        service.delete_event("a")
+        assert [call.args[0] for call in service.change_log.append.call_args_list] == [
+            [("a", "create")], [("a", "update")], [("a", "delete")]]
+
+        service.change_log.append.reset_mock()
+        service.dynamodb = MagicMock()
+        service.dynamodb.meta.client.batch_write_item.return_value = {}
+        with patch.object(service, '_write_chunk', return_value={"c": "boom"}):
+            service.batch_write([{"id": "n", "created_at": "t", "updated_at": "t"},
+                                 {"id": "u", "created_at": "t0", "updated_at": "t"}, {"id": "c"}], ["d"])
+        assert service.change_log.append.call_args.args[0] == [("n", "create"), ("u", "update"), ("d", "delete")]
+
+    def test_change_log_append_is_retried(self, service):
+        """A transient append failure is retried; the write still succeeds."""
+        service.change_log.append.side_effect = [Exception("throttled"), 7]
+        with patch('app.services.dynamodb_service.time.sleep'):
+            service.create_event({"id": "a", "title": "A"})
+        assert service.change_log.append.call_count == 2
+
+    def test_unrecorded_write_fails_the_request(self, service):
+        """When the change record cannot be appended, the write raises instead of succeeding silently."""
+        service.change_log.append.side_effect = Exception("down")
+        service.table.get_item.return_value = {"Item": {"id": "a", "title": "A"}}
+        with patch('app.services.dynamodb_service.time.sleep'):
+            with pytest.raises(ChangeNotRecorded):
+                service.create_event({"id": "a", "title": "A"})
+            with pytest.raises(ChangeNotRecorded):
+                service.delete_event("a")
+            with patch.object(service, '_write_chunk', return_value={}), pytest.raises(ChangeNotRecorded):
+                service.batch_write([], ["a"])
+        assert service.change_log.append.call_count == 9
+
+    def test_claim_reminder_is_a_conditional_put(self, service):
+        """Only the first claim of an occurrence succeeds; the condition is evaluated by DynamoDB."""
+        service.table.get_item.return_value = {"Item": {"id": "a"}}
+        assert service.claim_reminder("a", 100) is True
+        kwargs = service.reminders_table.put_item.call_args.kwargs
+        assert kwargs["Item"]["id"] == "a" and kwargs["Item"]["occurrence"] == 100
+        assert "occurrence < :o" in kwargs["ConditionExpression"]
+        service.table.put_item.assert_not_called()
+        service.table.update_item.assert_not_called()
+        service.change_log.append.assert_not_called()
+
+        service.reminders_table.put_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem")
+        assert service.claim_reminder("a", 100) is False
+        service.reminders_table.put_item.side_effect = ClientError({"Error": {"Code": "Throttled"}}, "PutItem")
+        with pytest.raises(ClientError):
+            service.claim_reminder("a", 100)
+
+    def test_claim_reminder_for_missing_event(self, service):
+        service.table.get_item.return_value = {}
+        assert service.claim_reminder("a", 100) is False
+        service.reminders_table.put_item.assert_not_called()
@@ -0,0 +1,113 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+import time
+from unittest.mock import patch
+
+from app import create_app
+from app.services.event_service import event_index
+from tests.conftest import make_item
+
+EVENT = {
+    "id": "evt-1",
+    "title": "Standup",
+    "description": "Daily sync",
+    "start_time": "2025-07-01T10:00:00",
+    "end_time": "2025-07-01T10:15:00",
+    "updated_at": "2025-06-01T09:00:00",
+}
+
+
+class TestConditionalGet:
+    """Tests for ETag / If-None-Match support"""
+
+    @pytest.fixture
+    def token(self):
+        """The shared change token, bumped by tests to simulate a write from any worker"""
+        token = [1]
+        with patch('app.services.change_log.ChangeLog.latest', side_effect=lambda: token[0]):
+            yield token
+
+    @pytest.fixture
+    def client(self, token):
+        app = create_app()
+        app.config['TESTING'] = True
+        return app.test_client()
+
+    def test_item_etag_round_trip(self, client):
+        with patch('app.services.dynamodb_service.DynamoDBService.get_event_by_id', return_value=dict(EVENT)):
+            first = client.get('/api/events/evt-1')
+            etag = first.headers["ETag"]
+            second = client.get('/api/events/evt-1', headers={"If-None-Match": etag})
+        assert first.status_code == 200
+        assert not etag.startswith("W/")
+        assert second.status_code == 304
+        assert second.data == b""
+
+    def test_item_etag_changes_with_updated_at(self, client):
+        with patch('app.services.dynamodb_service.DynamoDBService.get_event_by_id', return_value=dict(EVENT)):
+            etag = client.get('/api/events/evt-1').headers["ETag"]
+        changed = dict(EVENT, updated_at="2025-06-02T09:00:00")
+        with patch('app.services.dynamodb_service.DynamoDBService.get_event_by_id', return_value=changed):
+            response = client.get('/api/events/evt-1', headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert json.loads(response.data)["updated_at"] == changed["updated_at"]
+
+    def test_list_304_skips_storage(self, client):
+        with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=[EVENT]) as scan:
+            etag = client.get('/api/events/').headers["ETag"]
+            response = client.get('/api/events/', headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert scan.call_count == 1
+
+    def test_list_etag_changes_after_write(self, client, token):
+        with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=[EVENT]):
+            etag = client.get('/api/events/').headers["ETag"]
+        token[0] += 1  # e.g. a delete served by another worker
+        with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=[]):
+            response = client.get('/api/events/', headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert json.loads(response.data) == []
+
+    def test_list_etag_depends_on_query(self, client):
+        with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=[EVENT]):
+            plain = client.get('/api/events/').headers["ETag"]
+            sorted_desc = client.get('/api/events/?sort=title&order=desc').headers["ETag"]
+        assert plain != sorted_desc
+
+    def test_status_filter_etag_changes_when_an_event_starts(self, client):
+        with patch('app.services.event_service.event_index.next_status_change', return_value=100), \
+                patch('app.routes.event_routes.query_events', return_value=[EVENT]):
+            etag = client.get('/api/events/?status=upcoming').headers["ETag"]
+            assert client.get('/api/events/?status=upcoming', headers={"If-None-Match": etag}).status_code == 304
+        with patch('app.services.event_service.event_index.next_status_change', return_value=160), \
+                patch('app.routes.event_routes.query_events', return_value=[]):
+            response = client.get('/api/events/?status=upcoming', headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+    def test_list_without_change_token_has_no_etag(self, client):
+        with patch('app.services.change_log.ChangeLog.latest', side_effect=Exception("down")), \
+                patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=[EVENT]):
+            response = client.get('/api/events/')
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+
+    def test_index_answered_list_is_tagged_with_the_index_token(self, client, token):
+        soon = int(time.time()) + 86400
+        first, second = make_item("evt-1", start=soon), make_item("evt-2", start=soon + 60)
+        try:
+            event_index.load([first], token=1)
+            token[0] = 2  # evt-2 written by another worker; this index has not caught up
+            stale = client.get('/api/events/?status=upcoming')
+            assert [item["id"] for item in json.loads(stale.data)] == ["evt-1"]
+            assert client.get('/api/events/?status=upcoming',
+                              headers={"If-None-Match": stale.headers["ETag"]}).status_code == 304
+
+            event_index.load([first, second], token=2)
+            response = client.get('/api/events/?status=upcoming', headers={"If-None-Match": stale.headers["ETag"]})
+        finally:
+            event_index.invalidate()
+        assert response.status_code == 200
+        assert [item["id"] for item in json.loads(response.data)] == ["evt-1", "evt-2"]
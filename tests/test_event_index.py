@@ -0,0 +1,147 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+from unittest.mock import patch
+
+from app import create_app
+from app.services.event_index import EventIndex
+from app.services.event_service import event_index
+from tests.conftest import make_item
+
+NOW = 1_750_000_000
+
+
+class TestEventIndex:
+    """Tests for the columnar in-memory event index"""
+
+    @pytest.fixture
+    def items(self):
+        return [
+            make_item("past", NOW - 7200, NOW - 3600),
+            make_item("ongoing", NOW - 600, NOW + 600),
+            make_item("soon", NOW + 60, NOW + 120),
+            make_item("later", NOW + 3600, NOW + 7200),
+        ]
+
+    @pytest.fixture
+    def index(self, items):
+        return EventIndex(lambda: list(items))
+
+    def test_status_counts(self, index):
+        """Counts are computed from the epoch columns."""
+        counts = index.status_counts(now=NOW)
+        assert counts == {"total": 4, "upcoming": 2, "ongoing": 1, "past": 1}
+
+    def test_next_status_change(self, index):
+        """The nearest start or end after now bounds the current statuses."""
+        assert index.next_status_change(now=NOW) == NOW + 60  # "soon" starts
+        assert index.next_status_change(now=NOW + 61) == NOW + 121  # "soon" has ended
+        index.upsert(make_item("sooner", NOW + 70, NOW + 80))
+        assert index.next_status_change(now=NOW + 61) == NOW + 70
+
+    def test_upcoming_returns_next_n_in_order(self, index):
+        """Only the nearest upcoming events are returned, earliest first."""
+        assert [e["id"] for e in index.upcoming(1, now=NOW)] == ["soon"]
+        assert [e["id"] for e in index.upcoming(5, now=NOW)] == ["soon", "later"]
+
+    def test_events_in_range(self, index):
+        """Range masks are inclusive on both bounds; either bound is optional."""
+        assert [e["id"] for e in index.events_in_range(NOW - 600, NOW + 60)] == ["ongoing", "soon"]
+        assert [e["id"] for e in index.events_in_range(None, NOW - 7200)] == ["past"]
+
+    def test_writes_apply_in_place(self, index):
+        """Upserts and removes keep the columns in sync without a reload."""
+        index.ensure_loaded()
+        index.upsert(make_item("soon", NOW - 7200, NOW - 7100))  # moved into the past
+        index.remove("ongoing")
+        index.upsert(make_item("new", NOW + 10, NOW + 20))
+
+        assert index.status_counts(now=NOW) == {"total": 4, "upcoming": 2, "ongoing": 0, "past": 2}
+        assert [e["id"] for e in index.upcoming(5, now=NOW)] == ["new", "later"]
+
+    def test_grows_past_initial_capacity(self):
+        """The columns resize as rows are added."""
+        index = EventIndex(lambda: [])
+        index.ensure_loaded()
+        for i in range(100):
+            index.upsert(make_item(str(i), NOW + i, NOW + i))
+        assert index.status_counts(now=NOW)["upcoming"] == 99
+
+    def test_invalid_timestamps_are_skipped(self):
+        """Items whose times cannot be parsed are left out of the columns."""
+        index = EventIndex(lambda: [{"id": "bad", "start_time": "soon", "end_time": "later"}])
+        assert index.status_counts(now=NOW)["total"] == 0
+
+    def test_stats_include_recurring_email_and_today(self):
+        """Stats combine incremental counters with the time-based classification."""
+        items = [
+            dict(make_item("a", NOW + 60, NOW + 120), recurrence="daily", email="a@example.com"),
+            dict(make_item("b", NOW - 10 * 86400, NOW - 10 * 86400 + 60), email="b@example.com"),
+        ]
+        index = EventIndex(lambda: items)
+        stats = index.stats(now=NOW)
+        assert stats["total"] == 2
+        assert stats["recurring"] == 1
+        assert stats["with_email"] == 2
+        assert stats["today"] == 1
+        assert (stats["upcoming"], stats["past"]) == (1, 1)
+
+    def test_stats_are_adjusted_incrementally_on_writes(self, index):
+        """Writes update the cached counts without a full reclassification."""
+        index.stats(now=NOW)
+        with patch.object(index, "_reclassify", wraps=index._reclassify) as reclassify:
+            index.upsert(dict(make_item("new", NOW + 30, NOW + 40), recurrence="weekly"))
+            index.remove("past")
+            stats = index.stats(now=NOW + 1)
+        reclassify.assert_not_called()
+        assert stats["upcoming"] == 3
+        assert stats["past"] == 0
+        assert stats["recurring"] == 1
+
+    def test_stats_reclassify_after_next_boundary(self, index):
+        """Once an event starts the counts are recomputed for the new time."""
+        assert index.stats(now=NOW)["ongoing"] == 1
+        stats = index.stats(now=NOW + 60)  # "soon" has started
+        assert (stats["upcoming"], stats["ongoing"]) == (1, 2)
+
+
+class TestEventIndexRoutes:
+    """Tests for the index-backed API endpoints"""
+
+    @pytest.fixture
+    def client(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        event_index.invalidate()
+        yield app.test_client()
+        event_index.invalidate()
+
+    def test_stats_endpoint(self, client):
+        items = [make_item("a", 0, 1), dict(make_item("b", 4_000_000_000, 4_000_000_001), email="b@example.com")]
+        with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=items):
+            response = client.get('/api/events/stats')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["total"] == 2
+        assert data["with_email"] == 1
+        assert data["upcoming"] == 1
+
+    def test_status_counts_endpoint(self, client):
+        items = [make_item("a", 0, 1), make_item("b", 4_000_000_000, 4_000_000_001)]
+        with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=items):
+            response = client.get('/api/events/status-counts')
+        assert response.status_code == 200
+        assert json.loads(response.data) == {"total": 2, "upcoming": 1, "ongoing": 0, "past": 1}
+
+    def test_upcoming_endpoint(self, client):
+        items = [make_item("a", 4_000_000_000, 4_000_000_001), make_item("b", 0, 1)]
+        with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=items):
+            response = client.get('/api/events/upcoming?limit=5')
+        assert response.status_code == 200
+        assert [e["id"] for e in json.loads(response.data)] == ["a"]
+
+    def test_range_endpoint_rejects_invalid_bound(self, client):
+        response = client.get('/api/events/range?from=yesterday')
+        assert response.status_code == 400
@@ -0,0 +1,169 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+from unittest.mock import MagicMock, patch
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+
+from app import create_app
+from app.services.event_index import EventIndex
+from app.services.dynamodb_service import DynamoDBService, projection_args
+from app.services.event_query import EventQuery, PLAN_INDEX, PLAN_LIST, PLAN_SCAN, parse_fields
+from app.services.event_service import event_index
+from tests.conftest import make_item
+
+NOW = 1_750_000_000
+
+
+ITEMS = [
+    make_item("past", NOW - 7200, NOW - 3600, recurrence="daily"),
+    make_item("ongoing", NOW - 600, NOW + 600, email="a@example.com"),
+    make_item("Soon", NOW + 60, NOW + 120, recurrence="weekly", email="b@example.com"),
+    make_item("later", NOW + 3600, NOW + 7200),
+]
+
+
+class TestEventQuery:
+    """Tests for list endpoint query parsing and planning"""
+
+    @pytest.fixture
+    def index(self):
+        return EventIndex(lambda: list(ITEMS))
+
+    def test_from_args_parses_filters(self):
+        query = EventQuery.from_args({"status": "Upcoming", "recurrence": "None", "has_email": "true",
+                                      "from": "2025-01-01", "order": "desc"})
+        assert query.status == "upcoming"
+        assert query.recurrence == ""
+        assert query.has_email is True
+        assert query.start_epoch is not None and query.end_epoch is None
+        assert query.descending is True
+
+    @pytest.mark.parametrize("args", [
+        {"status": "soon"}, {"recurrence": "yearly"}, {"has_email": "maybe"},
+        {"from": "yesterday"}, {"sort": "email"}, {"order": "up"},
+    ])
+    def test_from_args_rejects_invalid_values(self, args):
+        with pytest.raises(ValueError):
+            EventQuery.from_args(args)
+
+    def test_plan_prefers_warm_index(self, index):
+        query = EventQuery(status="upcoming")
+        assert EventQuery(sort="title").plan(index) == PLAN_LIST
+        assert query.plan(index) == PLAN_SCAN
+        index.ensure_loaded()
+        assert query.plan(index) == PLAN_INDEX
+
+    def test_index_query_combines_masks(self, index):
+        ids = lambda query: [e["id"] for e in index.query(query, now=NOW)]
+        assert ids(EventQuery(status="upcoming")) == ["Soon", "later"]
+        assert ids(EventQuery(has_email=True, descending=True)) == ["Soon", "ongoing"]
+        assert ids(EventQuery(recurrence="")) == ["ongoing", "later"]
+        assert ids(EventQuery(recurrence="monthly")) == []
+        assert ids(EventQuery(start_epoch=NOW - 600, end_epoch=NOW + 60, sort="title")) == ["ongoing", "Soon"]
+
+    def test_filter_expression_pushes_down_every_filter(self):
+        query = EventQuery(status="past", recurrence="daily", has_email=False, start_epoch=1, end_epoch=2)
+        built = ConditionExpressionBuilder().build_expression(query.filter_expression(now=NOW))
+        assert built.condition_expression.count("AND") == 4
+        assert NOW in built.attribute_value_placeholders.values()
+
+
+class TestListEndpointFilters:
+    """Tests for server-side filtering on GET /api/events/"""
+
+    @pytest.fixture
+    def client(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        event_index.invalidate()
+        yield app.test_client()
+        event_index.invalidate()
+
+    def test_filtered_list_uses_scan_when_index_is_cold(self, client):
+        with patch('app.services.dynamodb_service.DynamoDBService.scan_events', return_value=[ITEMS[3], ITEMS[2]]) as scan:
+            response = client.get('/api/events/?status=upcoming')
+        assert response.status_code == 200
+        assert [e["id"] for e in json.loads(response.data)] == ["Soon", "later"]
+        scan.assert_called_once()
+
+    def test_filtered_list_uses_warm_index(self, client):
+        with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=list(ITEMS)):
+            event_index.ensure_loaded()
+        with patch('app.services.dynamodb_service.DynamoDBService.scan_events') as scan:
+            response = client.get('/api/events/?has_email=true&sort=title&order=desc')
+        scan.assert_not_called()
+        assert [e["id"] for e in json.loads(response.data)] == ["Soon", "ongoing"]
+
+    def test_sort_only_lists_everything(self, client):
+        with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=list(ITEMS)):
+            response = client.get('/api/events/?sort=start_time&order=desc')
+        assert [e["id"] for e in json.loads(response.data)] == ["later", "Soon", "ongoing", "past"]
+
+    def test_invalid_filter_returns_400(self, client):
+        response = client.get('/api/events/?status=sometime')
+        assert response.status_code == 400
+        assert 'error' in json.loads(response.data)
+
+
+class TestFieldProjection:
+    """Tests for the fields= projection"""
+
+    def test_parse_fields_always_includes_id(self):
+        assert parse_fields("title, start_time") == ("id", "title", "start_time")
+        assert parse_fields(None) is None
+
+    def test_parse_fields_rejects_unknown(self):
+        with pytest.raises(ValueError):
+            parse_fields("title,password")
+        with pytest.raises(ValueError):
+            parse_fields(",")
+
+    def test_projection_args_use_placeholders(self):
+        args = projection_args(("id", "title"))
+        assert args["ProjectionExpression"] == "#p0, #p1"
+        assert args["ExpressionAttributeNames"] == {"#p0": "id", "#p1": "title"}
+        assert projection_args(None) == {}
+
+    def test_fetch_fields_add_sort_keys(self):
+        query = EventQuery.from_args({"fields": "title", "sort": "end_time"})
+        assert set(query.fetch_fields()) == {"id", "title", "start_epoch", "start_time", "end_epoch", "end_time"}
+
+    def test_end_time_sort_parses_items_not_backfilled(self):
+        legacy = {"id": "legacy", "end_time": "2025-06-15T10:00:00+00:00"}  # 1749981600, before NOW
+        items = EventQuery(sort="end_time").sort_items(list(ITEMS) + [legacy])
+        assert [e["id"] for e in items] == ["legacy", "past", "Soon", "ongoing", "later"]
+
+    def test_scan_reads_only_requested_fields(self):
+        service = DynamoDBService()
+        service.table = MagicMock()
+        service.table.scan.return_value = {"Items": [
+            {"id": "b", "title": "B", "start_epoch": 2}, {"id": "a", "title": "A", "start_epoch": 1}]}
+
+        events = service.get_all_events(("id", "title"))
+
+        names = service.table.scan.call_args.kwargs["ExpressionAttributeNames"]
+        assert set(names.values()) == {"id", "title", "start_epoch", "start_time"}
+        assert events == [{"id": "a", "title": "A"}, {"id": "b", "title": "B"}]
+
+    def test_list_endpoint_projects_items(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        items = [{"id": "a", "title": "A", "description": "long", "start_epoch": 1, "start_time": "x"}]
+        with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=items):
+            response = app.test_client().get('/api/events/?fields=title')
+        assert json.loads(response.data) == [{"id": "a", "title": "A"}]
+
+    def test_get_endpoint_projects_and_varies_etag(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        client = app.test_client()
+        item = {"id": "a", "title": "A", "description": "long", "updated_at": "2025-01-01"}
+        with patch('app.services.dynamodb_service.DynamoDBService.get_event_by_id', return_value=item) as get:
+            full = client.get('/api/events/a')
+            projected = client.get('/api/events/a?fields=title')
+        assert set(get.call_args.args[1]) == {"id", "title", "updated_at"}
+        assert json.loads(projected.data) == {"id": "a", "title": "A"}
+        assert full.headers["ETag"] != projected.headers["ETag"]
+        assert client.get('/api/events/a?fields=bogus').status_code == 400
@@ -0,0 +1,202 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import time
+
+from app.services.change_log import ChangeGone
+from app.services.event_query import EventQuery
+from app.services.event_store import EventStore, create_event_store
+from app.services.file_service import FileService
+from app.services.journal_service import JournalService
+from app.services.memory_service import MemoryService
+from app.services.sqlite_service import SQLiteService
+from tests.conftest import make_item
+
+NOW = int(time.time())
+
+
+ITEMS = [
+    make_item("past", NOW - 7200, NOW - 3600, recurrence="daily", description="Weekly standup notes"),
+    make_item("ongoing", NOW - 600, NOW + 600, email="a@example.com"),
+    make_item("soon", NOW + 60, NOW + 120, recurrence="weekly", email="b@example.com", title="Dentist"),
+    make_item("later", NOW + 3600, NOW + 7200),
+]
+
+
+@pytest.fixture(params=["memory", "sqlite", "journal", "file"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = MemoryService()
+    elif request.param == "sqlite":
+        store = SQLiteService(str(tmp_path / "events.db"))
+    elif request.param == "journal":
+        store = JournalService(str(tmp_path / "events.jsonl"))
+    else:
+        store = FileService(str(tmp_path / "events.json"), flush_seconds=3600)
+    store.create_table_if_not_exists()
+    for item in ITEMS:
+        store.create_event(dict(item))
+    return store
+
+
+class TestEventStoreContract:
+    """Behaviour every storage backend must share"""
+
+    def test_get_all_events_sorted_by_start(self, store):
+        assert [e["id"] for e in store.get_all_events()] == ["past", "ongoing", "soon", "later"]
+
+    def test_get_event_by_id_and_missing(self, store):
+        event = store.get_event_by_id("soon")
+        assert event["title"] == "Dentist"
+        assert event["recurrence"] == "weekly"
+        assert event["created_at"] == event["updated_at"]
+        assert store.get_event_by_id("nope") is None
+
+    def test_fields_projection(self, store):
+        assert store.get_event_by_id("soon", ("id", "title")) == {"id": "soon", "title": "Dentist"}
+        assert all(set(e) == {"id"} for e in store.get_all_events(("id",)))
+
+    def test_update_merges_and_bumps_updated_at(self, store):
+        updated = store.update_event("later", {"title": "Renamed"})
+        assert updated["title"] == "Renamed"
+        assert store.get_event_by_id("later")["title"] == "Renamed"
+        assert store.get_event_by_id("later")["start_epoch"] == NOW + 3600
+
+    def test_update_and_delete_missing_raise(self, store):
+        with pytest.raises(ValueError):
+            store.update_event("nope", {"title": "x"})
+        with pytest.raises(ValueError):
+            store.delete_event("nope")
+
+    def test_delete(self, store):
+        assert store.delete_event("past") is True
+        assert store.get_event_by_id("past") is None
+
+    @pytest.mark.parametrize("query, expected", [
+        (EventQuery(status="upcoming"), {"soon", "later"}),
+        (EventQuery(status="ongoing"), {"ongoing"}),
+        (EventQuery(status="past"), {"past"}),
+        (EventQuery(recurrence="weekly"), {"soon"}),
+        (EventQuery(recurrence=""), {"ongoing", "later"}),
+        (EventQuery(has_email=True), {"ongoing", "soon"}),
+        (EventQuery(has_email=False), {"past", "later"}),
+        (EventQuery(start_epoch=NOW, end_epoch=NOW + 3600), {"soon", "later"}),
+    ])
+    def test_query_events(self, store, query, expected):
+        assert {e["id"] for e in store.query_events(query)} == expected
+
+    def test_iter_query_pages(self, store):
+        store.page_size = 1
+        pages = list(store.iter_query_pages(EventQuery(status="upcoming"), ("id",)))
+        assert sorted(e["id"] for page in pages for e in page) == ["later", "soon"]
+
+    @pytest.mark.parametrize("text, expected", [
+        ("dentist", ["soon"]),
+        ("standup", ["past"]),
+        ("on", ["ongoing"]),
+        ("%", []),
+        ("missing", []),
+    ])
+    def test_search_is_case_insensitive_substring(self, store, text, expected):
+        assert [e["id"] for e in store.search_events(text)] == expected
+
+    def test_search_sees_updates(self, store):
+        store.update_event("later", {"title": "Quarterly review"})
+        assert store.search_events("quarterly", ("id",)) == [{"id": "later"}]
+
+    def test_batch_write_and_batch_get(self, store):
+        new = make_item("new", NOW, NOW + 60, created_at="t", updated_at="t")
+        assert store.batch_write([new], ["past"]) == {}
+        found = store.batch_get(["new", "past", "soon", "new"], ("id",))
+        assert found == {"new": {"id": "new"}, "soon": {"id": "soon"}}
+
+    def test_claim_reminder_once_per_occurrence(self, store):
+        assert store.claim_reminder("soon", NOW + 60) is True
+        assert store.claim_reminder("soon", NOW + 60) is False
+        assert store.claim_reminder("soon", NOW + 60 + 7 * 86400) is True  # next weekly occurrence
+        assert store.claim_reminder("nope", NOW + 60) is False
+
+    def test_claim_reminder_leaves_the_event_alone(self, store):
+        before, token = store.get_event_by_id("soon"), store.change_log.latest()
+        assert store.claim_reminder("soon", NOW + 60) is True
+        assert store.get_event_by_id("soon") == before
+        assert store.change_log.latest() == token
+
+    def test_change_log_records_writes(self, store):
+        start = store.change_log.latest()
+        store.update_event("soon", {"title": "x"})
+        store.delete_event("later")
+        records, token, has_more = store.change_log.since(start)
+        assert [(r["id"], r["op"]) for r in records] == [("soon", "update"), ("later", "delete")]
+        assert token == store.change_log.latest()
+        assert has_more is False
+
+    def test_change_log_paging_and_compaction(self, store):
+        records, token, has_more = store.change_log.since(0, limit=2)
+        assert [r["id"] for r in records] == ["past", "ongoing"] and has_more
+        store.update_event("past", {"title": "x"})
+
+        removed = store.change_log.compact(retain_seconds=3600)
+        assert removed == 1
+        records, _, _ = store.change_log.since(0)
+        assert [r["id"] for r in records] == ["ongoing", "soon", "later", "past"]
+
+        store.change_log.compact(retain_seconds=-10)
+        with pytest.raises(ChangeGone):
+            store.change_log.since(0)
+
+
+class TestReminderMarkers:
+    """Markers kept by the generic claim_reminder"""
+
+    def test_file_markers_survive_reopen(self, tmp_path):
+        path = str(tmp_path / "events.json")
+        store = FileService(path, flush_seconds=0)
+        store.create_event(make_item("a", NOW + 60))
+        assert store.claim_reminder("a", NOW + 60) is True
+        assert FileService(path, flush_seconds=0).claim_reminder("a", NOW + 60) is False
+
+    def test_expired_markers_are_dropped(self):
+        store = MemoryService()
+        store.create_event(make_item("a", NOW - 3 * 86400))
+        store.create_event(make_item("b", NOW + 60))
+        assert store.claim_reminder("a", NOW - 3 * 86400) is True
+        assert store.claim_reminder("b", NOW + 60) is True
+        assert set(store._reminders) == {"b"}
+
+
+class TestSQLiteService:
+    """SQLite specifics"""
+
+    def test_data_survives_reopen(self, tmp_path):
+        path = str(tmp_path / "events.db")
+        store = SQLiteService(path)
+        store.create_table_if_not_exists()
+        store.create_event(dict(ITEMS[0]))
+
+        reopened = SQLiteService(path)
+        assert reopened.get_event_by_id("past")["recurrence"] == "daily"
+        assert reopened.search_events("standup")[0]["id"] == "past"
+
+    def test_batch_write_is_atomic(self, tmp_path):
+        store = SQLiteService(str(tmp_path / "events.db"))
+        store.create_table_if_not_exists()
+        failures = store.batch_write([make_item("a", NOW, NOW), make_item("b", NOW, NOW, title=["unbindable"])])
+        assert set(failures) == {"a", "b"}
+        assert store.get_event_by_id("a") is None
+
+
+def test_create_event_store_rejects_unknown_backend():
+    assert isinstance(create_event_store("memory"), MemoryService)
+    with pytest.raises(ValueError):
+        create_event_store("cassandra")
+
+
+def test_backends_must_implement_the_primitives():
+    class Partial(EventStore):
+        def get_all_events(self, fields=None):
+            return []
+
+    with pytest.raises(TypeError, match="_put"):
+        Partial()
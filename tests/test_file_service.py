@@ -0,0 +1,146 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+import multiprocessing
+import threading
+import time
+from unittest.mock import patch
+
+from app.services.file_service import FileService
+from app.utils import file_io
+from tests.conftest import make_item
+
+
+def read_ids(path):
+    with open(path) as f:
+        return sorted(item["id"] for item in json.load(f))
+
+
+def create_many(path, prefix, count):
+    store = FileService(path, flush_seconds=3600)
+    for i in range(count):
+        store.create_event(make_item(f"{prefix}-{i}"))
+        if i % 7 == 0:
+            store.flush()
+    store.flush()
+
+
+class TestFileService:
+    """Tests for the locked, batched-flush JSON file backend"""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "events.json")
+
+    def test_writes_are_coalesced_into_one_flush(self, path):
+        store = FileService(path, flush_seconds=3600)
+        for i in range(50):
+            store.create_event(make_item(f"e{i}"))
+        assert not os.path.exists(path)
+
+        store.flush()
+        assert len(read_ids(path)) == 50
+        assert store.metrics()["flushes"] == 1
+        store.flush()
+        assert store.metrics()["flushes"] == 1
+
+    def test_background_flusher(self, path):
+        store = FileService(path, flush_seconds=0.01)
+        store.create_event(make_item("a"))
+        for _ in range(500):
+            if os.path.exists(path):
+                break
+            time.sleep(0.01)
+        assert read_ids(path) == ["a"]
+
+    def test_no_lost_updates_between_instances(self, path):
+        first, second = FileService(path, flush_seconds=3600), FileService(path, flush_seconds=3600)
+        first.create_event(make_item("a"))
+        second.create_event(make_item("b"))
+        first.flush()
+        second.flush()
+        assert read_ids(path) == ["a", "b"]
+
+        second.delete_event("a")
+        first.update_event("b", {"title": "renamed"})
+        second.flush()
+        first.flush()
+        assert read_ids(path) == ["b"]
+        assert second.get_event_by_id("b")["title"] == "renamed"
+        assert second.get_event_by_id("a") is None
+
+    def test_reads_see_other_instance_flushes(self, path):
+        writer, reader = FileService(path, flush_seconds=3600), FileService(path, flush_seconds=3600)
+        writer.create_event(make_item("a"))
+        assert reader.get_event_by_id("a") is None
+        writer.flush()
+        assert reader.get_event_by_id("a")["title"] == "a"
+
+    def test_change_log_is_shared(self, path):
+        first, second = FileService(path, flush_seconds=3600), FileService(path, flush_seconds=3600)
+        first.create_event(make_item("a"))
+        second.create_event(make_item("b"))
+
+        assert first.change_log.latest() == 1  # flushes first's queue only
+        records, token, _ = second.change_log.since(0)
+        assert [(r["seq"], r["id"]) for r in records] == [(1, "a"), (2, "b")]
+        assert first.change_log.since(1)[0][0]["id"] == "b"
+
+    def test_failed_flush_keeps_writes_queued(self, path):
+        store = FileService(path, flush_seconds=3600)
+        store.create_event(make_item("a"))
+        with patch("app.services.file_service.atomic_write_json", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                store.flush()
+        store.create_event(make_item("b"))
+        store.flush()
+        assert read_ids(path) == ["a", "b"]
+        assert [r["id"] for r in store.change_log.since(0)[0]] == ["a", "b"]
+
+    def test_file_stays_readable_by_file_io(self, path):
+        store = FileService(path, flush_seconds=3600)
+        store.create_event(make_item("a"))
+        store.flush()
+        with patch.object(file_io, "EVENT_FILE_PATH", path):
+            assert [event.id for event in file_io.load_events()] == ["a"]
+
+    def test_flush_shares_the_save_events_lock(self, path):
+        store = FileService(path, flush_seconds=3600)
+        store.create_event(make_item("a"))
+        with file_io.locked(path):  # as save_events holds it
+            flusher = threading.Thread(target=store.flush)
+            flusher.start()
+            flusher.join(0.2)
+            assert flusher.is_alive() and not os.path.exists(path)
+        flusher.join(5)
+        assert read_ids(path) == ["a"]
+        assert not os.path.exists(path + ".lock.lock")
+
+    @pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+    def test_concurrent_processes(self, path):
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=create_many, args=(path, f"p{n}", 30)) for n in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+        assert [worker.exitcode for worker in workers] == [0, 0, 0, 0]
+
+        assert len(read_ids(path)) == 120
+        records, _, _ = FileService(path).change_log.since(0, limit=1000)
+        assert sorted(r["seq"] for r in records) == list(range(1, 121))
+
+
+class TestFileIO:
+    """Tests for the locked, atomic save_events"""
+
+    def test_save_events_replaces_atomically(self, tmp_path):
+        path = str(tmp_path / "events.json")
+        with patch.object(file_io, "EVENT_FILE_PATH", path):
+            with patch("app.utils.file_io.json.dump", side_effect=ValueError("boom")):
+                with pytest.raises(ValueError):
+                    file_io.save_events([])
+            assert not os.path.exists(path)
+            assert os.listdir(tmp_path) == ["events.json.lock"]
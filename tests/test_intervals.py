@@ -0,0 +1,218 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+import random
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+from app import create_app
+from app.services import event_service
+from app.services.event_index import EventIndex
+from app.services.intervals import IntervalTree, merge_intervals, occurrences, overlapping_pairs, span
+from app.services.memory_service import MemoryService
+from tests.conftest import make_item
+
+DAY = 86400
+HOUR = 3600
+DAY_START = int(datetime(2025, 6, 16).timestamp())
+NOW = DAY_START + 12 * HOUR
+OWNER = "a@example.com"
+
+
+class TestIntervals:
+    """Tests for recurrence expansion, the interval tree and the overlap sweep"""
+
+    def test_back_to_back_events_do_not_overlap(self):
+        assert span(0, 10) == (0, 10)
+        assert span(5, 5) == (5, 6)
+        assert IntervalTree([(0, 10, "a")]).overlapping(10, 20) == []
+
+    def test_occurrences_start_at_the_window(self):
+        spans = list(occurrences(0, HOUR, "daily", 3 * DAY + 10, 6 * DAY))
+        assert spans == [(3 * DAY, 3 * DAY + HOUR), (4 * DAY, 4 * DAY + HOUR), (5 * DAY, 5 * DAY + HOUR)]
+        assert list(occurrences(10 * DAY, 10 * DAY + 1, "weekly", 0, DAY)) == []
+        assert list(occurrences(0, HOUR, None, DAY, 2 * DAY)) == []
+        assert list(occurrences(0, HOUR, None, 0, DAY)) == [(0, HOUR)]
+
+    def test_tree_matches_brute_force(self):
+        rng = random.Random(7)
+        intervals = []
+        for key in range(300):
+            start = rng.randrange(10_000)
+            intervals.append((start, start + rng.randrange(1, 500), key))
+        tree = IntervalTree(intervals[:150])
+        for start, end, key in intervals[150:]:
+            tree.add(start, end, key)
+        for key in range(0, 300, 3):
+            tree.remove(key)
+        live = [interval for interval in intervals if interval[2] % 3]
+        for _ in range(200):
+            start = rng.randrange(10_000)
+            end = start + rng.randrange(1, 300)
+            expected = sorted(i for i in live if i[0] < end and i[1] > start)
+            assert sorted(tree.overlapping(start, end)) == expected
+
+    def test_merge_joins_overlapping_and_touching_spans(self):
+        assert merge_intervals([(20, 30), (0, 10), (5, 12), (12, 15), (25, 26), (40, 41)]) == [
+            (0, 15), (20, 30), (40, 41)]
+        assert merge_intervals([]) == []
+
+    def test_overlapping_pairs_sweep(self):
+        intervals = [(0, 10, "a"), (5, 15, "b"), (12, 20, "c"), (20, 30, "d"), (21, 22, "d")]
+        pairs = [(x[2], y[2]) for x, y in overlapping_pairs(intervals)]
+        assert pairs == [("a", "b"), ("b", "c")]
+
+
+class TestEventIndexConflicts:
+    """Tests for per-owner conflict detection in the event index"""
+
+    @pytest.fixture
+    def index(self):
+        items = [
+            make_item("standup", DAY_START + 9 * HOUR, DAY_START + 9 * HOUR + 900, recurrence="daily", email=OWNER),
+            make_item("review", DAY_START + 2 * DAY + 14 * HOUR, DAY_START + 2 * DAY + 15 * HOUR, email=OWNER),
+            make_item("elsewhere", DAY_START + 2 * DAY + 14 * HOUR, DAY_START + 2 * DAY + 15 * HOUR,
+                      email="b@example.com"),
+            make_item("nobody", DAY_START + 2 * DAY + 14 * HOUR, DAY_START + 2 * DAY + 15 * HOUR, email=None),
+        ]
+        return EventIndex(lambda: list(items), horizon_seconds=30 * DAY)
+
+    def test_one_off_overlap(self, index):
+        start = DAY_START + 2 * DAY + 14 * HOUR + 1800
+        found = index.find_conflicts("A@example.com", start, start + HOUR, now=NOW)
+        assert [(c["id"], c["start"], c["end"]) for c in found] == [("review", start, start + 1800)]
+        assert index.find_conflicts("a@example.com", start + 1800, start + HOUR, now=NOW) == []
+        assert index.find_conflicts(None, start, start + HOUR, now=NOW) == []
+
+    def test_recurring_occurrences_are_checked(self, index):
+        tenth_day = DAY_START + 10 * DAY + 9 * HOUR + 600
+        assert [c["id"] for c in index.find_conflicts("a@example.com", tenth_day, tenth_day + 60, now=NOW)] \
+            == ["standup"]
+        weekly = DAY_START + 2 * DAY + 14 * HOUR - 7 * DAY
+        assert [c["id"] for c in index.find_conflicts("a@example.com", weekly, weekly + 60, "weekly", now=NOW)] \
+            == ["review"]
+
+    def test_own_id_is_excluded(self, index):
+        start = DAY_START + 2 * DAY + 14 * HOUR
+        assert index.find_conflicts("a@example.com", start, start + HOUR, exclude_id="review", now=NOW) == []
+
+    def test_writes_update_the_trees(self, index):
+        start = DAY_START + 3 * DAY + 9 * HOUR
+        assert [c["id"] for c in index.find_conflicts("a@example.com", start, start + 60, now=NOW)] == ["standup"]
+        index.upsert(make_item("standup", DAY_START + 9 * HOUR, DAY_START + 9 * HOUR + 900,
+                               email="b@example.com", recurrence="daily"))
+        index.upsert(make_item("lunch", start, start + HOUR, email=OWNER))
+        assert [c["id"] for c in index.find_conflicts("a@example.com", start, start + 60, now=NOW)] == ["lunch"]
+        assert [c["id"] for c in index.find_conflicts("b@example.com", start, start + 60, now=NOW)] == ["standup"]
+        index.remove("lunch")
+        assert index.find_conflicts("a@example.com", start, start + 60, now=NOW) == []
+
+    def test_lists_upcoming_clashes_per_pair(self, index):
+        index.ensure_loaded()
+        index.upsert(make_item("breakfast", DAY_START + 8 * HOUR, DAY_START + 9 * HOUR + 60, recurrence="daily",
+                               email=OWNER))
+        clashes = index.conflicts(now=NOW)
+        assert [(c["email"], c["ids"], c["occurrences"]) for c in clashes] == [
+            ("a@example.com", ["breakfast", "standup"], 29)]
+        assert clashes[0]["start"] == DAY_START + DAY + 9 * HOUR  # today's has passed
+        assert index.conflicts("b@example.com", now=NOW) == []
+
+
+class TestFreeBusy:
+    """Tests for merged busy intervals"""
+
+    @pytest.fixture
+    def index(self):
+        items = [
+            make_item("standup", DAY_START + 9 * HOUR, DAY_START + 9 * HOUR + 900, recurrence="daily", email=OWNER),
+            make_item("planning", DAY_START + DAY + 9 * HOUR + 600, DAY_START + DAY + 10 * HOUR, email=OWNER),
+            make_item("review", DAY_START + DAY + 10 * HOUR, DAY_START + DAY + 11 * HOUR, email=OWNER),
+            make_item("overnight", DAY_START + DAY - HOUR, DAY_START + DAY + HOUR, email=OWNER),
+            make_item("elsewhere", DAY_START + DAY + 13 * HOUR, DAY_START + DAY + 14 * HOUR, email="b@example.com"),
+        ]
+        return EventIndex(lambda: list(items))
+
+    def test_busy_is_merged_clipped_and_expanded(self, index):
+        day = DAY_START + DAY
+        assert index.busy("a@example.com", day, day + DAY) == [
+            (day, day + HOUR),                  # overnight, clipped to the range
+            (day + 9 * HOUR, day + 11 * HOUR),  # standup, planning and review joined
+        ]
+        assert index.busy("A@EXAMPLE.COM", day + 10 * DAY, day + 11 * DAY) == [
+            (day + 10 * DAY + 9 * HOUR, day + 10 * DAY + 9 * HOUR + 900)]
+        assert index.busy("c@example.com", day, day + DAY) == []
+
+    def test_busy_follows_writes(self, index):
+        day = DAY_START + DAY
+        index.ensure_loaded()
+        index.remove("standup")
+        index.upsert(make_item("elsewhere", day + 13 * HOUR, day + 14 * HOUR, email=OWNER))
+        assert index.busy("a@example.com", day + 2 * HOUR, day + DAY) == [
+            (day + 9 * HOUR + 600, day + 11 * HOUR), (day + 13 * HOUR, day + 14 * HOUR)]
+        assert index.busy("b@example.com", day, day + DAY) == []
+
+
+class TestConflictRoutes:
+    """Tests for ?check_conflicts= and GET /api/events/conflicts"""
+
+    @pytest.fixture
+    def client(self):
+        store = MemoryService()
+        start = int(time.time()) + DAY
+        store.batch_write([make_item("existing", start, start + HOUR, email=OWNER)])
+        event_service.event_index.invalidate()
+        with patch.object(event_service, "db_service", store), \
+                patch.object(event_service.event_index, "_loader", store.get_all_events):
+            app = create_app()
+            app.config['TESTING'] = True
+            yield app.test_client(), start
+        event_service.event_index.invalidate()
+
+    def body(self, start, **extra):
+        return dict({"title": "New", "description": "", "email": "a@example.com",
+                     "start_time": datetime.fromtimestamp(start + 1800).isoformat(),
+                     "end_time": datetime.fromtimestamp(start + 2 * HOUR).isoformat()}, **extra)
+
+    def test_create_is_refused_when_asked(self, client):
+        client, start = client
+        response = client.post('/api/events/?check_conflicts=true', json=self.body(start))
+        assert response.status_code == 409
+        assert [c["id"] for c in json.loads(response.data)["conflicts"]] == ["existing"]
+        assert client.post('/api/events/', json=self.body(start)).status_code == 201
+
+        clashes = json.loads(client.get('/api/events/conflicts?email=a@example.com').data)
+        assert len(clashes) == 1 and "existing" in clashes[0]["ids"]
+        assert clashes[0]["start"] == datetime.fromtimestamp(start + 1800).isoformat()
+
+    def test_update_excludes_itself(self, client):
+        client, start = client
+        body = self.body(start, title="Moved")
+        assert client.put('/api/events/existing?check_conflicts=true', json=body).status_code == 200
+        assert client.patch('/api/events/existing?check_conflicts=yes', json={"title": "Renamed"}).status_code == 200
+
+    def test_invalid_flag(self, client):
+        client, start = client
+        assert client.post('/api/events/?check_conflicts=maybe', json=self.body(start)).status_code == 400
+        assert client.put('/api/events/existing?check_conflicts=maybe', json=self.body(start)).status_code == 400
+
+    def test_free_busy_endpoint(self, client):
+        client, start = client
+        response = client.get('/api/events/freebusy', query_string={
+            "email": "a@example.com", "from": datetime.fromtimestamp(start - DAY).isoformat(),
+            "to": datetime.fromtimestamp(start + DAY).isoformat()})
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["busy"] == [{"start": datetime.fromtimestamp(start).isoformat(),
+                                 "end": datetime.fromtimestamp(start + HOUR).isoformat()}]
+
+    def test_free_busy_validation(self, client):
+        client, _ = client
+        for query in ("from=2025-01-01T00:00:00&to=2025-01-02T00:00:00",
+                      "email=a@example.com&from=2025-01-01T00:00:00",
+                      "email=a@example.com&from=2025-01-02T00:00:00&to=2025-01-01T00:00:00",
+                      "email=a@example.com&from=2020-01-01T00:00:00&to=2025-01-01T00:00:00",
+                      "email=a@example.com&from=yesterday&to=2025-01-01T00:00:00"):
+            assert client.get(f'/api/events/freebusy?{query}').status_code == 400
@@ -0,0 +1,164 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+import multiprocessing
+import threading
+import time
+
+from app.services.change_log import ChangeGone
+from app.services.journal_service import JournalLocked, JournalService
+from tests.conftest import make_item
+
+
+def journal_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestJournalService:
+    """Tests for the append-only journal backend"""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "events.jsonl")
+
+    def test_each_write_appends_one_line(self, path):
+        store = JournalService(path)
+        store.create_event(make_item("a"))
+        store.update_event("a", {"title": "renamed"})
+        store.delete_event("a")
+
+        lines = journal_lines(path)
+        assert [(line["seq"], line["op"], line["id"]) for line in lines] == [
+            (1, "create", "a"), (2, "update", "a"), (3, "delete", "a")]
+        assert lines[1]["event"]["title"] == "renamed"
+        assert "event" not in lines[2]
+
+    def test_replay_restores_events_and_change_log(self, path):
+        store = JournalService(path)
+        store.create_event(make_item("a"))
+        store.create_event(make_item("b"))
+        store.update_event("a", {"title": "renamed"})
+        store.delete_event("b")
+        store.close()
+
+        reopened = JournalService(path)
+        assert [e["id"] for e in reopened.get_all_events()] == ["a"]
+        assert reopened.get_event_by_id("a")["title"] == "renamed"
+        assert reopened.change_log.latest() == 4
+        records, _, _ = reopened.change_log.since(2)
+        assert [(r["id"], r["op"]) for r in records] == [("a", "update"), ("b", "delete")]
+
+    def test_torn_tail_is_discarded(self, path):
+        store = JournalService(path)
+        store.create_event(make_item("a"))
+        with open(path, "ab") as f:
+            f.write(b'{"seq":2,"op":"create","id":"b","ev')
+        store.close()
+
+        reopened = JournalService(path)
+        assert reopened.get_event_by_id("b") is None
+        reopened.create_event(make_item("c"))
+        assert [line["id"] for line in journal_lines(path)] == ["a", "c"]
+
+    def test_concurrent_writers_share_fsyncs(self, path):
+        store = JournalService(path)
+        threads = [threading.Thread(target=lambda i=i: store.create_event(make_item(f"e{i}"))) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = store.metrics()
+        assert stats["appends"] == 20
+        assert 1 <= stats["fsyncs"] <= 20
+        store.close()
+        assert len(JournalService(path).get_all_events()) == 20
+
+    def test_no_fsync_when_sync_disabled(self, path):
+        store = JournalService(path, sync=False)
+        store.create_event(make_item("a"))
+        assert store.metrics()["fsyncs"] == 0
+
+    def test_compaction_drops_superseded_lines(self, path):
+        store = JournalService(path)
+        store.create_event(make_item("a"))
+        store.create_event(make_item("b"))
+        for i in range(5):
+            store.update_event("a", {"title": f"v{i}"})
+        store.delete_event("b")
+
+        assert store.compact_journal(retain_seconds=3600) == 6
+        lines = journal_lines(path)
+        assert lines[0] == {"last_seq": 8, "compacted_through": 0}
+        assert [(line["id"], line["op"]) for line in lines[1:]] == [("a", "update"), ("b", "delete")]
+        store.close()
+
+        reopened = JournalService(path)
+        assert reopened.get_event_by_id("a")["title"] == "v4"
+        assert reopened.get_event_by_id("b") is None
+        assert reopened.change_log.latest() == 8
+
+    def test_expired_history_survives_compaction_and_restart(self, path):
+        store = JournalService(path)
+        store.create_event(make_item("a"))
+        store.create_event(make_item("b"))
+        store.delete_event("b")
+
+        store.compact_journal(retain_seconds=-10)
+        store.close()
+        reopened = JournalService(path)
+        assert [e["id"] for e in reopened.get_all_events()] == ["a"]
+        with pytest.raises(ChangeGone):
+            reopened.change_log.since(0)
+        assert reopened.change_log.since(3) == ([], 3, False)
+
+        reopened.create_event(make_item("c"))
+        assert [line["seq"] for line in journal_lines(path) if "seq" in line] == [4]
+
+    def test_background_compaction_triggers(self, path):
+        store = JournalService(path, compact_min_records=10)
+        store.create_event(make_item("a"))
+        for i in range(20):
+            store.update_event("a", {"title": f"v{i}"})
+        deadline = time.time() + 5
+        while store.metrics()["compactions"] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert store.metrics()["compactions"] >= 1
+        store.close()
+        assert JournalService(path).get_event_by_id("a")["title"] == "v19"
+
+    def test_second_process_is_refused(self, path):
+        store = JournalService(path)
+        with pytest.raises(JournalLocked):
+            JournalService(path)
+        store.close()
+        JournalService(path).close()
+
+    @pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+    def test_only_one_forked_worker_gets_the_journal(self, path):
+        store = JournalService(path)
+        context = multiprocessing.get_context("fork")
+        first_up, results = context.Event(), context.Queue()
+
+        def worker(wait_for_first):
+            if wait_for_first:
+                first_up.wait(5)
+            try:
+                store.reconnect()
+                results.put("ok")
+            except JournalLocked:
+                results.put("locked")
+            first_up.set()
+            time.sleep(0.5)  # keep the lock while the other worker tries
+
+        workers = [context.Process(target=worker, args=(n > 0,)) for n in range(2)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(10)
+        assert sorted(results.get(timeout=1) for _ in workers) == ["locked", "ok"]
+        store.close()
@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+from app import create_app
+from app.utils import json_provider
+from app.utils.json_provider import EventJSONProvider
+
+
+class TestEventJSONProvider:
+    """Tests for the Decimal-aware JSON provider"""
+
+    PAYLOAD = {
+        "whole": Decimal("1751364000"),
+        "fraction": Decimal("1.5"),
+        "when": datetime(2025, 7, 1, 10, 0),
+        "tags": {"a"},
+    }
+    EXPECTED = {"whole": 1751364000, "fraction": 1.5, "when": "2025-07-01T10:00:00", "tags": ["a"]}
+
+    @pytest.fixture
+    def app(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        return app
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_encodes_dynamodb_types(self, app, use_orjson):
+        """Both the orjson and stdlib paths produce the same JSON."""
+        orjson = json_provider.orjson if use_orjson else None
+        if use_orjson and orjson is None:
+            pytest.skip("orjson not installed")
+        with patch.object(json_provider, "orjson", orjson):
+            encoded = EventJSONProvider(app).dumps(self.PAYLOAD)
+        assert json.loads(encoded) == self.EXPECTED
+
+    def test_rejects_unknown_types(self, app):
+        with pytest.raises(TypeError):
+            EventJSONProvider(app).dumps({"obj": object()})
+
+    def test_installed_on_app(self, app):
+        """Responses emit numbers, not strings, for DynamoDB Decimals."""
+        item = {"id": "1", "title": "t", "start_epoch": Decimal("1751364000")}
+        with patch('app.services.dynamodb_service.DynamoDBService.get_event_by_id', return_value=item):
+            response = app.test_client().get('/api/events/1')
+        assert json.loads(response.data)["start_epoch"] == 1751364000
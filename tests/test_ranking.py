@@ -0,0 +1,128 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+from unittest.mock import patch
+
+from app import create_app
+from app.services import event_service
+from app.services.event_index import EventIndex
+from app.services.memory_service import MemoryService
+from app.services.ranking import TermStats, score, tokenize, top_k
+from tests.conftest import make_item
+
+ITEMS = [
+    make_item("body", title="Weekly sync", description="Budget review with finance"),
+    make_item("title", title="Budget review", description="Weekly meeting"),
+    make_item("long", title="Offsite",
+              description="Agenda: budget, hiring, roadmap, retro, planning, travel and lunch"),
+    make_item("other", title="Dentist", description="Check-up"),
+]
+
+
+def stats_for(items, terms):
+    stats = TermStats()
+    for item in items:
+        stats.add(item)
+    return stats.for_terms(terms)
+
+
+class TestScoring:
+    """Tests for field-weighted BM25"""
+
+    def test_title_match_outranks_description_match(self):
+        stats = stats_for(ITEMS, ["budget"])
+        assert score(ITEMS[1], ["budget"], stats) > score(ITEMS[0], ["budget"], stats)
+
+    def test_shorter_field_outranks_longer(self):
+        stats = stats_for(ITEMS, ["budget"])
+        assert score(ITEMS[0], ["budget"], stats) > score(ITEMS[2], ["budget"], stats) > 0
+
+    def test_rarer_terms_weigh_more(self):
+        items = [make_item(event_id, title=title)
+                 for event_id, title in (("a", "Alpha beta"), ("b", "Alpha gamma"), ("c", "Alpha delta"))]
+        stats = stats_for(items, ["alpha", "beta"])
+        assert stats.document_frequency["title"] == {"alpha": 3, "beta": 1}
+        assert score(items[0], ["beta"], stats) > score(items[0], ["alpha"], stats) > 0
+
+    def test_partial_words_score_like_the_substring_search(self):
+        stats = stats_for(ITEMS, ["budg"])
+        assert score(ITEMS[1], ["budg"], stats) > 0
+        assert score(ITEMS[3], ["budg"], stats) == 0
+
+    def test_stats_are_removed_as_they_were_added(self):
+        stats = TermStats()
+        for item in ITEMS:
+            stats.add(item)
+        for item in ITEMS:
+            stats.add(item, -1)
+        assert stats.documents == 0
+        assert stats.for_terms(["budget"]).document_frequency["title"] == {"budget": 0}
+        assert stats._frequency == {"title": {}, "description": {}}
+
+    def test_top_k_keeps_the_best_in_order(self):
+        terms = tokenize("Budget")
+        stats = stats_for(ITEMS, terms)
+        best = top_k([ITEMS[:2], ITEMS[2:]], terms, stats, 2)
+        assert [event_id for _, event_id in best] == ["title", "body"]
+        assert best[0][0] >= best[1][0]
+
+
+class TestEventIndexTermStats:
+    """The event index keeps term statistics in step with writes"""
+
+    def test_writes_after_first_use_are_applied(self):
+        index = EventIndex(lambda: [make_item("a", title="Budget"), make_item("b", title="Budget review")])
+        assert index.term_stats(["budget"]).document_frequency["title"]["budget"] == 2
+        index.upsert(make_item("a", title="Planning"))
+        index.remove("b")
+        stats = index.term_stats(["budget", "planning"])
+        assert stats.documents == 1
+        assert stats.document_frequency["title"] == {"budget": 0, "planning": 1}
+        assert stats.average_length["title"] == 1
+
+
+class TestRankedSearch:
+    """Tests for search_ranked and GET /api/events/search?rank=bm25"""
+
+    @pytest.fixture
+    def store(self):
+        store = MemoryService()
+        store.batch_write(ITEMS)
+        event_service.event_index.invalidate()
+        with patch.object(event_service, "db_service", store), \
+                patch.object(event_service.event_index, "_loader", store.get_all_events):
+            yield store
+        event_service.event_index.invalidate()
+
+    @pytest.fixture
+    def client(self, store):
+        app = create_app()
+        app.config['TESTING'] = True
+        return app.test_client()
+
+    def test_returns_top_limit_with_scores(self, store):
+        results = event_service.search_ranked("budget", limit=2)
+        assert [r["id"] for r in results] == ["title", "body"]
+        assert results[0]["score"] >= results[1]["score"] > 0
+        assert results[0]["description"] == "Weekly meeting"
+
+    def test_fetches_only_the_winners(self, store):
+        with patch.object(store, "batch_get", wraps=store.batch_get) as batch_get:
+            results = event_service.search_ranked("budget", limit=1, fields=["id", "title"])
+        batch_get.assert_called_once_with(["title"], ["id", "title"])
+        assert results == [{"id": "title", "title": "Budget review", "score": results[0]["score"]}]
+
+    def test_no_matches(self, store):
+        assert event_service.search_ranked("nothing like this") == []
+
+    def test_ranked_search_endpoint(self, client):
+        response = client.get('/api/events/search?q=budget&rank=bm25&limit=3')
+        assert response.status_code == 200
+        assert [r["id"] for r in json.loads(response.data)] == ["title", "body", "long"]
+
+    def test_invalid_rank_parameters(self, client):
+        assert client.get('/api/events/search?q=budget&rank=tfidf').status_code == 400
+        assert client.get('/api/events/search?q=budget&rank=bm25&limit=0').status_code == 400
+        assert client.get('/api/events/search?q=budget&rank=bm25&stream=ndjson').status_code == 400
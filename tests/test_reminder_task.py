@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from app.services import event_service
+from app.services.memory_service import MemoryService
+from app.tasks import reminder_task
+from app.tasks.reminder_task import acquire_reminder_lock, send_due_reminders
+
+
+class TestReminderLeaderLock:
+    """Tests for reminder leader election via the lock file"""
+
+    @pytest.fixture
+    def lock_path(self, tmp_path):
+        return str(tmp_path / "reminder.lock")
+
+    def test_first_process_acquires_lock(self, lock_path):
+        """The first contender becomes the reminder leader."""
+        lock_file = acquire_reminder_lock(lock_path)
+        assert lock_file is not None
+        lock_file.close()
+
+    def test_second_contender_is_rejected(self, lock_path):
+        """Only one holder of the lock file at a time."""
+        leader = acquire_reminder_lock(lock_path)
+        try:
+            assert acquire_reminder_lock(lock_path) is None
+        finally:
+            leader.close()
+
+    def test_lock_is_released_when_leader_exits(self, lock_path):
+        """A new leader can take over once the old one releases the lock."""
+        leader = acquire_reminder_lock(lock_path)
+        leader.close()
+        successor = acquire_reminder_lock(lock_path)
+        assert successor is not None
+        successor.close()
+
+
+class TestReminderDelivery:
+    """Reminders are marked as sent in storage, not just in the sending process"""
+
+    @pytest.fixture
+    def store(self):
+        store = MemoryService()
+        start = datetime.now().replace(microsecond=0) + timedelta(minutes=30)
+        store.create_event({"id": "a", "title": "Standup", "description": "", "start_time": start.isoformat(),
+                            "end_time": (start + timedelta(minutes=15)).isoformat(), "recurrence": None,
+                            "email": "a@example.com"})
+        with patch.object(event_service, "db_service", store), patch.object(reminder_task, "seen_reminders", set()), \
+                patch("app.tasks.reminder_task.send_email") as send_email:
+            yield store, send_email
+
+    def test_sent_once_across_processes(self, store):
+        store, send_email = store
+        send_due_reminders()
+        send_due_reminders()
+        reminder_task.seen_reminders.clear()  # a restarted or newly elected leader
+        send_due_reminders()
+
+        assert send_email.call_count == 1
+        assert store.claim_reminder("a", int(datetime.fromisoformat(
+            store.get_event_by_id("a")["start_time"]).timestamp())) is False
+
+    def test_failed_claim_is_retried(self, store):
+        store, send_email = store
+        with patch.object(store, "claim_reminder", side_effect=Exception("throttled")):
+            with pytest.raises(Exception):
+                send_due_reminders()
+        send_due_reminders()
+        assert send_email.call_count == 1
@@ -0,0 +1,80 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from unittest.mock import patch
+
+from app.services import event_service
+from app.services.memory_service import MemoryService
+from app.utils.cache import GenerationLRU
+from tests.conftest import make_item
+
+
+class TestGenerationLRU:
+    """Tests for the generation-keyed LRU"""
+
+    def test_hit_requires_same_generation(self):
+        cache = GenerationLRU(4)
+        cache.put("q", 1, ["a"])
+        assert cache.get("q", 1) == ["a"]
+        assert cache.get("q", 2) is None
+        assert cache.get("q", 1) is None  # the stale entry was dropped
+        assert cache.metrics()["hits"] == 1 and cache.metrics()["stale"] == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = GenerationLRU(2)
+        cache.put("a", 0, 1)
+        cache.put("b", 0, 2)
+        cache.get("a", 0)
+        cache.put("c", 0, 3)
+        assert cache.get("b", 0) is None
+        assert cache.get("a", 0) == 1 and cache.get("c", 0) == 3
+        assert cache.metrics()["evictions"] == 1
+
+    def test_hit_rate_and_disabled_cache(self):
+        cache = GenerationLRU(0)
+        cache.put("a", 0, 1)
+        assert cache.get("a", 0) is None
+        assert cache.metrics()["hit_rate"] == 0.0
+        assert GenerationLRU(1).metrics()["hit_rate"] == 0.0
+
+
+class TestSearchCache:
+    """search_event reuses result ids until the next write"""
+
+    @pytest.fixture
+    def store(self):
+        store = MemoryService()
+        store.batch_write([make_item("a", title="Team standup"), make_item("b", title="Dentist"),
+                           make_item("c", title="Standup notes")])
+        event_service.search_cache.clear()
+        with patch.object(event_service, "db_service", store):
+            yield store
+        event_service.search_cache.clear()
+
+    def test_repeat_query_skips_the_search(self, store):
+        first = event_service.search_event("standup")
+        with patch.object(store, "search_events", side_effect=AssertionError("should be cached")):
+            assert event_service.search_event("STANDUP") == first
+            assert event_service.search_event("standup", ("id",)) == [{"id": "a"}, {"id": "c"}]
+
+    def test_write_invalidates(self, store):
+        event_service.search_event("standup")
+        event_service.create_event({"title": "Standup retro", "description": "", "start_time": "2025-02-01T00:00:00",
+                                    "end_time": "2025-02-01T01:00:00"})
+        assert len(event_service.search_event("standup")) == 3
+
+    def test_write_by_another_worker_invalidates(self, store):
+        event_service.search_event("standup")
+        store.create_event(make_item("d", title="Standup retro"))  # straight to the shared store
+        assert [e["id"] for e in event_service.search_event("standup")] == ["a", "c", "d"]
+
+    def test_no_change_token_skips_the_cache(self, store):
+        with patch.object(store.change_log, "latest", side_effect=Exception("down")):
+            event_service.search_event("standup")
+            assert event_service.search_cache.metrics()["size"] == 0
+
+    def test_unseen_delete_falls_back_to_search(self, store):
+        event_service.search_event("standup")
+        store.delete_event("a")  # e.g. made by another worker
+        assert [e["id"] for e in event_service.search_event("standup")] == ["c"]
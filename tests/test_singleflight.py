@@ -0,0 +1,122 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import threading
+import time
+from unittest.mock import MagicMock
+
+from app.services.dynamodb_service import DynamoDBService
+from app.utils.singleflight import SingleFlight, share_items
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_concurrently(flight, request, waiters=4):
+    """Start a leader blocked inside ``request()``, then ``waiters`` identical callers"""
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(request())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call, daemon=True) for _ in range(waiters + 1)]
+    threads[0].start()
+    wait_for(lambda: flight.metrics()["in_flight"] == 1)
+    for thread in threads[1:]:
+        thread.start()
+    wait_for(lambda: flight.metrics()["calls"] == waiters + 1)
+    return threads, results, errors
+
+
+class TestSingleFlight:
+    """Tests for request coalescing"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight, release = SingleFlight(), threading.Event()
+        fn = MagicMock(side_effect=lambda: release.wait() and "result")
+        threads, results, errors = run_concurrently(flight, lambda: flight.do("k", fn))
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert fn.call_count == 1
+        assert results == ["result"] * 5 and errors == []
+        assert flight.metrics() == {"calls": 5, "executions": 1, "collapsed": 4, "in_flight": 0}
+
+    def test_every_caller_gets_its_own_copy(self):
+        flight, release = SingleFlight(), threading.Event()
+        original = [{"id": "a"}]
+
+        def request():
+            items = flight.do("k", lambda: release.wait() and original, share_items)
+            items[0]["title"] = "changed"  # callers may modify what they get
+            return items
+
+        threads, results, errors = run_concurrently(flight, request)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert errors == [] and len({id(items[0]) for items in results}) == 5
+        assert all(item is not original[0] for items in results for item in items)
+        assert original == [{"id": "a"}]
+
+    def test_errors_reach_every_waiter(self):
+        flight, release = SingleFlight(), threading.Event()
+
+        def fail():
+            release.wait()
+            raise RuntimeError("scan failed")
+
+        threads, results, errors = run_concurrently(flight, lambda: flight.do("k", fail), waiters=2)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert results == [] and [str(e) for e in errors] == ["scan failed"] * 3
+
+    def test_sequential_calls_are_not_cached(self):
+        flight = SingleFlight()
+        fn = MagicMock(return_value=1)
+        flight.do("k", fn)
+        flight.do("k", fn)
+        assert fn.call_count == 2
+        assert flight.metrics()["collapsed"] == 0
+
+    def test_different_keys_run_separately(self):
+        flight = SingleFlight()
+        assert [flight.do(k, lambda k=k: k * 2) for k in (1, 2)] == [2, 4]
+
+
+class TestDynamoDBCoalescing:
+    """Concurrent identical reads on DynamoDBService share a scan"""
+
+    def test_concurrent_get_all_events_scan_once(self):
+        service = DynamoDBService()
+        service.table = MagicMock()
+        release = threading.Event()
+        service.table.scan.side_effect = lambda **kwargs: release.wait() and {"Items": [{"id": "a", "start_epoch": 1}]}
+
+        threads, results, _ = run_concurrently(service.flights, service.get_all_events)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert service.table.scan.call_count == 1
+        assert results == [[{"id": "a", "start_epoch": 1}]] * 5
+        # Waiters get their own copies of the items
+        assert len({id(items[0]) for items in results}) == 5
+
+    def test_search_key_ignores_case(self):
+        service = DynamoDBService()
+        service.flights = MagicMock()
+        service.search_events("Standup")
+        service.search_events("standup", ["id"])
+        keys = [call.args[0] for call in service.flights.do.call_args_list]
+        assert keys == [("search", "standup", None), ("search", "standup", ("id",))]
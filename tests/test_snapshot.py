@@ -0,0 +1,154 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from app.services.change_log import ChangeGone
+from app.services import event_service
+from app.services.event_index import EventIndex
+from app.services.memory_service import MemoryService
+from app.services.snapshot import Snapshot, open_snapshot, write_snapshot
+from tests.conftest import make_item
+
+NOW = 1_750_000_000
+
+
+ITEMS = [
+    make_item("past", NOW - 7200, NOW - 3600, recurrence="daily"),
+    make_item("ongoing", NOW - 600, NOW + 600, email="a@example.com", description="Café ☕"),
+    make_item("soon", NOW + 60, NOW + 120, recurrence="weekly", email="b@example.com"),
+    make_item("later", NOW + 3600, NOW + 7200),
+]
+
+
+def columns(items):
+    return (np.array([i["start_epoch"] for i in items], dtype=np.int64),
+            np.array([i["end_epoch"] for i in items], dtype=np.int64))
+
+
+class TestSnapshotFile:
+    """Tests for the binary snapshot format"""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "events.snapshot")
+
+    def test_round_trip(self, path):
+        write_snapshot(path, ITEMS, *columns(ITEMS), token=42, identity="sqlite:/data/events.db")
+        snapshot = Snapshot(path)
+
+        assert snapshot.count == 4 and snapshot.token == 42
+        assert snapshot.identity == "sqlite:/data/events.db"
+        assert snapshot.ids() == ["past", "ongoing", "soon", "later"]
+        assert list(snapshot.start) == [i["start_epoch"] for i in ITEMS]
+        assert snapshot.recurrences == ["", "daily", "weekly"]
+        assert list(snapshot.recurrence) == [1, 0, 2, 0]
+        assert list(snapshot.has_email) == [False, True, True, False]
+        assert [snapshot.item(row) for row in range(4)] == ITEMS
+
+    def test_absent_fields_stay_absent(self, path):
+        item = {"id": "bare", "start_epoch": NOW, "end_epoch": NOW + 1}
+        write_snapshot(path, [item], *columns([item]), token=1)
+        assert Snapshot(path).item(0) == dict(item, recurrence=None, email=None)
+
+    def test_empty_snapshot(self, path):
+        write_snapshot(path, [], *columns([]), token=0)
+        snapshot = Snapshot(path)
+        assert snapshot.count == 0 and snapshot.ids() == []
+
+    def test_unreadable_files_are_ignored(self, path, tmp_path):
+        assert open_snapshot(str(tmp_path / "missing")) is None
+        with open(path, "wb") as f:
+            f.write(b"not a snapshot at all, just some bytes")
+        assert open_snapshot(path) is None
+
+
+class TestIndexWarmStart:
+    """Tests for loading the event index from a snapshot and catching up"""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = str(tmp_path / "events.snapshot")
+        write_snapshot(path, ITEMS, *columns(ITEMS), token=10)
+        return path
+
+    def test_snapshot_serves_queries_after_catching_up(self, path):
+        loader = MagicMock(return_value=[])
+        changes_since = MagicMock(return_value=([make_item("new", NOW + 10, NOW + 20)], ["past"], 12))
+        index = EventIndex(loader, latest_token=lambda: 0, changes_since=changes_since)
+        index.load_snapshot(Snapshot(path))
+
+        assert index.status_counts(now=NOW) == {"total": 4, "upcoming": 3, "ongoing": 1, "past": 0}
+        assert [e["id"] for e in index.upcoming(2, now=NOW)] == ["new", "soon"]
+        assert index.stats(now=NOW)["recurring"] == 1
+        changes_since.assert_called_once_with(10)
+        loader.assert_not_called()
+
+    def test_refresh_catches_up_from_token(self):
+        changes_since = MagicMock(return_value=([], ["later"], 7))
+        index = EventIndex(lambda: list(ITEMS), refresh_seconds=0, latest_token=lambda: 5,
+                           changes_since=changes_since)
+        index.ensure_loaded()
+        time.sleep(0.01)
+        index.ensure_loaded()
+
+        changes_since.assert_called_once_with(5)
+        assert index.status_counts(now=NOW)["total"] == 3
+
+    def test_compacted_history_falls_back_to_reload(self, path):
+        loader = MagicMock(return_value=ITEMS[:1])
+        index = EventIndex(loader, latest_token=lambda: 20, changes_since=MagicMock(side_effect=ChangeGone()))
+        index.load_snapshot(Snapshot(path))
+
+        assert index.status_counts(now=NOW)["total"] == 1
+        loader.assert_called_once()
+
+    def test_write_snapshot_round_trips_index(self, path, tmp_path):
+        index = EventIndex(MagicMock(), latest_token=lambda: 0, changes_since=lambda token: ([], [], token))
+        index.load_snapshot(Snapshot(path))
+        index.upsert(make_item("soon", NOW - 7200, NOW - 7100, title="moved"))
+        index.remove("later")
+
+        copy_path = str(tmp_path / "copy.snapshot")
+        assert index.write_snapshot(copy_path)
+        snapshot = Snapshot(copy_path)
+        assert snapshot.token == 10
+        assert sorted(snapshot.ids()) == ["ongoing", "past", "soon"]
+        assert snapshot.item(snapshot.ids().index("soon"))["title"] == "moved"
+
+    def test_write_snapshot_needs_a_token(self, tmp_path):
+        index = EventIndex(lambda: list(ITEMS))
+        assert index.write_snapshot(str(tmp_path / "events.snapshot")) is False
+
+
+class TestSnapshotAdoption:
+    """Tests for checking that a snapshot belongs to the store before a warm start"""
+
+    @pytest.fixture
+    def store(self):
+        store = MemoryService()
+        with patch.object(event_service, "db_service", store):
+            yield store
+
+    def snapshot(self, tmp_path, token, identity):
+        path = str(tmp_path / "events.snapshot")
+        write_snapshot(path, ITEMS, *columns(ITEMS), token=token, identity=identity)
+        return Snapshot(path)
+
+    def test_snapshot_of_this_store_is_adopted(self, store, tmp_path):
+        store.create_event(make_item("evt-1"))
+        assert event_service._snapshot_mismatch(self.snapshot(tmp_path, 1, store.identity)) is None
+
+    def test_snapshot_of_another_store_is_rejected(self, store, tmp_path):
+        store.create_event(make_item("evt-1"))
+        assert "taken from" in event_service._snapshot_mismatch(self.snapshot(tmp_path, 1, "memory:elsewhere"))
+
+    def test_snapshot_ahead_of_the_change_log_is_rejected(self, store, tmp_path):
+        assert "ahead" in event_service._snapshot_mismatch(self.snapshot(tmp_path, 3, store.identity))
+
+    def test_memory_stores_never_share_an_identity(self):
+        assert MemoryService().identity != MemoryService().identity
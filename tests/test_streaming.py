@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+from unittest.mock import patch
+
+from app import create_app
+
+PAGES = [
+    [{"id": "1", "title": "Team meeting", "description": ""}, {"id": "2", "title": "Lunch", "description": ""}],
+    [],
+    [{"id": "3", "title": "Retro", "description": "meeting notes"}],
+]
+
+
+class TestStreamingResponses:
+    """Tests for streamed list and search responses"""
+
+    @pytest.fixture
+    def client(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        return app.test_client()
+
+    def test_list_streams_json_array(self, client):
+        with patch('app.services.dynamodb_service.DynamoDBService.iter_pages', return_value=iter(PAGES)):
+            response = client.get('/api/events/?stream=json')
+            assert response.status_code == 200
+            assert response.is_streamed
+            assert response.mimetype == "application/json"
+            assert [e["id"] for e in json.loads(response.get_data())] == ["1", "2", "3"]
+
+    def test_list_streams_ndjson_from_accept_header(self, client):
+        with patch('app.services.dynamodb_service.DynamoDBService.iter_pages', return_value=iter(PAGES)):
+            response = client.get('/api/events/', headers={"Accept": "application/x-ndjson"})
+            lines = response.get_data(as_text=True).splitlines()
+        assert response.mimetype == "application/x-ndjson"
+        assert [json.loads(line)["id"] for line in lines] == ["1", "2", "3"]
+
+    def test_empty_stream_is_valid_json(self, client):
+        with patch('app.services.dynamodb_service.DynamoDBService.iter_pages', return_value=iter([[]])):
+            response = client.get('/api/events/?stream=json')
+            assert json.loads(response.get_data()) == []
+
+    def test_filtered_stream_pushes_filters_down(self, client):
+        with patch('app.services.dynamodb_service.DynamoDBService.iter_pages', return_value=iter([])) as pages:
+            client.get('/api/events/?stream=ndjson&status=past').get_data()
+        assert "FilterExpression" in pages.call_args.kwargs
+
+    def test_stream_rejects_sort(self, client):
+        response = client.get('/api/events/?stream=json&sort=title')
+        assert response.status_code == 400
+
+    def test_search_streams_matches_per_page(self, client):
+        with patch('app.services.dynamodb_service.DynamoDBService.iter_pages', return_value=iter(PAGES)):
+            response = client.get('/api/events/search?q=MEETING&stream=ndjson')
+            lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line)["id"] for line in lines] == ["1", "3"]
+
+    def test_search_rejects_unknown_stream_format(self, client):
+        response = client.get('/api/events/search?q=x&stream=xml')
+        assert response.status_code == 400
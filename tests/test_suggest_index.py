@@ -0,0 +1,110 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+import json
+from unittest.mock import patch
+
+import numpy as np
+
+from app import create_app
+from app.services.event_index import EventIndex, SnapshotItems
+from app.services.event_service import event_index
+from app.services.snapshot import Snapshot, write_snapshot
+from app.services.suggest_index import SuggestIndex, title_tokens
+from tests.conftest import make_item
+
+
+def texts(suggestions):
+    return [(s["text"], s["kind"], s["count"]) for s in suggestions]
+
+
+class TestSuggestIndex:
+    """Tests for the sorted-array prefix index"""
+
+    @pytest.fixture
+    def index(self):
+        index = SuggestIndex()
+        index.build([("a", "Team Standup"), ("b", "Team Standup"), ("c", "Team retro"), ("d", "Dentist"), ("e", None)])
+        return index
+
+    def test_tokens_are_lowercase_distinct_words(self):
+        assert title_tokens("Standup: team / TEAM sync, a") == ["standup", "team", "sync"]
+
+    def test_most_used_first(self, index):
+        assert texts(index.suggest("te")) == [
+            ("team", "token", 3), ("Team Standup", "title", 2), ("Team retro", "title", 1)]
+
+    def test_prefix_is_case_insensitive_and_limited(self, index):
+        assert texts(index.suggest("TEAM S", limit=1)) == [("Team Standup", "title", 2)]
+        assert texts(index.suggest("st")) == [("standup", "token", 2)]
+        assert index.suggest("zzz") == []
+
+    def test_put_and_drop_are_incremental(self, index):
+        index.put("d", "Team offsite")
+        index.drop("a")
+        index.put("f", "Dentist")
+        assert texts(index.suggest("te")) == [
+            ("team", "token", 3), ("Team offsite", "title", 1), ("Team retro", "title", 1),
+            ("Team Standup", "title", 1)]
+        assert texts(index.suggest("de")) == [("Dentist", "title", 1), ("dentist", "token", 1)]
+        index.drop("f")
+        assert index.suggest("de") == []
+        assert index.metrics() == {"events": 3, "titles": 3, "tokens": 4}
+
+    def test_scan_limit_bounds_the_candidates(self):
+        index = SuggestIndex(scan_limit=2)
+        index.build([(str(i), f"Event {i}") for i in range(10)])
+        assert len(index.suggest("event", limit=10)) == 3  # two titles, one token
+
+
+class TestEventIndexSuggest:
+    """The event index keeps suggestions in step with writes"""
+
+    def test_writes_after_first_use_are_applied(self):
+        index = EventIndex(lambda: [make_item("a", title="Planning"), make_item("b", title="Pairing")])
+        assert [s["text"] for s in index.suggest("p", 2)] == ["Pairing", "pairing"]
+        index.upsert(make_item("a", title="Pairing"))
+        index.remove("b")
+        assert texts(index.suggest("pa")) == [("Pairing", "title", 1), ("pairing", "token", 1)]
+        assert index.suggest("plan") == []
+
+    def test_builds_from_snapshot_without_decoding_items(self, tmp_path):
+        items = [make_item("a", title="Quarterly review"), make_item("b", title="Review")]
+        path = str(tmp_path / "events.snapshot")
+        start = np.array([i["start_epoch"] for i in items], dtype=np.int64)
+        write_snapshot(path, items, start, start + 3600, token=1)
+        index = EventIndex(lambda: [], latest_token=lambda: 1, changes_since=lambda token: ([], [], token))
+        index.load_snapshot(Snapshot(path))
+
+        assert texts(index.suggest("rev")) == [("review", "token", 2), ("Review", "title", 1)]
+        assert isinstance(index._items, SnapshotItems) and len(index._items) == 0
+
+
+class TestSuggestRoute:
+    """Tests for GET /api/events/suggest"""
+
+    @pytest.fixture
+    def client(self):
+        app = create_app()
+        app.config['TESTING'] = True
+        event_index.invalidate()
+        yield app.test_client()
+        event_index.invalidate()
+
+    def test_suggest_endpoint(self, client):
+        items = [make_item("a", title="Board meeting"), make_item("b", title="Book club")]
+        with patch('app.services.dynamodb_service.DynamoDBService.get_all_events', return_value=items):
+            response = client.get('/api/events/suggest?prefix=bo&limit=2')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["prefix"] == "bo"
+        assert [s["text"] for s in data["suggestions"]] == ["board", "Board meeting"]
+
+    def test_prefix_is_required(self, client):
+        assert client.get('/api/events/suggest').status_code == 400
+        assert client.get('/api/events/suggest?prefix=%20').status_code == 400
+
+    def test_limit_is_bounded(self, client):
+        assert client.get('/api/events/suggest?prefix=a&limit=0').status_code == 400
+        assert client.get('/api/events/suggest?prefix=a&limit=1000').status_code == 400